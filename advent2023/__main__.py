@@ -0,0 +1,300 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from advent2023 import batch, bench, watch
+from advent2023.generators import generate
+from advent2023.runner import print_results, run, run_parallel
+from advent2023.solvers import DAYS, PARTS, parse_days
+from advent2023.utils import fetch, server
+from advent2023.utils.profiling import PROGRESS_ENV
+from advent2023.utils.utils import INPUTS_DIR
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m advent2023", description="Advent of Code 2023 solutions."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="solve days")
+    run_parser.add_argument(
+        "days", nargs="*", help="days to solve, e.g. 1 3 5-9 (default: all)"
+    )
+    run_parser.add_argument(
+        "--parts", nargs="+", type=int, choices=PARTS, default=list(PARTS)
+    )
+    run_parser.add_argument(
+        "--no-submit",
+        dest="submit",
+        action="store_false",
+        help="do not submit answers",
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="always parse inputs, without reading or writing the parsed input cache",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="solve in this many processes, 0 for one per CPU (default: 1). Parts"
+        " which can use several processes share those left over by the others",
+    )
+    run_parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profile"),
+        help="profile each day with cProfile, saving .pstats and .folded files"
+        " to this directory (default: profile)",
+    )
+    run_parser.add_argument(
+        "--progress", action="store_true", help="show progress bars"
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream the inputs of line-oriented days instead of loading them",
+    )
+    run_parser.add_argument("--year", type=int, default=2023)
+
+    bench_parser = commands.add_parser(
+        "bench", help="benchmark the parse and part phases of days"
+    )
+    bench_parser.add_argument(
+        "days", nargs="*", help="days to benchmark, e.g. 1 3 5-9 (default: all)"
+    )
+    bench_parser.add_argument(
+        "--warmup", type=int, default=1, help="untimed runs per phase"
+    )
+    bench_parser.add_argument(
+        "--repeat", type=int, default=5, help="timed runs per phase"
+    )
+    bench_parser.add_argument(
+        "--output", type=Path, help="save the benchmark report to this json file"
+    )
+    bench_parser.add_argument(
+        "--baseline", type=Path, help="compare against this benchmark report"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="median slowdown reported as a regression (default: 0.1)",
+    )
+    bench_parser.add_argument(
+        "--size", type=float, help="benchmark on generated inputs of this size"
+    )
+    bench_parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the generated inputs"
+    )
+    bench_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="also measure the peak memory and top allocation sites of each phase",
+    )
+    bench_parser.add_argument(
+        "--top", type=int, default=5, help="allocation sites reported per phase"
+    )
+    bench_parser.add_argument("--year", type=int, default=2023)
+
+    watch_parser = commands.add_parser(
+        "watch", help="solve days again whenever their module or input changes"
+    )
+    watch_parser.add_argument(
+        "days", nargs="*", help="days to watch, e.g. 1 3 5-9 (default: all)"
+    )
+    watch_parser.add_argument(
+        "--parts", nargs="+", type=int, choices=PARTS, default=list(PARTS)
+    )
+    watch_parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="always parse inputs, without reading or writing the parsed input cache",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=watch.POLL_INTERVAL,
+        help=f"seconds between two checks for changes (default: {watch.POLL_INTERVAL})",
+    )
+    watch_parser.add_argument("--year", type=int, default=2023)
+
+    batch_parser = commands.add_parser(
+        "batch", help="solve a day for every input of a directory"
+    )
+    batch_parser.add_argument("day", type=int, help="day to solve")
+    batch_parser.add_argument(
+        "inputs_dir", type=Path, help=f"directory of the inputs ({batch.PATTERN})"
+    )
+    batch_parser.add_argument(
+        "--parts", nargs="+", type=int, choices=PARTS, default=list(PARTS)
+    )
+    batch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="solve in this many processes, 0 for one per CPU (default: 1)",
+    )
+    batch_parser.add_argument(
+        "--answers",
+        type=Path,
+        help="json file of the expected answers, by input file name and part",
+    )
+
+    generate_parser = commands.add_parser(
+        "generate", help="generate synthetic inputs for days"
+    )
+    generate_parser.add_argument(
+        "days", nargs="*", help="days to generate, e.g. 1 3 5-9 (default: all)"
+    )
+    generate_parser.add_argument(
+        "--size",
+        type=float,
+        default=1,
+        help="size relative to an official input (default: 1)",
+    )
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument(
+        "--output-dir", type=Path, default=Path("generated"), help="output directory"
+    )
+
+    prefetch_parser = commands.add_parser(
+        "prefetch", help="download the missing inputs of days concurrently"
+    )
+    prefetch_parser.add_argument(
+        "days", nargs="*", help="days to download, e.g. 1 3 5-9 (default: all)"
+    )
+    prefetch_parser.add_argument(
+        "--year", type=int, nargs="+", default=[2023], help="year(s) to download"
+    )
+    prefetch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=fetch.MAX_WORKERS,
+        help=f"concurrent downloads (default: {fetch.MAX_WORKERS})",
+    )
+    prefetch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=fetch.MIN_INTERVAL,
+        help="minimum delay in seconds between two requests"
+        f" (default: {fetch.MIN_INTERVAL})",
+    )
+
+    serve_parser = commands.add_parser(
+        "serve", help="serve inputs and check answers like the AOC server, offline"
+    )
+    serve_parser.add_argument(
+        "--inputs-dir", type=Path, default=INPUTS_DIR, help="directory of the inputs"
+    )
+    serve_parser.add_argument(
+        "--answers", type=Path, help="json file of the answers, by year, day and part"
+    )
+    serve_parser.add_argument(
+        "--wait",
+        type=float,
+        default=60.0,
+        help="seconds to wait after a wrong answer (default: 60)",
+    )
+    serve_parser.add_argument("--port", type=int, default=8023)
+
+    args = parser.parse_args(argv)
+    try:
+        days = parse_days(getattr(args, "days", []))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == "run":
+        if args.profile and args.jobs != 1:
+            parser.error("--profile cannot be used with --jobs")
+        if args.progress:
+            # an environment variable, so that worker processes inherit it
+            os.environ[PROGRESS_ENV] = "1"
+        if args.jobs == 1:
+            results = run(
+                days,
+                args.parts,
+                args.submit,
+                args.year,
+                args.cache,
+                args.profile,
+                args.stream,
+            )
+        else:
+            results = run_parallel(
+                days,
+                args.parts,
+                args.submit,
+                args.year,
+                args.cache,
+                args.jobs,
+                args.stream,
+            )
+        print_results(results)
+    elif args.command == "bench":
+        report = bench.bench(
+            days,
+            args.warmup,
+            args.repeat,
+            args.year,
+            args.size,
+            args.seed,
+            args.memory,
+            args.top,
+        )
+        bench.print_report(report)
+        if args.output:
+            bench.save_report(report, args.output)
+        if args.baseline:
+            baseline = bench.load_report(args.baseline)
+            regressions = bench.compare(report, baseline, args.threshold)
+            bench.print_regressions(regressions, args.threshold)
+            if regressions:
+                sys.exit(1)
+    elif args.command == "prefetch":
+        for path in fetch.prefetch(args.year, days, args.jobs, args.interval):
+            print(path)
+    elif args.command == "serve":
+        answers = server.load_answers(args.answers) if args.answers else {}
+        stand_in = server.StandInServer(
+            args.inputs_dir, answers, args.wait, port=args.port
+        )
+        print(f"Serving on {stand_in.url}, set ADVENT_URL={stand_in.url} to use it.")
+        try:
+            stand_in.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stand_in.server_close()
+    elif args.command == "watch":
+        watch.watch(days, args.parts, args.year, args.cache, args.interval)
+    elif args.command == "batch":
+        if args.day not in DAYS:
+            parser.error(f"No solver for day {args.day}.")
+        answers = batch.load_answers(args.answers) if args.answers else None
+        rows = batch.run_batch(
+            args.day, args.inputs_dir, args.parts, args.jobs, answers
+        )
+        batch.print_table(rows, args.parts)
+        if not all(row.ok for row in rows):
+            sys.exit(1)
+    elif args.command == "generate":
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        for day in days:
+            path = args.output_dir / f"day{day:02d}_x{args.size:g}_seed{args.seed}.txt"
+            with open(path, "w") as f:
+                f.write(generate(day, args.size, args.seed))
+            print(path)
+
+
+if __name__ == "__main__":
+    main()
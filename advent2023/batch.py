@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from advent2023.runner import Result, result
+from advent2023.solvers import PARTS, get_solver
+from advent2023.utils.profiling import Timings, phase
+
+LOGGER = logging.getLogger(__name__)
+
+# Files of a directory solved by default
+PATTERN = "*.txt"
+
+
+@dataclass
+class Row:
+    """
+    Results of a day for one input: the answer and solving time of each part,
+    the parsing time, and the error raised while solving, if any. Answers
+    are checked against the expected answers, if known.
+    """
+
+    input: str
+    parse: float = 0.0
+    results: list[Result] = field(default_factory=list)
+    error: str | None = None
+    expected: dict[int, str] = field(default_factory=dict)
+
+    def check(self, part: int) -> bool | None:
+        """
+        Check the answer of a part against its expected answer.
+
+        Args:
+            part (int): the part
+
+        Returns:
+            bool | None: whether the answer is right, None if it is not known
+        """
+        if part not in self.expected:
+            return None
+        answers = {r.part: str(r.answer) for r in self.results}
+        return answers.get(part) == self.expected[part]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(
+            self.check(part) is not False for part in self.expected
+        )
+
+
+def solve_file(day: int, path: Path, parts: Iterable[int] = PARTS) -> Row:
+    """
+    Solve the given parts of a day for the input in a file. Errors are
+    caught and recorded in the row, so that one bad input does not stop
+    the batch. The parsed input cache only keeps the latest input of each
+    day, so inputs are always parsed.
+
+    Args:
+        day (int): the day
+        path (Path): the input file
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+
+    Returns:
+        Row: the results for the input
+    """
+    solver = get_solver(day)
+    row = Row(path.name)
+    try:
+        with Timings() as timings:
+            with phase("parse"):
+                data = solver.parse(path.read_bytes())
+            row.parse = timings.phases["parse"]
+
+            for part in parts:
+                fn = solver.part(part)
+                if fn is None:
+                    continue
+                with phase(f"part{part}"):
+                    answer = fn(data)
+                row.results.append(result(day, part, answer, timings))
+    except Exception as e:
+        LOGGER.exception(f"Day {day:02d} failed on {path.name}.")
+        row.error = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_batch(
+    day: int,
+    inputs: Path | Iterable[Path],
+    parts: Iterable[int] = PARTS,
+    jobs: int = 1,
+    answers: dict[str, dict[int, str]] | None = None,
+) -> list[Row]:
+    """
+    Solve a day for many inputs in a single process, or in a pool of
+    processes with more than one job, so that modules are only imported
+    once per process. Day modules hold no state from one input to the next,
+    so runs are isolated.
+
+    Args:
+        day (int): the day
+        inputs (Path | Iterable[Path]): the input files, or a directory whose
+        PATTERN files are the inputs
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+        jobs (int, optional): number of processes, 0 for one per CPU.
+        Defaults to 1.
+        answers (dict[str, dict[int, str]] | None, optional): the expected
+        answers by input file name and part. Defaults to None.
+
+    Returns:
+        list[Row]: the results for each input, in order of file name
+    """
+    if isinstance(inputs, Path):
+        inputs = inputs.glob(PATTERN)
+    paths = sorted(inputs, key=lambda p: p.name)
+    solve = partial(solve_file, day, parts=tuple(parts))
+    if jobs == 1 or len(paths) < 2:
+        rows = [solve(path) for path in paths]
+    else:
+        jobs = min(jobs or os.cpu_count(), len(paths))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rows = list(pool.map(solve, paths))
+
+    for row in rows:
+        row.expected = (answers or {}).get(row.input, {})
+    return rows
+
+
+def load_answers(path: Path) -> dict[str, dict[int, str]]:
+    """
+    Load the expected answers of a batch from a json file, holding the
+    answers by input file name and part, e.g. {"a.txt": {"1": "142"}}.
+
+    Args:
+        path (Path): the json file
+
+    Returns:
+        dict[str, dict[int, str]]: the answers, by file name and part
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {
+        name: {int(part): str(answer) for part, answer in parts.items()}
+        for name, parts in data.items()
+    }
+
+
+def print_table(rows: Iterable[Row], parts: Iterable[int] = PARTS):
+    rows = list(rows)
+    parts = tuple(parts)
+    header = ["input", "parse"]
+    for part in parts:
+        header += [f"part{part}", "time"]
+    table = [header]
+    for row in rows:
+        line = [row.input, f"{row.parse:.3f}s"]
+        results = {r.part: r for r in row.results}
+        for part in parts:
+            r = results.get(part)
+            if r is None:
+                line += ["-", "-"]
+                continue
+            answer = str(r.answer)
+            if row.check(part) is False:
+                answer += f" (expected {row.expected[part]})"
+            line += [answer, f"{r.elapsed:.3f}s"]
+        if row.error is not None:
+            line.append(row.error)
+        table.append(line)
+
+    widths = [
+        max(len(line[i]) for line in table if i < len(line)) for i in range(len(header))
+    ]
+    for line in table:
+        cells = [cell.ljust(width) for cell, width in zip(line, widths)]
+        print("  ".join(cells + line[len(widths) :]).rstrip())
+
+    failed = [row.input for row in rows if not row.ok]
+    print(f"{len(rows) - len(failed)}/{len(rows)} inputs ok.")
@@ -0,0 +1,267 @@
+import json
+import logging
+import platform
+import resource
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from advent2023.generators import generate
+from advent2023.solvers import get_solver
+from advent2023.utils.profiling import Memory, trace_memory
+from advent2023.utils.utils import Advent
+
+LOGGER = logging.getLogger(__name__)
+
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclass
+class Timing:
+    """
+    Wall times (in seconds) for repeated runs of a phase, and the peak resident
+    set size (in bytes) of the process after the phase ran. The peak RSS is a
+    high-water mark for the whole process, so it can only grow from one phase
+    to the next. The phase's own memory usage is only measured on request,
+    in a separate traced run.
+    """
+
+    runs: int
+    min: float
+    median: float
+    p95: float
+    peak_rss: int
+    memory: Memory | None = None
+
+
+@dataclass
+class Regression:
+    day: int
+    phase: str
+    baseline: float
+    current: float
+    # what regressed, "time" (median seconds) or "memory" (peak bytes)
+    metric: str = "time"
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+def time_phase(fn: Callable[[], Any], warmup: int = 1, repeat: int = 5) -> Timing:
+    """
+    Time a phase, running it warmup times before recording repeat runs.
+
+    Args:
+        fn (Callable[[], Any]): the phase to run
+        warmup (int, optional): number of untimed runs. Defaults to 1.
+        repeat (int, optional): number of timed runs. Defaults to 5.
+
+    Returns:
+        Timing: the phase's timings
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        times.append(perf_counter() - start)
+
+    return Timing(
+        runs=repeat,
+        min=min(times),
+        median=float(np.median(times)),
+        p95=float(np.percentile(times, 95)),
+        peak_rss=peak_rss(),
+    )
+
+
+def bench_day(
+    day: int,
+    data: bytes | memoryview,
+    warmup: int = 1,
+    repeat: int = 5,
+    memory: bool = False,
+    top: int = 5,
+) -> dict[str, Timing]:
+    """
+    Benchmark the parse, part1 and part2 phases of a day separately. If memory
+    is True, each phase is run once more while tracing its memory usage.
+
+    Args:
+        day (int): the day
+        data (bytes | memoryview): the input bytes
+        warmup (int, optional): number of untimed runs per phase. Defaults to 1.
+        repeat (int, optional): number of timed runs per phase. Defaults to 5.
+        memory (bool, optional): measure memory usage. Defaults to False.
+        top (int, optional): number of allocation sites reported. Defaults to 5.
+
+    Returns:
+        dict[str, Timing]: the timings for each phase
+    """
+    solver = get_solver(day)
+    phases = {"parse": lambda: solver.parse(data)}
+    parsed = solver.parse(data)
+    for part in solver.parts:
+        phases[f"part{part}"] = lambda fn=solver.part(part): fn(parsed)
+
+    timings = {}
+    for name, fn in phases.items():
+        timings[name] = time_phase(fn, warmup, repeat)
+        if memory:
+            timings[name].memory = trace_memory(fn, top)
+    return timings
+
+
+def bench(
+    days: Iterable[int],
+    warmup: int = 1,
+    repeat: int = 5,
+    year: int = 2023,
+    size: float | None = None,
+    seed: int = 0,
+    memory: bool = False,
+    top: int = 5,
+) -> dict[str, Any]:
+    """
+    Benchmark days on their puzzle inputs, or on generated inputs if size
+    is given.
+
+    Args:
+        days (Iterable[int]): the days
+        warmup (int, optional): number of untimed runs per phase. Defaults to 1.
+        repeat (int, optional): number of timed runs per phase. Defaults to 5.
+        year (int, optional): the year. Defaults to 2023.
+        size (float | None, optional): size of the generated inputs. Defaults to None.
+        seed (int, optional): seed of the generated inputs. Defaults to 0.
+        memory (bool, optional): measure memory usage. Defaults to False.
+        top (int, optional): number of allocation sites reported. Defaults to 5.
+
+    Returns:
+        dict[str, Any]: the benchmark report, with run metadata and the
+        timings for each day and phase
+    """
+    results = {}
+    for day in days:
+        LOGGER.info(f"Benchmarking day {day:02d}.")
+        if size is None:
+            data = Advent(day, year).get_input_bytes()
+        else:
+            data = generate(day, size, seed).encode()
+        timings = bench_day(day, data, warmup, repeat, memory, top)
+        results[f"{day:02d}"] = {phase: asdict(t) for phase, t in timings.items()}
+
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "warmup": warmup,
+            "repeat": repeat,
+            "size": size,
+            "seed": seed,
+            "memory": memory,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.1
+) -> list[Regression]:
+    """
+    Compare a benchmark report against a baseline report. A phase regresses
+    when its median time is more than threshold slower than the baseline's,
+    or, if both reports measured memory, when its peak memory is more than
+    threshold larger than the baseline's. Phases missing from the baseline
+    are ignored.
+
+    Args:
+        report (dict[str, Any]): the benchmark report
+        baseline (dict[str, Any]): the baseline report
+        threshold (float, optional): the allowed slowdown. Defaults to 0.1.
+
+    Returns:
+        list[Regression]: the regressions
+    """
+    regressions = []
+    for day, phases in report["results"].items():
+        for phase, timing in phases.items():
+            base = baseline["results"].get(day, {}).get(phase)
+            if base is None:
+                continue
+            if timing["median"] > base["median"] * (1 + threshold):
+                regressions.append(
+                    Regression(int(day), phase, base["median"], timing["median"])
+                )
+            memory, base_memory = timing.get("memory"), base.get("memory")
+            if memory and base_memory:
+                if memory["peak"] > base_memory["peak"] * (1 + threshold):
+                    regressions.append(
+                        Regression(
+                            int(day),
+                            phase,
+                            base_memory["peak"],
+                            memory["peak"],
+                            "memory",
+                        )
+                    )
+    return regressions
+
+
+def save_report(report: dict[str, Any], path: Path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    LOGGER.info(f"Benchmark report saved to {path.absolute()}.")
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def print_report(report: dict[str, Any]):
+    memory = report["meta"].get("memory", False)
+    header = f"{'day':>3}  {'phase':<6} {'min':>9} {'median':>9} {'p95':>9} {'rss':>8}"
+    print(header + (f" {'peak':>8}" if memory else ""))
+    for day, phases in report["results"].items():
+        for phase, t in phases.items():
+            line = (
+                f"{day:>3}  {phase:<6} {t['min']:9.4f} {t['median']:9.4f}"
+                f" {t['p95']:9.4f} {t['peak_rss'] / 2**20:6.1f}MB"
+            )
+            if not memory:
+                print(line)
+                continue
+            print(line + f" {t['memory']['peak'] / 2**20:6.1f}MB")
+            for site in t["memory"]["sites"]:
+                print(
+                    f"{'':>13}{site['size'] / 2**20:8.1f}MB"
+                    f" {site['count']:>9} blocks  {site['site']}"
+                )
+
+
+def print_regressions(regressions: list[Regression], threshold: float):
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}.")
+        return
+    print(f"{len(regressions)} regression(s) above {threshold:.0%}:")
+    for r in regressions:
+        if r.metric == "memory":
+            change = f"{r.baseline / 2**20:.1f}MB -> {r.current / 2**20:.1f}MB"
+        else:
+            change = f"{r.baseline:.4f}s -> {r.current:.4f}s"
+        print(f"  day {r.day:02d} {r.phase} {r.metric}: {change} ({r.ratio:.2f}x)")
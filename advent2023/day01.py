@@ -1,6 +1,9 @@
-from utils.utils import Advent
+from collections.abc import Iterable, Iterator
 
-advent = Advent(1)
+import numpy as np
+import numpy.typing as npt
+
+from advent2023.utils.utils import Advent
 
 DIGITS = {
     "one": "1",
@@ -14,22 +17,169 @@ DIGITS = {
     "nine": "9",
 }
 
+# Size (in bytes) of the chunks of the document scanned at once, which bounds
+# the memory used by the scan whatever the size of the document
+CHUNK_SIZE = 1 << 22
+
+# Bytes searched at a time for the end of a line
+LINE_SEARCH = 1 << 8
+
+# Bytes of a line break and of the digit 0
+NEWLINE = np.uint8(ord("\n"))
+ZERO = np.uint8(ord("0"))
+
+Document = npt.NDArray[np.uint8] | Iterable[bytes]
+
+
+def chunks(
+    buffer: npt.NDArray[np.uint8], size: int = CHUNK_SIZE
+) -> Iterator[npt.NDArray[np.uint8]]:
+    """
+    Split a buffer into chunks of about size bytes, each made of whole lines.
+    Chunks are views of the buffer, which is not copied.
+
+    Args:
+        buffer (npt.NDArray[np.uint8]): the buffer
+        size (int, optional): the chunk size. Defaults to CHUNK_SIZE.
+
+    Yields:
+        Iterator[npt.NDArray[np.uint8]]: the chunks
+    """
+    start = 0
+    while start < len(buffer):
+        end = line_end(buffer, start + size)
+        yield buffer[start:end]
+        start = end
+
+
+def line_end(buffer: npt.NDArray[np.uint8], index: int) -> int:
+    """
+    Find the end of the line of a buffer holding a given index, searching for
+    the next line break a few bytes at a time.
+
+    Args:
+        buffer (npt.NDArray[np.uint8]): the buffer
+        index (int): the index
+
+    Returns:
+        int: the index following the line's line break, or the buffer's length
+    """
+    while index < len(buffer):
+        newlines = np.flatnonzero(buffer[index : index + LINE_SEARCH] == NEWLINE)
+        if len(newlines):
+            return index + int(newlines[0]) + 1
+        index += LINE_SEARCH
+    return len(buffer)
+
+
+def batches(
+    lines: Iterable[bytes], size: int = CHUNK_SIZE
+) -> Iterator[npt.NDArray[np.uint8]]:
+    """
+    Join lines into buffers of about size bytes.
+
+    Args:
+        lines (Iterable[bytes]): the lines
+        size (int, optional): the buffer size. Defaults to CHUNK_SIZE.
+
+    Yields:
+        Iterator[npt.NDArray[np.uint8]]: the buffers
+    """
+    batch, length = [], 0
+    for line in lines:
+        batch.append(line)
+        length += len(line) + 1
+        if length >= size:
+            yield np.frombuffer(b"\n".join(batch), dtype=np.uint8)
+            batch, length = [], 0
+    if batch:
+        yield np.frombuffer(b"\n".join(batch), dtype=np.uint8)
+
+
+def buffers(document: Document) -> Iterator[npt.NDArray[np.uint8]]:
+    if isinstance(document, np.ndarray):
+        return chunks(document)
+    return batches(document)
+
+
+def digit_values(buffer: npt.NDArray[np.uint8], spelled: bool) -> npt.NDArray:
+    """
+    Get the value of the digit starting at each byte of a buffer, values
+    above 9 meaning no digit starts there. Spelled digits are matched with
+    one comparison of the buffer per letter of each word, and valued at the
+    position of their first letter, which keeps overlapping words such as
+    "eightwo" in order.
+
+    Args:
+        buffer (npt.NDArray[np.uint8]): the buffer
+        spelled (bool): also match digits spelled out with letters
+
+    Returns:
+        npt.NDArray: the digit values
+    """
+    # bytes below "0" wrap around to values above 9
+    values = buffer - ZERO
+    if spelled:
+        for word, digit in DIGITS.items():
+            word = word.encode()
+            n = len(buffer) - len(word) + 1
+            if n <= 0:
+                continue
+            match = buffer[:n] == word[0]
+            for i in range(1, len(word)):
+                match &= buffer[i : n + i] == word[i]
+            values[:n][match] = int(digit)
+    return values
+
+
+def calibration_sum(buffer: npt.NDArray[np.uint8], spelled: bool = False) -> int:
+    """
+    Sum the calibration values of the lines of a buffer: the first digit of
+    each line followed by its last digit. The digits and line breaks are
+    gathered in order into a small array, in which a line's first digit
+    follows a line break and its last digit precedes one.
+
+    Args:
+        buffer (npt.NDArray[np.uint8]): the buffer, made of whole lines
+        spelled (bool, optional): also count digits spelled out with letters.
+        Defaults to False.
+
+    Returns:
+        int: the sum of the calibration values
+    """
+    values = digit_values(buffer, spelled)
+    events = values[np.flatnonzero((values < 10) | (buffer == NEWLINE))]
+    digits = events < 10
+    firsts = digits.copy()
+    firsts[1:] &= ~digits[:-1]
+    lasts = digits.copy()
+    lasts[:-1] &= ~digits[1:]
+    # at most 9 * 10 + 9, which fits in a byte
+    weighted = events * (np.uint8(10) * firsts + lasts)
+    return int(weighted.sum(dtype=np.int64))
+
+
+def parse_line(line: str) -> bytes:
+    return line.encode()
+
+
+def parse_bytes(data: bytes | memoryview) -> npt.NDArray[np.uint8]:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def part1(document: Document) -> int:
+    return sum(calibration_sum(buffer) for buffer in buffers(document))
+
 
-def calibration(lines: list[str]) -> int:
-    calibration = [tuple(c for c in l if c.isdigit()) for l in lines]
-    calibration = [int(c[0] + c[-1]) for c in calibration]
-    return sum(calibration)
+def part2(document: Document) -> int:
+    return sum(calibration_sum(buffer, True) for buffer in buffers(document))
 
 
 def main():
-    lines = advent.get_input_lines()
-    advent.submit(1, calibration(lines))
-
-    input = advent.get_input()
-    for k, v in DIGITS.items():
-        input = input.replace(k, k + v + k)
-    lines = list(map(lambda l: l.strip(), input.rstrip("\n").split("\n")))
-    advent.submit(2, calibration(lines))
+    advent = Advent(1)
+    document = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(document))
+    advent.submit(2, part2(document))
 
 
 if __name__ == "__main__":
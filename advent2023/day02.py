@@ -1,9 +1,8 @@
 import re
-from utils.utils import Advent
+from advent2023.utils.utils import Advent
+from collections.abc import Iterable
 import math
 
-advent = Advent(2)
-
 game_max = {"red": 12, "green": 13, "blue": 14}
 
 
@@ -30,25 +29,38 @@ def min_possible_count(draws: list[str]):
     return counts
 
 
-def main():
-    games = advent.get_input_lines()
+def parse_line(game: str) -> tuple[int, list[str]]:
+    id = re.search("Game (\d+)", game).group(1)
+    draws = game[game.index(":") + 1 :].split(";")
+    return int(id), draws
+
+
+def parse(lines: list[str]) -> list[tuple[int, list[str]]]:
+    return [parse_line(game) for game in lines]
+
+
+def part1(games: Iterable[tuple[int, list[str]]]) -> int:
     impossible_count = 0
-    for game in games:
-        id = re.search("Game (\d+)", game).group(1)
-        draws = game[game.index(":") + 1 :].split(";")
+    for id, draws in games:
         if not is_game_impossible(draws):
-            impossible_count += int(id)
+            impossible_count += id
+    return impossible_count
 
-    advent.submit(1, impossible_count)
 
+def part2(games: Iterable[tuple[int, list[str]]]) -> int:
     power_sum = 0
-    for game in games:
-        draws = game[game.index(":") + 1 :].split(";")
+    for _, draws in games:
         counts = min_possible_count(draws)
         power = math.prod(counts.values())
         power_sum += power
+    return power_sum
 
-    advent.submit(2, power_sum)
+
+def main():
+    advent = Advent(2)
+    games = parse(advent.get_input_lines())
+    advent.submit(1, part1(games))
+    advent.submit(2, part2(games))
 
 
 if __name__ == "__main__":
@@ -1,20 +1,27 @@
-from utils.utils import Advent
+from advent2023.utils.grid import BitGrid, Grid
+from advent2023.utils.utils import Advent
 from collections import defaultdict
 from math import prod
 
-advent = Advent(3)
-
 DIRS = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1)]
 
 
-def main():
-    puzzle = advent.get_input_lines()
+def parse(lines: list[str]) -> tuple[list[str], list[tuple[int, int, int]]]:
     # Find all number indices in the puzzle
-    number_indices = get_number_indices(puzzle)
-    # For each number, check if it's a part
-    parts = [get_number(puzzle, i) for i in number_indices if is_part(puzzle, i)]
-    advent.submit(1, sum(parts))
+    return lines, get_number_indices(lines)
+
+
+def part1(data: tuple[list[str], list[tuple[int, int, int]]]) -> int:
+    puzzle, number_indices = data
+    # Mark the cells adjacent to a symbol, then check if each number is a part
+    symbols = ~Grid.from_lines(puzzle).mask("0123456789.")
+    adjacent = BitGrid.from_mask(symbols).dilate(diagonal=True)
+    parts = [get_number(puzzle, i) for i in number_indices if is_part(adjacent, i)]
+    return sum(parts)
 
+
+def part2(data: tuple[list[str], list[tuple[int, int, int]]]) -> int:
+    puzzle, number_indices = data
     # Build a dict of the indices for all the * chars, with a set of their adjacent numbers
     # Note: this assumes there are no duplicate numbers for a gear.
     gears = defaultdict(set)
@@ -23,7 +30,14 @@ def main():
             gears[gear_idx].add(get_number(puzzle, index))
 
     # Sum the product of adjacent numbers for all the gears that have exactly two adjacent numbers
-    advent.submit(2, sum([prod(g) for g in gears.values() if len(g) == 2]))
+    return sum([prod(g) for g in gears.values() if len(g) == 2])
+
+
+def main():
+    advent = Advent(3)
+    data = parse(advent.get_input_lines())
+    advent.submit(1, part1(data))
+    advent.submit(2, part2(data))
 
 
 def get_number_indices(puzzle: list[list[str]]) -> list[tuple[int, int, int]]:
@@ -49,21 +63,13 @@ def get_number_indices(puzzle: list[list[str]]) -> list[tuple[int, int, int]]:
     return numbers
 
 
-def is_part(puzzle: list[list[str]], index: tuple[int, int, int]) -> bool:
+def is_part(adjacent: BitGrid, index: tuple[int, int, int]) -> bool:
     """
-    Check whether number is a part.
+    Check whether number is a part, i.e. one of its digits is adjacent to a symbol.
     """
     i, j, k = index
-    for x in range(j, k + 1):
-        for a, b in DIRS:
-            if (
-                0 <= i + a < len(puzzle)
-                and 0 <= x + b < len(puzzle[0])
-                and puzzle[i + a][x + b] != "."
-                and not puzzle[i + a][x + b].isdigit()
-            ):
-                return True
-    return False
+    digits = ((1 << (k - j + 1)) - 1) << j
+    return bool(adjacent.rows[i] & digits)
 
 
 def get_number(puzzle: list[list[str]], index: tuple[int, int, int]) -> int:
@@ -1,32 +1,72 @@
-from utils.utils import Advent
+import numpy as np
 
-advent = Advent(4)
+from advent2023.utils.parse import int_matrix, ints
+from advent2023.utils.utils import Advent
+from collections import deque
+from collections.abc import Iterable
 
 
-def main():
-    lines = advent.get_input_lines()
+def parse_line(line: str) -> int:
+    """
+    Parse a card, returning the number of winning numbers drawn.
+
+    Args:
+        line (str): the card
+
+    Returns:
+        int: the number of matches
+    """
+    winning, draw = line[line.index(":") + 1 :].split("|")
+    return len(set(ints(winning).tolist()) & set(ints(draw).tolist()))
+
+
+def parse(lines: list[str]) -> list[int]:
+    """
+    Parse cards, returning the number of winning numbers drawn for each card.
+    All cards have as many winning numbers and numbers drawn, so the numbers
+    of all cards are compared at once.
+
+    Args:
+        lines (list[str]): the input lines
+
+    Returns:
+        list[int]: the number of matches for each card
+    """
+    cards = [line[line.index(":") + 1 :].split("|") for line in lines]
+    winning = int_matrix(w for w, _ in cards)
+    draw = int_matrix(d for _, d in cards)
+    if not isinstance(winning, np.ndarray) or not isinstance(draw, np.ndarray):
+        return [parse_line(line) for line in lines]
+    matches = (winning[:, :, None] == draw[:, None, :]).any(axis=2)
+    return matches.sum(axis=1).tolist()
+
+
+def part1(matches: Iterable[int]) -> int:
     score = 0
-    for line in lines:
-        winning, draw = line[line.index(":") + 2 :].split("|")
-        winning = set([int(x.strip()) for x in winning.split(" ") if x])
-        draw = set([int(x.strip()) for x in draw.split(" ") if x])
-        won = winning & draw
-        if won:
-            score += pow(2, len(won) - 1)
-    advent.submit(1, score)
-
-    copies = {}
-    for idx, line in enumerate(lines):
-        if idx not in copies:
-            copies[idx] = 1
-        winning, draw = line[line.index(":") + 2 :].split("|")
-        winning = set([int(x.strip()) for x in winning.split(" ") if x])
-        draw = set([int(x.strip()) for x in draw.split(" ") if x])
-        won = winning & draw
+    for won in matches:
         if won:
-            for x in range(idx + 1, idx + 1 + len(won)):
-                copies[x] = copies.get(x, 1) + copies[idx]
-    advent.submit(2, sum(copies.values()))
+            score += pow(2, won - 1)
+    return score
+
+
+def part2(matches: Iterable[int]) -> int:
+    # copies won so far of the next cards, the first one being the current card
+    won_copies = deque()
+    total = 0
+    for won in matches:
+        copies = 1 + (won_copies.popleft() if won_copies else 0)
+        total += copies
+        won_copies.extend([0] * (won - len(won_copies)))
+        for x in range(won):
+            won_copies[x] += copies
+    return total
+
+
+def main():
+    advent = Advent(4)
+    matches = parse(advent.get_input_lines())
+    advent.submit(1, part1(matches))
+    advent.submit(2, part2(matches))
 
 
 if __name__ == "__main__":
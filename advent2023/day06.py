@@ -1,22 +1,25 @@
-from utils.utils import Advent
+from advent2023.utils.parse import ints
+from advent2023.utils.utils import Advent
 
-advent = Advent(6)
 
+def parse(lines: list[str]) -> tuple[list[int], list[int]]:
+    return ints(lines[0]).tolist(), ints(lines[1]).tolist()
 
-def main():
-    lines = advent.get_input_lines()
-    times = [int(x.strip()) for x in lines[0][len("Time: ") :].split(" ") if x]
-    distances = [int(x.strip()) for x in lines[1][len("Distance: ") :].split(" ") if x]
 
+def part1(races: tuple[list[int], list[int]]) -> int:
+    times, distances = races
     solutions = 1
     for time, distance in zip(times, distances):
         traveled = [charge * (time - charge) for charge in range(time)]
         wins = sum([1 for c in traveled if c > distance])
         solutions *= wins
-    advent.submit(1, solutions)
+    return solutions
+
 
-    time = int(lines[0][len("Time: ") :].replace(" ", ""))
-    distance = int(lines[1][len("Distance: ") :].replace(" ", ""))
+def part2(races: tuple[list[int], list[int]]) -> int:
+    times, distances = races
+    time = int("".join([str(t) for t in times]))
+    distance = int("".join([str(d) for d in distances]))
 
     mint = None
     maxt = None
@@ -32,7 +35,14 @@ def main():
             maxt = charge
             break
 
-    advent.submit(2, maxt - mint + 1)
+    return maxt - mint + 1
+
+
+def main():
+    advent = Advent(6)
+    races = parse(advent.get_input_lines())
+    advent.submit(1, part1(races))
+    advent.submit(2, part2(races))
 
 
 if __name__ == "__main__":
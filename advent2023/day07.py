@@ -1,26 +1,34 @@
-from utils.utils import Advent
+from advent2023.utils.utils import Advent
 from collections import Counter
 from functools import cmp_to_key
 
-advent = Advent(7)
-
 CARDS = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
 CARDS_JOKER = ["J", "2", "3", "4", "5", "6", "7", "8", "9", "T", "Q", "K", "A"]
 TYPES = ["HIGH", "ONE", "TWO", "THREE", "FULL", "FOUR", "FIVE"]
 
 
-def main():
-    lines = advent.get_input_lines()
+def parse(lines: list[str]) -> list[tuple[tuple[str], int]]:
     hands = [tuple(l.strip().split(" ")) for l in lines]
-    hands = [(tuple(c for c in h), int(b)) for (h, b) in hands]
+    return [(tuple(c for c in h), int(b)) for (h, b) in hands]
 
+
+def part1(hands: list[tuple[tuple[str], int]]) -> int:
     sorted_hands = sorted(hands, key=cmp_to_key(hand_bet_compare))
     winnings = [(idx + 1) * h[1] for idx, h in enumerate(sorted_hands)]
-    advent.submit(1, sum(winnings))
+    return sum(winnings)
+
 
+def part2(hands: list[tuple[tuple[str], int]]) -> int:
     sorted_joker_hands = sorted(hands, key=cmp_to_key(hand_bet_compare_joker))
     winnings = [(idx + 1) * h[1] for idx, h in enumerate(sorted_joker_hands)]
-    advent.submit(2, sum(winnings))
+    return sum(winnings)
+
+
+def main():
+    advent = Advent(7)
+    hands = parse(advent.get_input_lines())
+    advent.submit(1, part1(hands))
+    advent.submit(2, part2(hands))
 
 
 def hand_type(hand: tuple[str], joker: bool = False):
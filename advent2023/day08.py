@@ -2,15 +2,12 @@ import math
 from functools import reduce
 from typing import Callable
 
-from utils.utils import Advent
-
-advent = Advent(8)
+from advent2023.utils.utils import Advent
 
 INSTRUCTION_KEYS = {"L": 0, "R": 1}
 
 
-def main():
-    lines = advent.get_input_lines()
+def parse(lines: list[str]) -> tuple[str, dict[str, tuple[str, str]]]:
     instructions = lines[0].strip()
     nodes = {}
     for line in lines[2:]:
@@ -18,16 +15,29 @@ def main():
             key, values = line.split("=")
             values = tuple(values.replace(")", "").replace("(", "").split(","))
             nodes[key.strip()] = tuple([v.strip() for v in values])
+    return instructions, nodes
+
+
+def part1(network: tuple[str, dict[str, tuple[str, str]]]) -> int:
+    instructions, nodes = network
+    return reach_end(nodes, instructions, "AAA", lambda x: x == "ZZZ")
 
-    steps = reach_end(nodes, instructions, "AAA", lambda x: x == "ZZZ")
-    advent.submit(1, steps)
 
+def part2(network: tuple[str, dict[str, tuple[str, str]]]) -> int:
+    instructions, nodes = network
     starts = {key for key in nodes.keys() if key[-1] == "A"}
     steps = {
         key: reach_end(nodes, instructions, key, lambda x: x[-1] == "Z")
         for key in starts
     }
-    advent.submit(2, reduce(lcm, steps.values()))
+    return reduce(lcm, steps.values())
+
+
+def main():
+    advent = Advent(8)
+    network = parse(advent.get_input_lines())
+    advent.submit(1, part1(network))
+    advent.submit(2, part2(network))
 
 
 def lcm(a, b):
@@ -1,40 +1,78 @@
-from utils.utils import Advent
+from advent2023.utils.parse import int_matrix, ints
+from advent2023.utils.utils import Advent
+from collections.abc import Iterable
+from functools import cache
+from math import comb
+import numpy as np
+import numpy.typing as npt
 
-advent = Advent(9)
+Histories = npt.NDArray[np.int64] | Iterable[npt.NDArray[np.int64]]
+
+
+def parse_line(line: str) -> npt.NDArray[np.int64]:
+    return ints(line)
+
+
+def parse(lines: list[str]) -> Histories:
+    return int_matrix(lines)
+
+
+def part1(histories: Histories) -> int:
+    return extrapolate(histories)
+
+
+def part2(histories: Histories) -> int:
+    return extrapolate(histories, backward=True)
 
 
 def main():
-    lines = advent.get_input_lines()
-    histories = [[int(x.strip()) for x in l.split(" ")] for l in lines]
-    advent.submit(1, sum([forward(h) for h in histories]))
-    advent.submit(2, sum([backward(h) for h in histories]))
+    advent = Advent(9)
+    histories = parse(advent.get_input_lines())
+    advent.submit(1, part1(histories))
+    advent.submit(2, part2(histories))
+
+
+@cache
+def weights(length: int) -> npt.NDArray[np.int64]:
+    """
+    Weights of the values of a history of given length in its next value.
+    Taking differences until they are all zero and adding up the last value
+    of each level amounts to summing (-1)^(length - 1 - i) * C(length, i)
+    times the i-th value. Weights and products may overflow int64, but since
+    numpy wraps around, the sum is exact whenever the next value fits in an
+    int64.
 
+    Args:
+        length (int): the history's length
 
-def get_offsets(history: list[int]):
-    diffs = []
-    current = history
-    while not all([x == 0 for x in current]):
-        diff = [current[i] - current[i - 1] for i in range(1, len(current))]
-        diffs.append(diff)
-        current = diff
+    Returns:
+        npt.NDArray[np.int64]: the weights
+    """
+    w = [(-1) ** (length - 1 - i) * comb(length, i) for i in range(length)]
+    return np.array([(x + 2**63) % 2**64 - 2**63 for x in w], dtype=np.int64)
 
-    return diffs
 
+def extrapolate(histories: Histories, backward: bool = False) -> int:
+    """
+    Sum the next values (or previous values if backward) of the histories.
+    A matrix of histories of the same length is extrapolated all at once.
 
-def forward(history: list[int]):
-    offsets = get_offsets(history)
-    x = 0
-    for offset in offsets[::-1]:
-        x += offset[-1]
-    return history[-1] + x
+    Args:
+        histories (Histories): the histories
+        backward (bool, optional): extrapolate backwards. Defaults to False.
 
+    Returns:
+        int: the sum of the extrapolated values
+    """
+    if isinstance(histories, np.ndarray):
+        values = histories[:, ::-1] if backward else histories
+        return int((values @ weights(values.shape[1])).sum())
 
-def backward(history: list[int]):
-    offsets = get_offsets(history)
-    x = 0
-    for offset in offsets[::-1]:
-        x = offset[0] - x
-    return history[0] - x
+    total = 0
+    for h in histories:
+        values = h[::-1] if backward else h
+        total += int(values @ weights(len(values)))
+    return total
 
 
 if __name__ == "__main__":
@@ -1,49 +1,51 @@
-from utils.utils import Advent
+from advent2023.utils.grid import Grid
+from advent2023.utils.utils import Advent
 import numpy as np
-import numpy.typing as npt
-
-advent = Advent(10)
 
 
 PIPES = {
-    "|": [(-1, 0), (1, 0)],
-    "-": [(0, -1), (0, 1)],
-    "L": [(-1, 0), (0, 1)],
-    "J": [(-1, 0), (0, -1)],
-    "7": [(1, 0), (0, -1)],
-    "F": [(1, 0), (0, 1)],
+    ord("|"): [(-1, 0), (1, 0)],
+    ord("-"): [(0, -1), (0, 1)],
+    ord("L"): [(-1, 0), (0, 1)],
+    ord("J"): [(-1, 0), (0, -1)],
+    ord("7"): [(1, 0), (0, -1)],
+    ord("F"): [(1, 0), (0, 1)],
 }
+START = ord("S")
 
-tbl = str.maketrans("|-LJ7F", "│─└┘┐┌")
 
+def parse_bytes(data: bytes | memoryview) -> Grid:
+    return Grid.from_bytes(data)
 
-def main():
-    lines = advent.get_input_lines()
-    grid = [[c for c in l] for l in lines]
-    grid = np.array(grid, dtype=str)
+
+def part1(grid: Grid) -> int:
     loop = get_loop(grid)
-    advent.submit(1, int(len(loop) / 2))
+    return int(len(loop) / 2)
 
-    # replace everything not in loop with .
-    for x in range(grid.shape[0]):
-        for y in range(grid.shape[1]):
-            if (x, y) not in loop:
-                grid[x][y] = "."
 
-    # Count number of points inside polygon
-    count = 0
-    for x in range(grid.shape[0]):
-        for y in range(grid.shape[1]):
-            if is_point_inside_polygon(grid, x, y):
-                count += 1
-                grid[x][y] = "X"
+def part2(grid: Grid) -> int:
+    loop = get_loop(grid)
+    on_loop = np.zeros(grid.shape, dtype=bool)
+    on_loop[tuple(np.array(loop).T)] = True
+
+    # Count the loop tiles connected to the north to the left of each tile: a
+    # tile is inside the loop if it crosses the loop an odd number of times.
+    north = on_loop & grid.mask("|LJ")
+    S = loop[0]
+    if (S[0] - 1, S[1]) in (loop[1], loop[-1]):
+        north[S] = True
+    inside = np.cumsum(north, axis=1) % 2 == 1
+    return int(np.sum(inside & ~on_loop))
 
-    for x in range(grid.shape[0]):
-        print("".join(grid[x]).translate(tbl))
-    advent.submit(2, count)
 
+def main():
+    advent = Advent(10)
+    grid = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(grid))
+    advent.submit(2, part2(grid))
 
-def get_loop(grid: npt.NDArray[np.str_]) -> list[tuple[int, int]]:
+
+def get_loop(grid: Grid) -> list[tuple[int, int]]:
     """
     Starting from S position, follow the pipes until we loop back to S.
     Since we don't know what S is, try out all of its neighbors until
@@ -51,18 +53,17 @@ def get_loop(grid: npt.NDArray[np.str_]) -> list[tuple[int, int]]:
     no loop was found.
 
     Args:
-        grid (npt.NDArray[np.str_]): the grid
+        grid (Grid): the grid
 
     Returns:
         list[tuple[int, int]]: the loop
     """
-    S = np.where(grid == "S")
-    S = S[0][0], S[1][0]
+    S = grid.index("S")
     for x, y in ((-1, 0), (0, -1), (1, 0), (0, 1)):
         loop = [S]
         current = (S[0] + x, S[1] + y)
         try:
-            while grid[current] != "S":
+            while grid[current] != START:
                 loop.append(current)
                 current = next_pipe(grid, current, loop[-2])
         except ValueError:
@@ -72,13 +73,13 @@ def get_loop(grid: npt.NDArray[np.str_]) -> list[tuple[int, int]]:
 
 
 def next_pipe(
-    grid: npt.NDArray[np.str_], current: tuple[int, int], previous: tuple[int, int]
+    grid: Grid, current: tuple[int, int], previous: tuple[int, int]
 ) -> tuple[int, int]:
     """
     Follow the pipes from the current position, returning the next position.
 
     Args:
-        grid (npt.NDArray[np.str_]): the
+        grid (Grid): the grid
         current (tuple[int, int]): the current pos
         previous (tuple[int, int]): the previous pos
 
@@ -94,8 +95,8 @@ def next_pipe(
     if not (0 <= current[0] < shape_x and 0 <= current[1] < shape_y):
         raise ValueError(f"{current} position is out of bounds.")
 
-    pipe = grid[current]
-    if pipe == "." or pipe == "S":
+    pipe = int(grid[current])
+    if pipe not in PIPES:
         raise ValueError(f"{current} position is not a pipe.")
     from_direction = (previous[0] - current[0], previous[1] - current[1])
     if from_direction not in PIPES[pipe]:
@@ -104,64 +105,5 @@ def next_pipe(
     return (current[0] + to_direction[0], current[1] + to_direction[1])
 
 
-def intersections(grid: npt.NDArray[np.str_], x: int, y: int) -> int:
-    """
-    Count the # of intersections by drawing a line to the right
-    of the point.
-    Intersections are |, or any other section of pipe which is not
-    horizontal (i.e L---J or F---7 are horizontal lines,
-    whereas L---7 or F---J are not).
-
-    Args:
-        grid (npt.NDArray[np.str_]): grid where only pipes are different from .
-        x (int): the start x
-        y (int): the start y
-
-    Returns:
-        int: the number of intersections
-    """
-    count = 0
-    last = None
-    for i in range(y + 1, grid.shape[1]):
-        current = grid[(x, i)]
-        if current == "|":
-            count += 1
-        elif current not in ".-":
-            if last is None:
-                last = current
-            else:
-                if not (
-                    (last == "F" and current == "7") or (last == "L" and current == "J")
-                ):
-                    count += 1
-                last = None
-
-    return count
-
-
-def is_point_inside_polygon(grid: npt.NDArray[np.str_], x: int, y: int) -> bool:
-    """
-    Check if point is inside polygon.
-
-    Args:
-        grid (npt.NDArray[np.str_]): the grid
-        x (int): point x
-        y (int): point y
-
-    Returns:
-        bool: True if point is inside polygon
-    """
-    # return False if point is part of loop (is not a dot)
-    if grid[(x, y)] != ".":
-        return False
-
-    # Count intersections of the polygon edges with a horizontal
-    # line going through the test point
-    count = intersections(grid, x, y)
-    if count % 2 == 1:
-        return True
-    return False
-
-
 if __name__ == "__main__":
     main()
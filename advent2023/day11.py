@@ -1,58 +1,28 @@
-from utils.utils import Advent
+from advent2023.utils.utils import Advent
+import numpy as np
+import numpy.typing as npt
 
-advent = Advent(11)
 
+def parse(lines: list[str]) -> npt.NDArray[np.int64]:
+    return find_galaxies(lines)
 
-def main():
-    lines = advent.get_input_lines()
-    grid = expand(lines)
-    galaxies = find_galaxies(grid)
-
-    distances = 0
-    for idx, (sr, sc) in enumerate(galaxies):
-        for dr, dc in galaxies[idx + 1 :]:
-            d = abs(sr - dr) + abs(sc - dc)
-            distances += d
-
-    advent.submit(1, distances)
-
-    grid = advent.get_input_lines()
-    galaxies = find_galaxies(grid)
-    er, ec = get_empty_rows_cols(grid)
-    factor = 1000000 - 1
-    distances = 0
-    for idx, (sr, sc) in enumerate(galaxies):
-        for dr, dc in galaxies[idx + 1 :]:
-            d = abs(sr - dr) + abs(sc - dc)
-            d += factor * count_empty(er, ec, (sr, sc), (dr, dc))
-            distances += d
-
-    advent.submit(2, distances)
-
-
-def count_empty(
-    er: list[int], ec: list[int], src: tuple[int, int], dst: tuple[int, int]
-) -> int:
-    """
-    Count the number of empty rows anc columns between the src node and the dest node.
 
-    Args:
-        er (list[int]): list of empty rows
-        ec (list[int]): list of empty columns
-        src (tuple[int, int]): source node coordinates
-        dst (tuple[int, int]): dest node coordinates
+def part1(galaxies: npt.NDArray[np.int64]) -> int:
+    return distances(galaxies, 2)
 
-    Returns:
-        int: the number of empty rows or cols between src and dest
-    """
-    ar, br = min(src[0], dst[0]), max(src[0], dst[0])
-    ac, bc = min(src[1], dst[1]), max(src[1], dst[1])
-    cr = sum([1 for r in er if ar <= r <= br])
-    cc = sum([1 for c in ec if ac <= c <= bc])
-    return cr + cc
+
+def part2(galaxies: npt.NDArray[np.int64]) -> int:
+    return distances(galaxies, 1000000)
 
 
-def find_galaxies(grid: list[str]) -> list[tuple[int, int]]:
+def main():
+    advent = Advent(11)
+    galaxies = parse(advent.get_input_lines())
+    advent.submit(1, part1(galaxies))
+    advent.submit(2, part2(galaxies))
+
+
+def find_galaxies(grid: list[str]) -> npt.NDArray[np.int64]:
     """
     Find coordinates for galaxies
 
@@ -60,65 +30,53 @@ def find_galaxies(grid: list[str]) -> list[tuple[int, int]]:
         grid (list[str]): the grid
 
     Returns:
-        list[tuple[int, int]]: the galaxies' coordinates
+        npt.NDArray[np.int64]: the galaxies' (row, col) coordinates
     """
-    galaxies = []
-    for x, row in enumerate(grid):
-        for y, c in enumerate(row):
-            if c != ".":
-                galaxies.append((x, y))
-    return galaxies
+    galaxies = [
+        (x, y) for x, row in enumerate(grid) for y, c in enumerate(row) if c != "."
+    ]
+    return np.array(galaxies, dtype=np.int64).reshape(-1, 2)
 
 
-def get_empty_rows_cols(grid: list[str]) -> tuple[list[int]]:
+def expand(coords: npt.NDArray[np.int64], factor: int) -> npt.NDArray[np.int64]:
     """
-    Get the indices for empty rows and cols
+    Expand coordinates along one axis, each empty row (or col) before a
+    coordinate, i.e. one without any galaxy, becoming factor rows.
 
     Args:
-        grid (list[str]): the grid
+        coords (npt.NDArray[np.int64]): the coordinates of the galaxies
+        factor (int): the expansion factor
 
     Returns:
-        tuple[list[int]]: list of empty rows and cols
+        npt.NDArray[np.int64]: the expanded coordinates
     """
-    rows = list()
-    cols = set()
-    for r, row in enumerate(grid):
-        if "#" not in row:
-            rows.append(r)
-        for c, ch in enumerate(row):
-            if ch == "#":
-                cols.add(c)
-
-    return rows, [c for c in range(len(grid[0])) if c not in cols]
+    occupied = np.unique(coords)
+    empty = coords - np.searchsorted(occupied, coords)
+    return coords + (factor - 1) * empty
 
 
-def expand(grid: list[str]) -> list[str]:
+def distances(galaxies: npt.NDArray[np.int64], factor: int) -> int:
     """
-    Double each empty row and col in the grid
+    Sum the distances between each pair of galaxies, once empty rows and cols
+    are expanded by factor. Along each axis, the i-th smallest of n
+    coordinates is added to the distances of the i pairs with the smaller
+    coordinates and subtracted from the n - i - 1 others.
 
     Args:
-        grid (list[str]): the grid
+        galaxies (npt.NDArray[np.int64]): the galaxies' coordinates
+        factor (int): the expansion factor
 
     Returns:
-        list[str]: the expanded grid
+        int: the sum of the distances
     """
-    # find empty rows and cols
-    rows, cols = get_empty_rows_cols(grid)
-
-    # add new columns
-    new_grid = []
-    for row in grid:
-        new_row = row
-        for idx, c in enumerate(cols):
-            new_row = new_row[: c + idx] + "." + row[c:]
-        new_grid.append(new_row)
-
-    # add new rows
-    l = len(new_grid[0])
-    for i, r in enumerate(rows):
-        new_grid.insert(r + i, "." * l)
-
-    return new_grid
+    total = 0
+    n = len(galaxies)
+    weights = range(1 - n, n, 2)
+    for axis in range(galaxies.shape[1]):
+        coords = np.sort(expand(galaxies[:, axis], factor))
+        # summed as python ints, which do not overflow
+        total += sum(c * w for c, w in zip(coords.tolist(), weights))
+    return total
 
 
 if __name__ == "__main__":
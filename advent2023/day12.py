@@ -1,71 +1,175 @@
-from utils.utils import Advent
+from advent2023.utils.utils import Advent
+from collections.abc import Iterable
 from itertools import combinations
-from tqdm import tqdm
-from functools import lru_cache
+from advent2023.utils.memo import Memo
+from advent2023.utils.profiling import progress
+from advent2023.utils.shared import map_shared, pack_lines, unpack_line
+import logging
+import numpy as np
+import numpy.typing as npt
 
-advent = Advent(12)
+LOGGER = logging.getLogger(__name__)
 
+# Number of search results kept in memory
+SEARCH_CACHE_SIZE = 1 << 12
+# Number of row and chunk suffixes numbered before starting over
+SUFFIX_TABLE_SIZE = 1 << 14
+
+
+def parse_line(line: str) -> tuple[str, tuple[int, ...]]:
+    s, t = line.split(" ")
+    return s, tuple([int(x) for x in t.split(",")])
 
-def main():
-    lines = advent.get_input_lines()
-    lines = [l.split(" ") for l in lines]
-    lines = [(s, tuple([int(x) for x in t.split(",")])) for s, t in lines]
 
+def parse(lines: list[str]) -> list[tuple[str, tuple[int, ...]]]:
+    return [parse_line(l) for l in lines]
+
+
+def part1(rows: Iterable[tuple[str, tuple[int, ...]]]) -> int:
     c = 0
-    for row, broken in tqdm(lines):
+    for row, broken in progress(rows):
         poss = arrangements(row, broken)
         for p in poss:
             if is_valid(p, broken):
                 c += 1
-    advent.submit(1, c)
-
-    c = 0
-    for row, broken in tqdm(lines):
-        c += search("?".join([row] * 5), 0, broken * 5, 0)
-        search.cache_clear()
-    advent.submit(2, c)
+    return c
 
 
-@lru_cache
-def search(row: str, idx: int, broken: tuple[int, ...], chunk_length: int) -> int:
+def part2(rows: Iterable[tuple[str, tuple[int, ...]]], jobs: int = 1) -> int:
     """
-    Search number of possible combinations for row[idx:]
-    given the remaining broken chunks and the current chunk length.
+    Count the arrangements of the unfolded rows, sharing the search results
+    of all the rows. With more than one job, rows are counted in a pool of
+    processes, which share the packed rows and only receive the index of
+    each row, and the search results of the rows they count.
 
     Args:
-        row (str): the row
-        idx (int): the current index in the row
-        broken (tuple[int, ...]): the remaining broken chunks
-        chunk_length (int): the current broken chunk length
+        rows (Iterable[tuple[str, tuple[int, ...]]]): the rows
+        jobs (int, optional): number of processes, 0 for one per CPU.
+        Defaults to 1.
 
     Returns:
-        int: the number of possible combinations
+        int: the sum of the number of arrangements of each row
+    """
+    if jobs != 1:
+        lines = [f"{row} {','.join(map(str, broken))}" for row, broken in rows]
+        buffer, offsets = pack_lines(lines)
+        tasks = [(i,) for i in range(len(lines))]
+        arrays = {"buffer": buffer, "offsets": offsets}
+        return sum(
+            map_shared(count_shared, arrays, tasks, jobs or None, setup_shared)
+        )
+
+    counter = Arrangements()
+    c = 0
+    for row, broken in progress(rows):
+        c += counter.unfolded(row, broken)
+    LOGGER.info(f"Search cache: {counter.search.info()}.")
+    return c
+
+
+def main():
+    advent = Advent(12)
+    rows = parse(advent.get_input_lines())
+    advent.submit(1, part1(rows))
+    advent.submit(2, part2(rows))
+
+
+def setup_shared(
+    arrays: dict[str, npt.NDArray[np.int64]]
+) -> tuple[dict[str, npt.NDArray[np.int64]], "Arrangements"]:
+    return arrays, Arrangements()
+
+
+def count_shared(
+    data: tuple[dict[str, npt.NDArray[np.int64]], "Arrangements"], index: int
+) -> int:
+    arrays, counter = data
+    return counter.unfolded(
+        *parse_line(unpack_line(arrays["buffer"], arrays["offsets"], index))
+    )
+
+
+class Arrangements:
+    """
+    Counts the arrangements of rows, sharing the results of identical
+    sub-problems of different rows. A result only depends on the rest of the
+    row and the remaining broken chunks, so the suffixes of each row and of
+    its chunks are numbered once, identical suffixes getting the same number,
+    and results are keyed on these two numbers, so that looking them up does
+    not copy the row or the chunks.
+
+    Numbers are never reused, so the table of numbered suffixes is simply
+    cleared when it grows too large: suffixes numbered again only miss the
+    results of their previous number, which the search cache evicts.
     """
-    # done searching, check that last chunk has corrent length
-    if idx == len(row):
-        return int(
-            len(broken) == 0
-            and chunk_length == 0
-            or len(broken) == 1
-            and broken[0] == chunk_length
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE) -> None:
+        self._suffixes: dict[str | tuple[int, ...], int] = {}
+        self._next = 0
+        self.search = Memo(
+            self._search,
+            maxsize,
+            key=lambda row, broken, rows, chunks, idx, group: (
+                rows[idx],
+                chunks[group],
+            ),
         )
 
-    total = 0
-    # current char is #, or ? and we try setting it to #
-    if row[idx] in "#?":
-        # increase length of current chunk by 1 and move to next char
-        total += search(row, idx + 1, broken, chunk_length + 1)
-
-    # current char is ., or ? and we try setting it to .
-    if row[idx] in ".?":
-        # no current chunk, move to next char
-        if not chunk_length:
-            total += search(row, idx + 1, broken, 0)
-        # check current chunk has correct length and move to next char, resetting current chunk to 0
-        elif len(broken) > 0 and chunk_length == broken[0]:
-            total += search(row, idx + 1, broken[1:], 0)
-
-    return total
+    def _number(self, suffix: str | tuple[int, ...]) -> int:
+        number = self._suffixes.get(suffix)
+        if number is None:
+            if len(self._suffixes) >= SUFFIX_TABLE_SIZE:
+                self._suffixes.clear()
+            number = self._suffixes[suffix] = self._next
+            self._next += 1
+        return number
+
+    def count(self, row: str, broken: tuple[int, ...]) -> int:
+        """
+        Count the possible arrangements of a row given its broken chunks.
+
+        Args:
+            row (str): the row
+            broken (tuple[int, ...]): the broken chunks
+
+        Returns:
+            int: the number of possible arrangements
+        """
+        # the search goes up to one past the end of the row
+        rows = [self._number(row[i:]) for i in range(len(row) + 1)]
+        rows.append(rows[-1])
+        chunks = [self._number(broken[i:]) for i in range(len(broken) + 1)]
+        return self.search(row, broken, rows, chunks, 0, 0)
+
+    def unfolded(self, row: str, broken: tuple[int, ...]) -> int:
+        return self.count("?".join([row] * 5), broken * 5)
+
+    def _search(
+        self,
+        row: str,
+        broken: tuple[int, ...],
+        rows: list[int],
+        chunks: list[int],
+        idx: int,
+        group: int,
+    ) -> int:
+        # number of arrangements of row[idx:] given the remaining broken
+        # chunks broken[group:]. With no chunks left, all remaining springs
+        # must be operational
+        if group == len(broken):
+            return int(row.find("#", idx) == -1)
+
+        size = broken[group]
+        total = 0
+        for start in range(idx, len(row) - size + 1):
+            end = start + size
+            # place the chunk at start, if it fits and is followed by a .
+            if "." not in row[start:end] and (end == len(row) or row[end] != "#"):
+                total += self.search(row, broken, rows, chunks, end + 1, group + 1)
+            # the chunk cannot start after the first #
+            if row[start] == "#":
+                break
+        return total
 
 
 def arrangements(row: str, broken: tuple[int, ...]) -> list[str]:
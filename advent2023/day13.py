@@ -1,127 +1,83 @@
-import numpy as np
-import numpy.typing as npt
-from tqdm import tqdm
-from utils.utils import Advent
-from collections.abc import Iterator
+import re
 
-advent = Advent(13)
+from advent2023.utils.grid import BitGrid, Grid
+from advent2023.utils.utils import Advent
 
 
-def main():
-    lines = advent.get_input_lines()
-    patterns = get_patterns(lines)
+def parse_bytes(data: bytes | memoryview) -> list[BitGrid]:
+    return get_patterns(data)
+
 
+def part1(patterns: list[BitGrid]) -> int:
     summaries = [get_mirror(p) for p in patterns]
-    advent.submit(1, sum(summaries))
+    return sum(summaries)
 
-    fixed_s = []
-    for i, p in tqdm(enumerate(patterns)):
-        for c in switch_one(p):
-            s = get_mirror(c, summaries[i])
-            if s:
-                fixed_s.append(s)
-                break
-    advent.submit(2, sum(fixed_s))
 
+def part2(patterns: list[BitGrid]) -> int:
+    summaries = [get_mirror(p, 1) for p in patterns]
+    return sum(summaries)
 
-def switch_one(pattern: npt.NDArray[np.str_]) -> Iterator[npt.NDArray[np.str_]]:
-    """
-    Switch one of the values of pattern
 
-    Args:
-        pattern (npt.NDArray[np.str_]): the pattern
-
-    Yields:
-        Iterator[npt.NDArray[np.str_]]: iterator over switched patterns
-    """
-    for x in range(pattern.shape[0]):
-        for y in range(pattern.shape[1]):
-            c = np.copy(pattern)
-            if c[x, y] == "#":
-                c[x, y] = "."
-            else:
-                c[x, y] = "#"
-            yield c
+def main():
+    advent = Advent(13)
+    patterns = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(patterns))
+    advent.submit(2, part2(patterns))
 
 
-def get_mirror(pattern: npt.NDArray[np.str_], avoid: int | None = None) -> int | None:
+def get_mirror(pattern: BitGrid, smudges: int = 0) -> int | None:
     """
-    Return summary value of mirror col or row in pattern, avoiding value if given
+    Return summary value of mirror col or row in pattern, i.e. the first col
+    or row for which the reflection differs from the pattern in exactly smudges
+    cells. With one smudge, fixing the smudge makes that col or row the mirror.
 
     Args:
-        pattern (npt.NDArray[np.str_]): the pattern
-        avoid (int | None, optional): value to avoid. Defaults to None.
+        pattern (BitGrid): the pattern, with a bit set for each rock
+        smudges (int, optional): number of differences. Defaults to 0.
 
     Returns:
         int | None: the mirror summary value
     """
-    for col in range(1, pattern.shape[1]):
-        if is_mirror_col(pattern, col) and (avoid is None or avoid != col):
+    cols = pattern.transpose().rows
+    for col in range(1, len(cols)):
+        if mirror_diff(cols, col) == smudges:
             return col
 
-    for row in range(1, pattern.shape[0]):
-        if is_mirror_row(pattern, row) and (avoid is None or avoid != row * 100):
+    for row in range(1, len(pattern.rows)):
+        if mirror_diff(pattern.rows, row) == smudges:
             return row * 100
 
 
-def get_patterns(lines: list[str]) -> list[npt.NDArray[np.str_]]:
-    """
-    Parse patterns
-
-    Args:
-        lines (list[str]): input lines
-
-    Returns:
-        list[npt.NDArray[np.str_]]: list of patterns
-    """
-    patterns = []
-    pattern = []
-    for line in lines:
-        if line:
-            pattern.append([c for c in line])
-        else:
-            patterns.append(np.array(pattern, dtype=str))
-            pattern = []
-    patterns.append(np.array(pattern, dtype=str))
-    return patterns
-
-
-def is_mirror_col(pattern: npt.NDArray[np.str_], col: int) -> bool:
+def get_patterns(data: bytes | memoryview) -> list[BitGrid]:
     """
-    Check if col is a mirror col (right most)
+    Parse patterns, separated by blank lines
 
     Args:
-        pattern (npt.NDArray[np.str_]): the pattern
-        col (int): the rightmost pattern of a potential mirror
+        data (bytes | memoryview): input bytes
 
     Returns:
-        bool: True if is mirror
+        list[BitGrid]: list of patterns
     """
-    j = 1
-    while 0 <= (col - j) and (col + j - 1) < pattern.shape[1]:
-        if not np.all(pattern[:, col - j] == pattern[:, col + j - 1]):
-            return False
-        j += 1
-    return True
+    blocks = re.split(rb"\n[ \t\r]*\n", bytes(data).strip())
+    return [BitGrid.from_mask(Grid.from_bytes(block).mask("#")) for block in blocks]
 
 
-def is_mirror_row(pattern: npt.NDArray[np.str_], row: int) -> bool:
+def mirror_diff(lines: list[int], line: int) -> int:
     """
-    Check if row is a mirror row (bottom most)
+    Count the differences between the lines of a pattern and their reflection
+    around a mirror placed before line
 
     Args:
-        pattern (npt.NDArray[np.str_]): the pattern
-        row (int): the lower row of a potential mirror
+        lines (list[int]): the pattern's rows or cols, packed as ints
+        line (int): the first line after a potential mirror
 
     Returns:
-        bool: True if row is mirror row
+        int: the number of cells which differ from their reflection
     """
-    j = 1
-    while 0 <= (row - j) and (row + j - 1) < pattern.shape[0]:
-        if not np.all(pattern[row - j, :] == pattern[row + j - 1, :]):
-            return False
-        j += 1
-    return True
+    width = min(line, len(lines) - line)
+    return sum(
+        (lines[line - 1 - k] ^ lines[line + k]).bit_count() for k in range(width)
+    )
 
 
 if __name__ == "__main__":
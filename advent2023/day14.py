@@ -1,144 +1,99 @@
 import numpy as np
 import numpy.typing as npt
-from tqdm import tqdm
-from utils.utils import Advent
+from advent2023.utils.algos import iterate
+from advent2023.utils.grid import Grid
+from advent2023.utils.utils import Advent
 
-advent = Advent(14)
+ROCK = ord("O")
+CUBE = ord("#")
+EMPTY = ord(".")
+
+
+def parse_bytes(data: bytes | memoryview) -> Grid:
+    return Grid.from_bytes(data)
+
+
+def part1(platform: Grid) -> int:
+    return get_load(tiltN(platform.cells))
+
+
+def part2(platform: Grid) -> int:
+    platform = iterate(cycle, platform.cells, 1000000000, fingerprint)
+    return get_load(platform)
 
 
 def main():
-    lines = advent.get_input_lines()
-    platform = np.array([[c for c in l] for l in lines], dtype=str)
-    tiltN(platform)
-    advent.submit(1, get_load(platform))
+    advent = Advent(14)
+    platform = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(platform))
+    advent.submit(2, part2(platform))
 
-    platform = np.array([[c for c in l] for l in lines], dtype=str)
-    cycle_to(1000000000, platform)
-    advent.submit(2, get_load(platform))
 
+def cycle(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    return tiltE(tiltS(tiltW(tiltN(platform))))
 
-def cycle_to(limit: int, platform: npt.NDArray[np.str_]):
-    """
-    Cycle to limit, finding a loop to skip steps.
 
-    Args:
-        limit (int): the limit
-        platform (npt.NDArray[np.str_]): the platform
-    """
-    cache = {}
-    start = None
-    end = None
-    for c in tqdm(range(limit)):
-        # cycle
-        tiltN(platform)
-        tiltW(platform)
-        tiltS(platform)
-        tiltE(platform)
-        # get indices of round rocks
-        rocks = np.where(platform == "O")
-        # check if we've seen to config already
-        h = hash(tuple(r.tostring() for r in rocks))
-        if h in cache:
-            # if we found a loop, break and save start and end cycles of loop
-            start = cache[h]
-            end = c
-            break
-        cache[h] = c
-
-    # if loop was found, cycle remaining steps
-    if start is not None and end is not None:
-        remaining = (limit - start) % (end - start) - 1
-        cycle_to(remaining, platform)
-
-
-def get_load(platform: npt.NDArray[np.str_]) -> int:
+def fingerprint(platform: npt.NDArray[np.uint8]) -> int:
+    return hash(platform.tobytes())
+
+
+def get_load(platform: npt.NDArray[np.uint8]) -> int:
     """
     Compute load
 
     Args:
-        platform (npt.NDArray[np.str_]): the platform
+        platform (npt.NDArray[np.uint8]): the platform
 
     Returns:
         int: the load
     """
     sx, _ = platform.shape
-    return sum([sx - x for x in np.where(platform == "O")[0]])
+    return int(np.sum(sx - np.nonzero(platform == ROCK)[0]))
 
 
-def tiltN(platform: npt.NDArray[np.str_]):
+def tilt(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
     """
-    Tilt platform to the north
+    Tilt platform to the north. Each column is split into segments by the
+    cube rocks, and the round rocks of a segment roll to its top, so a free
+    cell holds a round rock if its rank among the segment's free cells is
+    less than the number of round rocks in the segment.
 
     Args:
-        platform (npt.NDArray[np.str_]): the platform
-    """
-    sx, sy = platform.shape
-    for y in range(sy):
-        min = 0
-        for x in range(sx):
-            if platform[(x, y)] == "O":
-                platform[(x, y)] = "."
-                platform[(min, y)] = "O"
-                min += 1
-            elif platform[(x, y)] == "#":
-                min = x + 1
-
-
-def tiltW(platform: npt.NDArray[np.str_]):
-    """
-    Tilt platform to the west
+        platform (npt.NDArray[np.uint8]): the platform
 
-    Args:
-        platform (npt.NDArray[np.str_]): the platform
-    """
-    sx, sy = platform.shape
-    for x in range(sx):
-        min = 0
-        for y in range(sy):
-            if platform[(x, y)] == "O":
-                platform[(x, y)] = "."
-                platform[(x, min)] = "O"
-                min += 1
-            elif platform[(x, y)] == "#":
-                min = y + 1
-
-
-def tiltS(platform: npt.NDArray[np.str_]):
+    Returns:
+        npt.NDArray[np.uint8]: the tilted platform
     """
-    Tilt platform to the south
+    cube = platform == CUBE
+    free_count = np.cumsum(~cube, axis=0)
+    rock_count = np.cumsum(platform == ROCK, axis=0)
 
-    Args:
-        platform (npt.NDArray[np.str_]): the platform
-    """
-    sx, sy = platform.shape
-    for y in range(sy):
-        min = sx - 1
-        for x in range(sx - 1, -1, -1):
-            if platform[(x, y)] == "O":
-                platform[(x, y)] = "."
-                platform[(min, y)] = "O"
-                min -= 1
-            elif platform[(x, y)] == "#":
-                min = x - 1
-
-
-def tiltE(platform: npt.NDArray[np.str_]):
-    """
-    Tilt platform to the east
+    # counts before the segment, taken at the cube above it
+    free_before = np.maximum.accumulate(np.where(cube, free_count, 0), axis=0)
+    rocks_before = np.maximum.accumulate(np.where(cube, rock_count, 0), axis=0)
+    # count up to the end of the segment, taken at the cube below it
+    rocks_end = np.where(cube, rock_count, rock_count[-1])
+    rocks_end = np.minimum.accumulate(rocks_end[::-1], axis=0)[::-1]
 
-    Args:
-        platform (npt.NDArray[np.str_]): the platform
-    """
-    sx, sy = platform.shape
-    for x in range(sx):
-        min = sy - 1
-        for y in range(sy - 1, -1, -1):
-            if platform[(x, y)] == "O":
-                platform[(x, y)] = "."
-                platform[(x, min)] = "O"
-                min -= 1
-            elif platform[(x, y)] == "#":
-                min = y - 1
+    rank = free_count - 1 - free_before
+    rolled = np.where(rank < rocks_end - rocks_before, ROCK, EMPTY)
+    return np.where(cube, CUBE, rolled).astype(np.uint8)
+
+
+def tiltN(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    return tilt(platform)
+
+
+def tiltW(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    return tilt(platform.T).T
+
+
+def tiltS(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    return tilt(platform[::-1])[::-1]
+
+
+def tiltE(platform: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    return tilt(platform.T[::-1])[::-1].T
 
 
 if __name__ == "__main__":
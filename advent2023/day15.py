@@ -1,52 +1,68 @@
-from tqdm import tqdm
-from utils.utils import Advent
+from advent2023.utils.profiling import progress
+from advent2023.utils.utils import Advent
 from collections import defaultdict
+from collections.abc import Iterable
 
-advent = Advent(15)
+# Separator of the steps, when streaming them
+SEPARATOR = ","
 
 
-def main():
-    lines = advent.get_input_lines()
-    steps = lines[0].split(",")
-    hashes = [to_hash(s) for s in steps]
-    advent.submit(1, sum(hashes))
+def parse_bytes(data: bytes | memoryview) -> list[bytes]:
+    return bytes(data).strip().split(b",")
+
+
+def parse_line(step: str) -> bytes:
+    return step.encode()
+
+
+def part1(steps: Iterable[bytes]) -> int:
+    return sum(to_hash(s) for s in steps)
 
+
+def part2(steps: Iterable[bytes]) -> int:
     boxes = defaultdict(list)
-    for s in tqdm(steps):
+    for s in progress(steps):
         apply_step(s, boxes)
-    advent.submit(2, get_power(boxes))
+    return get_power(boxes)
+
+
+def main():
+    advent = Advent(15)
+    steps = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(steps))
+    advent.submit(2, part2(steps))
 
 
-def get_power(boxes: defaultdict[int, list[str]]) -> int:
+def get_power(boxes: defaultdict[int, list[tuple[bytes, int]]]) -> int:
     power = 0
     for b, lenses in boxes.items():
         power += (b + 1) * sum([(i + 1) * l[1] for i, l in enumerate(lenses)])
     return power
 
 
-def apply_step(step: str, boxes: defaultdict[int, list[str]]):
-    if "=" in step:
-        op = "="
+def apply_step(step: bytes, boxes: defaultdict[int, list[tuple[bytes, int]]]):
+    if b"=" in step:
+        op = b"="
     else:
-        op = "-"
+        op = b"-"
     label = step[: step.index(op)]
     box = to_hash(label)
 
     lenses = boxes[box]
     lensei = [i for i, l in enumerate(lenses) if l[0] == label]
 
-    if op == "-" and len(lensei) == 1:
+    if op == b"-" and len(lensei) == 1:
         del boxes[box][lensei[0]]
-    elif op == "=" and len(lensei) == 1:
+    elif op == b"=" and len(lensei) == 1:
         boxes[box][lensei[0]] = (label, int(step[step.index(op) + 1 :]))
-    elif op == "=":
+    elif op == b"=":
         boxes[box].append((label, int(step[step.index(op) + 1 :])))
 
 
-def to_hash(s: str) -> int:
+def to_hash(s: bytes) -> int:
     h = 0
     for c in s:
-        h += ord(c)
+        h += c
         h *= 17
         h = h % 256
     return h
@@ -1,90 +1,124 @@
-from tqdm import tqdm
 import numpy as np
-from utils.utils import Advent
+import numpy.typing as npt
+from advent2023.utils.grid import Grid
+from advent2023.utils.shared import map_shared
+from advent2023.utils.utils import Advent
+
+# Directions, in the order of the grid's neighbor table (deltas_4)
+UP, LEFT, RIGHT, DOWN = range(4)
+
+# Outgoing directions for each tile and incoming direction
+TILES = {
+    ".": {UP: (UP,), LEFT: (LEFT,), RIGHT: (RIGHT,), DOWN: (DOWN,)},
+    "/": {UP: (RIGHT,), LEFT: (DOWN,), RIGHT: (UP,), DOWN: (LEFT,)},
+    "\\": {UP: (LEFT,), LEFT: (UP,), RIGHT: (DOWN,), DOWN: (RIGHT,)},
+    "-": {UP: (LEFT, RIGHT), LEFT: (LEFT,), RIGHT: (RIGHT,), DOWN: (LEFT, RIGHT)},
+    "|": {UP: (UP,), LEFT: (UP, DOWN), RIGHT: (UP, DOWN), DOWN: (DOWN,)},
+}
 
-advent = Advent(16)
 
-DIRS = {"^": (-1, 0), ">": (0, 1), "v": (1, 0), "<": (0, -1)}
+def parse_bytes(data: bytes | memoryview) -> Grid:
+    return Grid.from_bytes(data)
+
+
+def part1(grid: Grid) -> int:
+    return energized(transitions(grid), grid.flat((0, 0)) * 4 + RIGHT)
 
-MIRRORS = {
-    "/": {"^": ">", ">": "^", "v": "<", "<": "v"},
-    "\\": {"^": "<", ">": "v", "v": ">", "<": "^"},
-}
 
-SPLITTERS = {"-": ("<", ">"), "|": ("^", "v")}
+def part2(grid: Grid, jobs: int = 1) -> int:
+    return find_config(grid, jobs)
 
 
 def main():
-    lines = advent.get_input_lines()
-    grid = np.array([[c for c in l] for l in lines], dtype=str)
-    activated = propagate(grid, (0, 0), ">")
-    activated = set([n for n, _ in activated])
-    advent.submit(1, len(activated))
-
-    advent.submit(2, find_config(grid))
-
-
-def find_config(grid):
-    res = 0
-    for x in range(grid.shape[0]):
-        activated = propagate(grid, (x, 0), ">")
-        res = max(res, len(set([n for n, _ in activated])))
-        activated = propagate(grid, (x, grid.shape[1] - 1), "<")
-        res = max(res, len(set([n for n, _ in activated])))
-
-    for y in range(grid.shape[0]):
-        activated = propagate(grid, (0, y), "v")
-        res = max(res, len(set([n for n, _ in activated])))
-        activated = propagate(grid, (grid.shape[0] - 1, y), "^")
-        res = max(res, len(set([n for n, _ in activated])))
-    return res
-
-
-def propagate(grid, start, dir):
-    seen = set()
-    beams = set(
-        [
-            (
-                start,
-                dir,
-            )
-        ]
-    )
-    while len(beams) != 0:
-        node, dir = beams.pop()
-        seen.add((node, dir))
-        new_beams = next_tiles(grid, node, dir)
-        for b in new_beams:
-            if b not in seen:
-                beams.add(b)
-    return seen
-
-
-def next_tiles(grid, node, dir):
-    tile = grid[node]
-    tiles = []
-    if tile == ".":
-        neighbor = node[0] + DIRS[dir][0], node[1] + DIRS[dir][1]
-        tiles.append((neighbor, dir))
-    if tile == "\\" or tile == "/":
-        next_dir = MIRRORS[tile][dir]
-        neighbor = node[0] + DIRS[next_dir][0], node[1] + DIRS[next_dir][1]
-        tiles.append((neighbor, next_dir))
-    if tile == "-" or tile == "|":
-        if dir in SPLITTERS[tile]:
-            neighbor = node[0] + DIRS[dir][0], node[1] + DIRS[dir][1]
-            tiles.append((neighbor, dir))
-        else:
-            for next_dir in SPLITTERS[tile]:
-                neighbor = node[0] + DIRS[next_dir][0], node[1] + DIRS[next_dir][1]
-                tiles.append((neighbor, next_dir))
-
-    tiles = [
-        (n, d)
-        for n, d in tiles
-        if 0 <= n[0] < grid.shape[0] and 0 <= n[1] < grid.shape[1]
-    ]
-    return tiles
+    advent = Advent(16)
+    grid = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(grid))
+    advent.submit(2, part2(grid))
+
+
+def find_config(grid: Grid, jobs: int = 1) -> int:
+    """
+    Find the maximum number of energized tiles over all the beams entering
+    the grid from one of its edges. With more than one job, beams are
+    followed in a pool of processes, which share the grid's cells and only
+    receive the start state of each beam.
+
+    Args:
+        grid (Grid): the grid
+        jobs (int, optional): number of processes, 0 for one per CPU.
+        Defaults to 1.
+
+    Returns:
+        int: the maximum number of energized tiles
+    """
+    rows, cols = grid.shape
+    starts = []
+    for x in range(rows):
+        starts.append(grid.flat((x, 0)) * 4 + RIGHT)
+        starts.append(grid.flat((x, cols - 1)) * 4 + LEFT)
+    for y in range(cols):
+        starts.append(grid.flat((0, y)) * 4 + DOWN)
+        starts.append(grid.flat((rows - 1, y)) * 4 + UP)
+
+    if jobs == 1:
+        table = transitions(grid)
+        return max(energized(table, start) for start in starts)
+    tasks = [(start,) for start in starts]
+    cells = {"cells": grid.cells}
+    return max(map_shared(energized, cells, tasks, jobs or None, shared_table))
+
+
+def shared_table(arrays: dict[str, npt.NDArray[np.uint8]]) -> list[tuple[int, ...]]:
+    return transitions(Grid(arrays["cells"]))
+
+
+def transitions(grid: Grid) -> list[tuple[int, ...]]:
+    """
+    Build the beam transition table. A beam state is the flat index of a tile
+    times 4 plus the direction the beam enters the tile with, and the table
+    lists the states that the beam moves to from each state, leaving out the
+    beams which exit the grid.
+
+    Args:
+        grid (Grid): the grid
+
+    Returns:
+        list[tuple[int, ...]]: the next states of each state
+    """
+    neighbors = grid.neighbors()
+    tiles = grid.cells.ravel()
+    table = np.full((grid.size * 4, 2), -1, dtype=np.intp)
+    for tile, outgoing in TILES.items():
+        cells = np.flatnonzero(tiles == ord(tile))
+        for incoming, directions in outgoing.items():
+            for i, direction in enumerate(directions):
+                neighbor = neighbors[cells, direction]
+                table[cells * 4 + incoming, i] = np.where(
+                    neighbor >= 0, neighbor * 4 + direction, -1
+                )
+    return [tuple(s for s in states if s >= 0) for states in table.tolist()]
+
+
+def energized(table: list[tuple[int, ...]], start: int) -> int:
+    """
+    Follow a beam from its start state, returning the number of tiles it
+    energizes.
+
+    Args:
+        table (list[tuple[int, ...]]): the beam transition table
+        start (int): the start state
+
+    Returns:
+        int: the number of energized tiles
+    """
+    seen = {start}
+    beams = [start]
+    while beams:
+        for state in table[beams.pop()]:
+            if state not in seen:
+                seen.add(state)
+                beams.append(state)
+    return len({state >> 2 for state in seen})
 
 
 if __name__ == "__main__":
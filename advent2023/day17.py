@@ -1,96 +1,122 @@
-import heapq
-from collections import defaultdict
-from collections.abc import Iterator
 from math import inf
 
 import numpy as np
 import numpy.typing as npt
-from utils.utils import Advent
+from advent2023.utils.algos import Graph, dijkstra
+from advent2023.utils.grid import Grid
+from advent2023.utils.profiling import phase
+from advent2023.utils.utils import Advent
 
-advent = Advent(17)
 
+def parse_bytes(data: bytes | memoryview) -> npt.NDArray[np.uint8]:
+    return Grid.from_bytes(data).cells - ord("0")
 
-def main():
-    lines = advent.get_input_lines()
-    grid = np.array([[int(c) for c in l] for l in lines], dtype=int)
-    advent.submit(1, find_path(grid, (0, 0), (grid.shape[0] - 1, grid.shape[1] - 1)))
-    advent.submit(
-        2, find_path(grid, 4, 10, (0, 0), (grid.shape[0] - 1, grid.shape[1] - 1))
-    )
-
-
-def find_path(
-    grid: npt.NDArray[np.int_],
-    min_step: int,
-    max_step: int,
-    src: tuple[int, int],
-    dst: tuple[int, int],
-) -> int:
-    queue = [(0, (src, True)), (0, (src, False))]
-    distances = defaultdict(lambda: inf)
-    visited = set()
 
-    while queue:
-        dist, (node, vertical) = heapq.heappop(queue)
+def part1(grid: npt.NDArray[np.uint8]) -> int:
+    return find_path(grid, 1, 3, (0, 0), (grid.shape[0] - 1, grid.shape[1] - 1))
 
-        if node == dst:
-            return dist
 
-        if (node, vertical) in visited:
-            continue
+def part2(grid: npt.NDArray[np.uint8]) -> int:
+    return find_path(grid, 4, 10, (0, 0), (grid.shape[0] - 1, grid.shape[1] - 1))
 
-        visited.add((node, vertical))
 
-        for neighbor, weight in neighbors(grid, (node, vertical), min_step, max_step):
-            distance = dist + weight
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                heapq.heappush(queue, (distance, neighbor))
-
-    return inf
+def main():
+    advent = Advent(17)
+    grid = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(grid))
+    advent.submit(2, part2(grid))
 
 
-def line_step(
-    grid: npt.NDArray[np.int_],
-    min_step: int,
-    max_step: int,
-    r: int,
-    c: int,
-    dr: int,
-    dc: int,
-) -> Iterator[tuple[tuple[int, int], int]]:
-    weight = 0
-    maxr = grid.shape[0] - 1
-    maxc = grid.shape[1] - 1
-    rr = r
-    rc = c
-    for step in range(1, max_step + 1):
-        rr += dr
-        rc += dc
-        if 0 <= rr <= maxr and 0 <= rc <= maxc:
-            weight += grid[rr, rc]
-            if min_step <= step:
-                yield ((rr, rc), weight)
-
-
-def neighbors(
-    grid: npt.NDArray[np.int_],
-    node: tuple[int, int],
+def find_path(
+    grid: npt.NDArray[np.uint8],
     min_step: int,
     max_step: int,
-) -> Iterator[tuple[tuple[tuple[int, int], bool], int]]:
-    (r, c), vertical = node
-
-    if vertical:
-        for coords, weight in line_step(grid, min_step, max_step, r, c, -1, 0):
-            yield (coords, not vertical), weight
-        for coords, weight in line_step(grid, min_step, max_step, r, c, 1, 0):
-            yield (coords, not vertical), weight
-    else:
-        for coords, weight in line_step(grid, min_step, max_step, r, c, 0, -1):
-            yield (coords, not vertical), weight
-        for coords, weight in line_step(grid, min_step, max_step, r, c, 0, 1):
-            yield (coords, not vertical), weight
+    src: tuple[int, int],
+    dst: tuple[int, int],
+) -> int:
+    """
+    Find the least heat loss from src to dst, with an A* search over the
+    crucible's states. The Manhattan distance to dst times the smallest heat
+    loss of a block is a consistent lower bound of the remaining heat loss.
+
+    Args:
+        grid (npt.NDArray[np.uint8]): the heat loss of each block
+        min_step (int): minimum number of blocks moved in a straight line
+        max_step (int): maximum number of blocks moved in a straight line
+        src (tuple[int, int]): the start position
+        dst (tuple[int, int]): the end position
+
+    Returns:
+        int: the least heat loss
+    """
+    rows, cols = grid.shape
+    with phase("graph"):
+        graph = crucible_graph(grid, min_step, max_step)
+    r, c = np.divmod(np.arange(grid.size), cols)
+    heuristic = (np.abs(r - dst[0]) + np.abs(c - dst[1])) * int(grid.min())
+
+    s = src[0] * cols + src[1]
+    t = dst[0] * cols + dst[1]
+    with phase("search"):
+        distances = dijkstra(
+            graph, [2 * s, 2 * s + 1], [2 * t, 2 * t + 1], np.repeat(heuristic, 2)
+        )
+    reached = distances[[2 * t, 2 * t + 1]]
+    reached = reached[reached >= 0]
+    return int(reached.min()) if reached.size else inf
+
+
+def crucible_graph(grid: npt.NDArray[np.uint8], min_step: int, max_step: int) -> Graph:
+    """
+    Build the graph of the crucible's states. The state of a crucible on block
+    i is 2 * i + 1 if it has to move vertically next, and 2 * i if it has to
+    move horizontally. Each move goes min_step to max_step blocks in a straight
+    line and costs the heat loss of the blocks entered, computed from prefix
+    sums along the rows and cols.
+
+    Args:
+        grid (npt.NDArray[np.uint8]): the heat loss of each block
+        min_step (int): minimum number of blocks moved in a straight line
+        max_step (int): maximum number of blocks moved in a straight line
+
+    Returns:
+        Graph: the graph of states
+    """
+    rows, cols = grid.shape
+    cells = np.arange(grid.size).reshape(rows, cols)
+    weights = grid.astype(np.int64)
+    # heat loss of rows 0 to i - 1 and of cols 0 to j - 1
+    rows_loss = np.zeros((rows + 1, cols), dtype=np.int64)
+    rows_loss[1:] = np.cumsum(weights, axis=0)
+    cols_loss = np.zeros((rows, cols + 1), dtype=np.int64)
+    cols_loss[:, 1:] = np.cumsum(weights, axis=1)
+
+    sources, targets, costs = [], [], []
+
+    def add(src, dst, vertical, loss):
+        sources.append(src.ravel() * 2 + vertical)
+        targets.append(dst.ravel() * 2 + 1 - vertical)
+        costs.append(loss.ravel())
+
+    for k in range(min_step, max_step + 1):
+        if k < rows:
+            # moving down enters rows r + 1 to r + k, moving up rows r to r + k - 1
+            top, bottom = cells[:-k], cells[k:]
+            add(top, bottom, 1, rows_loss[k + 1 :] - rows_loss[1:-k])
+            add(bottom, top, 1, rows_loss[k:-1] - rows_loss[: -k - 1])
+        if k < cols:
+            left, right = cells[:, :-k], cells[:, k:]
+            add(left, right, 0, cols_loss[:, k + 1 :] - cols_loss[:, 1:-k])
+            add(right, left, 0, cols_loss[:, k:-1] - cols_loss[:, : -k - 1])
+
+    if not sources:
+        return Graph.from_edges(2 * grid.size, [], [], np.empty(0, dtype=np.int64))
+    return Graph.from_edges(
+        2 * grid.size,
+        np.concatenate(sources),
+        np.concatenate(targets),
+        np.concatenate(costs),
+    )
 
 
 if __name__ == "__main__":
@@ -1,84 +1,75 @@
-from utils.utils import Advent
-import numpy as np
+from advent2023.utils.utils import Advent
+from collections.abc import Iterable
 
+Move = tuple[str, int]
 
-advent = Advent(18)
+# Directions of the moves encoded in hex codes
+DIRS = {"0": "R", "1": "D", "2": "L", "3": "U"}
 
 
-def main():
-    lines = advent.get_input_lines()
-    moves = parse_moves(lines)
-    distance, vertices = trenches(moves)
-    advent.submit(1, int(1 + (distance / 2) + poly_area(vertices)))
-
-    moves = parse_moves(lines, True)
-    distance, vertices = trenches(moves)
-    advent.submit(2, int(1 + (distance / 2) + poly_area(vertices)))
-
-
-def poly_area(vertices: list[tuple[int, int]]) -> float:
+def parse_line(line: str) -> tuple[Move, Move]:
     """
-    Compute area of polygon given its vertices using Shoelace formula.
+    Parse a dig plan line, as a move and as the move of its hex code.
 
     Args:
-        vertices (list[tuple[int, int]]): polygon vertices as list of x, y coordinates
+        line (str): the input line
 
     Returns:
-        float: the polygon area
+        tuple[Move, Move]: the move (dir, distance), and the move of the hex code
     """
-    x = np.array([x for x, _ in vertices[:-1]], dtype=int)
-    y = np.array([y for _, y in vertices[:-1]], dtype=int)
-    return 0.5 * np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+    dir, distance, color = line.split(" ")
+    return (dir, int(distance)), (DIRS[color[-2]], int(color[2:-2], 16))
 
 
-def parse_moves(lines: list[str], part2: bool = False) -> list[tuple[str, int]]:
-    """
-    Parse moves
+def parse(lines: list[str]) -> list[tuple[Move, Move]]:
+    return [parse_line(line) for line in lines]
 
-    Args:
-        lines (list[str]): the input lines
-        part2 (bool, optional): whether to parse hex codes as moves. Defaults to False.
 
-    Returns:
-        list[tuple[str, int]]: list of moves (dir, distance)
-    """
-    out = []
-    dirs = {"0": "R", "1": "D", "2": "L", "3": "U"}
-    for line in lines:
-        dir, distance, color = line.split(" ")
-        distance = int(distance)
-        if part2:
-            distance = int(color[2:-2], 16)
-            dir = dirs[color[-2]]
-        out.append((dir, distance))
-    return out
-
-
-def trenches(moves: list[tuple[str, int]]) -> tuple[int, list[tuple[int, int]]]:
+def part1(moves: Iterable[tuple[Move, Move]]) -> int:
+    return lagoon(m for m, _ in moves)
+
+
+def part2(moves: Iterable[tuple[Move, Move]]) -> int:
+    return lagoon(m for _, m in moves)
+
+
+def main():
+    advent = Advent(18)
+    moves = parse(advent.get_input_lines())
+    advent.submit(1, part1(moves))
+    advent.submit(2, part2(moves))
+
+
+def lagoon(moves: Iterable[Move]) -> int:
     """
-    Dig trenches for given moves
+    Compute the number of cubic meters of lava held by the trenches dug for
+    the given moves. The area of the polygon of the trenches is computed
+    with the Shoelace formula as the moves go, and Pick's theorem gives the
+    number of points inside and on the trenches.
 
     Args:
-        moves (list[tuple[str, int]]): the moves
+        moves (Iterable[Move]): the moves (dir, distance)
 
     Returns:
-        tuple[int, list[tuple[int, int]]]: the distance of the trenches, and the list of its vertices
+        int: the lagoon's size
     """
     x, y = 0, 0
-    vertices = [(x, y)]
+    area = 0
     distance = 0
     for dir, dist in moves:
+        nx, ny = x, y
         if dir == "R":
-            y += dist
+            ny += dist
         elif dir == "L":
-            y -= dist
+            ny -= dist
         elif dir == "D":
-            x += dist
+            nx += dist
         elif dir == "U":
-            x -= dist
-        vertices.append((x, y))
+            nx -= dist
+        area += x * ny - y * nx
         distance += dist
-    return distance, vertices
+        x, y = nx, ny
+    return (abs(area) + distance) // 2 + 1
 
 
 if __name__ == "__main__":
@@ -1,61 +1,79 @@
-from utils.utils import Advent
+from advent2023.utils.intervals import Box
+from advent2023.utils.utils import Advent
 import operator
 from collections.abc import Callable
-from math import prod
 
 
-advent = Advent(19)
+RATINGS = "xmas"
 
+Rules = dict[str, list[tuple[str, Callable[[int, int], bool], int, str] | tuple[str]]]
+
+
+def parse(lines: list[str]) -> tuple[Rules, list[dict[str, int]]]:
+    return parse_input(lines)
 
-def main():
-    lines = advent.get_input_lines()
-    rules, parts = parse_input(lines)
 
+def part1(system: tuple[Rules, list[dict[str, int]]]) -> int:
+    rules, parts = system
     ratings = 0
     for part in parts:
         dest = apply_rules(rules, part, rules["in"])
         if dest == "A":
             ratings += sum(part.values())
-    advent.submit(1, ratings)
+    return ratings
+
+
+def part2(system: tuple[Rules, list[dict[str, int]]]) -> int:
+    rules, _ = system
+    ratings = Box((1,) * len(RATINGS), (4001,) * len(RATINGS))
+    return accepted_vals(rules, ratings, "in")
 
-    ranges = {k: (1, 4000) for k in "xmas"}
-    advent.submit(2, accepted_vals(rules, ranges, "in"))
+
+def main():
+    advent = Advent(19)
+    system = parse(advent.get_input_lines())
+    advent.submit(1, part1(system))
+    advent.submit(2, part2(system))
 
 
 def accepted_vals(
     rules: dict[
         str, list[tuple[str, Callable[[int, int], bool], int, str] | tuple[str]]
     ],
-    ranges: dict[str, tuple[int, int]],
+    ratings: Box,
     rule: str = "in",
-):
+) -> int:
+    """
+    Count the combinations of ratings in a box which are accepted, starting
+    from rule. Each condition splits the box in two, the part which matches
+    the condition going to its destination and the rest to the next condition.
+
+    Args:
+        rules (dict[ str, list[tuple[str, Callable[[int, int], bool], int, str]
+        | tuple[str]] ]): the rules
+        ratings (Box): the box of ratings, with one axis per rating in RATINGS
+        rule (str, optional): the rule. Defaults to "in".
+
+    Returns:
+        int: the number of accepted combinations
+    """
     if rule == "A":
-        return prod([high - low + 1 for low, high in ranges.values()])
-    if rule == "R":
+        return ratings.volume
+    if rule == "R" or ratings.empty:
         return 0
 
     conditions = rules[rule][:-1]
     last = rules[rule][-1][0]
     total = 0
     for rating, op, val, dest in conditions:
-        low, high = ranges[rating]
-
+        axis = RATINGS.index(rating)
         if op is operator.lt:
-            if low < val:
-                new_ranges = ranges | {rating: (low, val - 1)}
-                total += accepted_vals(rules, new_ranges, dest)
-
-            if high >= val:
-                ranges |= {rating: (val, high)}
+            matched, ratings = ratings.split(axis, val)
         else:
-            if high > val:
-                new_ranges = ranges | {rating: (val + 1, high)}
-                total += accepted_vals(rules, new_ranges, dest)
-
-            if low <= val:
-                ranges |= {rating: (low, val)}
+            ratings, matched = ratings.split(axis, val + 1)
+        total += accepted_vals(rules, matched, dest)
 
-    total += accepted_vals(rules, ranges, last)
+    total += accepted_vals(rules, ratings, last)
     return total
 
 
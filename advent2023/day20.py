@@ -3,10 +3,8 @@ from collections import defaultdict, deque
 from collections.abc import Iterable
 from math import lcm
 
-from tqdm import tqdm
-from utils.utils import Advent
-
-advent = Advent(20)
+from advent2023.utils.profiling import progress
+from advent2023.utils.utils import Advent
 
 
 class Module(ABC):
@@ -77,25 +75,40 @@ class Conjunction(Module):
         )
 
 
-def main():
-    lines = advent.get_input_lines()
+def parse(lines: list[str]) -> list[str]:
+    # modules are stateful, so each part builds its own from the input lines
+    return lines
+
+
+def part1(lines: list[str]) -> int:
     modules = get_modules(lines)
     low = 0
     high = 0
-    for i in tqdm(range(1000)):
+    for i in progress(range(1000)):
         l, h, _ = press_btn(modules)
         low += l
         high += h
-    advent.submit(1, low * high)
+    return low * high
+
 
-    # qb sends to rx, will send a low pulse when all its inputs have sent a high pulse.
-    # find loops for qb's inputs sending high pulses, then get LCM
+def part2(lines: list[str]) -> int:
+    modules = get_modules(lines)
+    # the conjunction sending to rx will send a low pulse when all its inputs have sent
+    # a high pulse. find loops for its inputs sending high pulses, then get LCM
+    output = next(name for name, m in modules.items() if "rx" in m.children)
     loops = []
-    for input in modules["qb"].memory.keys():
+    for input in modules[output].memory.keys():
         pulse = "high"
         c = find_loops(lines, pulse, input)
         loops.append(c)
-    advent.submit(2, lcm(*loops))
+    return lcm(*loops)
+
+
+def main():
+    advent = Advent(20)
+    lines = parse(advent.get_input_lines())
+    advent.submit(1, part1(lines))
+    advent.submit(2, part2(lines))
 
 
 def find_loops(
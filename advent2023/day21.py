@@ -1,44 +1,24 @@
-from utils.utils import Advent
+from advent2023.utils.algos import bfs, reachable_in
+from advent2023.utils.grid import Grid
+from advent2023.utils.utils import Advent
 import numpy as np
-import numpy.typing as npt
-from collections.abc import Iterator
 
-advent = Advent(21)
 
-deltas_4 = ((-1, 0), (0, -1), (0, 1), (1, 0))
+def parse_bytes(data: bytes | memoryview) -> Grid:
+    return Grid.from_bytes(data)
+
+
+def part1(grid: Grid, steps: int = 64) -> int:
+    # a plot can be reached in exactly steps steps if its distance from the
+    # start is at most steps and has the same parity
+    distances = bfs(~grid.mask("#"), [grid.index("S")], cutoff=steps)
+    return int(np.count_nonzero(reachable_in(distances, steps)))
 
 
 def main():
-    lines = advent.get_input_lines()
-    grid = np.array([[c for c in l] for l in lines], dtype=str)
-    start = np.where(grid == "S")
-    start = start[0][0], start[1][0]
-    nodes = {start}
-    for i in range(64):
-        nodes = step(grid, nodes)
-    advent.submit(1, len(nodes))
-
-
-def neighbors(
-    grid: npt.NDArray[np.str_], node: tuple[int, int]
-) -> Iterator[tuple[int, int]]:
-    r, c = node
-    maxr = len(grid) - 1
-    maxc = len(grid[0]) - 1
-    for dr, dc in deltas_4:
-        rr, rc = r + dr, c + dc
-        if 0 <= rr <= maxr and 0 <= rc <= maxc and grid[(rr, rc)] != "#":
-            yield (rr, rc)
-
-
-def step(
-    grid: npt.NDArray[np.str_], nodes: set[tuple[int, int]]
-) -> set[tuple[int, int]]:
-    next_nodes = set()
-    for node in nodes:
-        for neighbor in neighbors(grid, node):
-            next_nodes.add(neighbor)
-    return next_nodes
+    advent = Advent(21)
+    grid = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(grid))
 
 
 if __name__ == "__main__":
@@ -1,17 +1,29 @@
 from __future__ import annotations
-from utils.utils import Advent
-from itertools import product
+from advent2023.utils.parse import int_matrix
+from advent2023.utils.utils import Advent
+from copy import deepcopy
+from collections.abc import Iterator
+from itertools import count, product
 from collections import defaultdict, deque
 from string import ascii_uppercase
 
 
-advent = Advent(22)
+def brick_ids() -> Iterator[str]:
+    """
+    Generate brick ids: AAA, AAB, ..., ZZZ, AAAA, ...
+
+    Yields:
+        Iterator[str]: the ids
+    """
+    for n in count(3):
+        for letters in product(ascii_uppercase, repeat=n):
+            yield "".join(letters)
 
 
 class Brick:
-    ids = product(ascii_uppercase, repeat=3)
-
-    def __init__(self, start: tuple[int, int, int], end: tuple[int, int, int]) -> None:
+    def __init__(
+        self, start: tuple[int, int, int], end: tuple[int, int, int], id: str
+    ) -> None:
         cubes = []
         for i in range(len(start)):
             if start[i] != end[i]:
@@ -26,7 +38,7 @@ class Brick:
         if not cubes:
             cubes.append(start)
         self.cubes = cubes
-        self.id = "".join(next(Brick.ids))
+        self.id = id
 
     @property
     def min_height(self) -> int:
@@ -55,20 +67,52 @@ class Brick:
         return self.id + ": " + " ".join([str(c) for c in self.cubes])
 
 
-def main():
-    lines = advent.get_input_lines()
-    bricks = get_bricks(lines)
-    bricks.sort(key=lambda x: x.min_height)
-    fall_bricks(bricks)
-    supported_by, supports = get_supports(bricks)
+def parse(lines: list[str]) -> list[Brick]:
+    return get_bricks(lines)
+
+
+def part1(bricks: list[Brick]) -> int:
+    bricks, supported_by, _ = settle(bricks)
     removable = get_removable(bricks, supported_by)
-    advent.submit(1, len(removable))
+    return len(removable)
+
 
+def part2(bricks: list[Brick]) -> int:
+    bricks, supported_by, supports = settle(bricks)
+    removable = get_removable(bricks, supported_by)
     to_remove = set([b.id for b in bricks]) - removable
     total = 0
     for b in to_remove:
         total += len(get_falling(b, supported_by, supports)) - 1
-    advent.submit(2, total)
+    return total
+
+
+def main():
+    advent = Advent(22)
+    bricks = parse(advent.get_input_lines())
+    advent.submit(1, part1(bricks))
+    advent.submit(2, part2(bricks))
+
+
+def settle(
+    bricks: list[Brick],
+) -> tuple[list[Brick], dict[str, set[str]], dict[str, set[str]]]:
+    """
+    Make a copy of the bricks fall to their lowest possible height and compute
+    which bricks support which other bricks
+
+    Args:
+        bricks (list[Brick]): list of bricks, left untouched
+
+    Returns:
+        tuple[list[Brick], dict[str, set[str]], dict[str, set[str]]]: the fallen bricks,
+        and dicts of supported_by and supports
+    """
+    bricks = deepcopy(bricks)
+    bricks.sort(key=lambda x: x.min_height)
+    fall_bricks(bricks)
+    supported_by, supports = get_supports(bricks)
+    return bricks, supported_by, supports
 
 
 def get_falling(
@@ -141,7 +185,7 @@ def get_removable(bricks: list[Brick], supported_by: dict[str, set[str]]) -> set
     removable = set([b.id for b in bricks])
     for values in supported_by.values():
         if len(values) == 1:
-            removable.discard(values.pop())
+            removable.discard(next(iter(values)))
     return removable
 
 
@@ -173,15 +217,8 @@ def fall_bricks(bricks: list[Brick]):
 
 
 def get_bricks(lines: list[str]) -> list[Brick]:
-    bricks = []
-    for line in lines:
-        left, right = line.split("~")
-        left = left.split(",")
-        right = right.split(",")
-        left = tuple([int(x) for x in left])
-        right = tuple([int(x) for x in right])
-        bricks.append(Brick(left, right))
-    return bricks
+    ends = int_matrix(lines).reshape(-1, 6).tolist()
+    return [Brick(tuple(e[:3]), tuple(e[3:]), id) for e, id in zip(ends, brick_ids())]
 
 
 if __name__ == "__main__":
@@ -1,203 +1,139 @@
-import sys
-from collections import defaultdict, deque
-from collections.abc import Iterator
-
 import numpy as np
-import numpy.typing as npt
-from utils.utils import Advent
+from advent2023.utils.algos import Graph, contract
+from advent2023.utils.grid import Grid
+from advent2023.utils.profiling import phase
+from advent2023.utils.utils import Advent
 
-advent = Advent(23)
+PATH = ord(".")
+FOREST = ord("#")
+# Slopes and the direction they go down to, as an index in the neighbor table
+SLOPES = {ord(">"): 2, ord("v"): 3}
 
-deltas_4 = ((-1, 0), (0, -1), (0, 1), (1, 0))
-sys.setrecursionlimit(10**6)
 
+def parse_bytes(data: bytes | memoryview) -> Grid:
+    return Grid.from_bytes(data)
 
-def main():
-    lines = advent.get_input_lines()
-    grid = np.array([[c for c in l] for l in lines], dtype=str)
-    h, w = grid.shape
-    start = (0, np.where(grid[0, :] == ".")[0][0])
-    end = (h - 1, np.where(grid[h - 1, :] == ".")[0][0])
 
-    graph = grid_to_graph(grid, start, end, False)
-    advent.submit(1, longest_path(graph, end, start, 0, set()))
+def part1(grid: Grid) -> int:
+    return hike(grid, False)
 
-    graph = grid_to_graph(grid, start, end, True)
-    advent.submit(2, longest_path(graph, end, start, 0, set()))
 
+def part2(grid: Grid) -> int:
+    return hike(grid, True)
 
-def grid_to_graph(
-    grid: npt.NDArray[np.str_],
-    src: tuple[int, int],
-    end: tuple[int, int],
-    ignore_slopes: bool = False,
-) -> dict[tuple[int, int], set[tuple[int, int]]]:
-    """
-    Transform grid to a graph. If ignore_slopes is True, slopes are ignored
-    and graph is simplified by merging nodes that have only two neighbors,
-    keeping only intersections as nodes
 
-    Args:
-        grid (npt.NDArray[np.str_]): the grid
-        src (tuple[int, int]): the starting position
-        end (tuple[int, int]): the end position
-        ignore_slopes (bool, optional): ignore slopes. Defaults to False.
+def main():
+    advent = Advent(23)
+    grid = parse_bytes(advent.get_input_bytes())
+    advent.submit(1, part1(grid))
+    advent.submit(2, part2(grid))
 
-    Returns:
-        dict[tuple[int, int], set[tuple[int, int]]]: the graph
-    """
-    graph = defaultdict(set)
-    seen = set()
-    queue = deque([src])
-
-    while queue:
-        node = queue.popleft()
-        if node in seen:
-            continue
-        seen.add(node)
-
-        if ignore_slopes:
-            for n, weight in adjacent_nodes(grid, node, src, end):
-                graph[node].add((n, weight))
-                queue.append(n)
-        else:
-            for n in neighbors(grid, node):
-                graph[node].add((n, 1))
-                queue.append(n)
-
-    return graph
-
-
-def adjacent_nodes(
-    grid: npt.NDArray[np.str_],
-    curr: tuple[int, int],
-    src: tuple[int, int],
-    end: tuple[int, int],
-) -> Iterator[tuple[tuple[int, int], int]]:
+
+def endpoints(grid: Grid) -> tuple[int, int]:
     """
-    Yield the adjacent nodes and their distance from the curr position. Nodes
-    are grid positions that are either the start or end, or that have more than
-    2 neighbors
+    Find the start and end positions, the openings in the top and bottom rows
 
     Args:
-        grid (npt.NDArray[np.str_]): the grid
-        curr (tuple[int, int]): the current pos
-        src (tuple[int, int]): the start pos
-        end (tuple[int, int]): the end pos
+        grid (Grid): the grid
 
-    Yields:
-        Iterator[tuple[tuple[int, int], int]]: iterator of nodes, distance
+    Returns:
+        tuple[int, int]: the flat indices of the start and end positions
     """
-    queue = [(curr, 0)]
-    visited = set()
-
-    while queue:
-        node, dist = queue.pop()
-        visited.add(node)
-
-        for n in neighbors(grid, node, True):
-            if n in visited:
-                continue
+    h, _ = grid.shape
+    start = (0, int(np.flatnonzero(grid[0, :] == PATH)[0]))
+    end = (h - 1, int(np.flatnonzero(grid[h - 1, :] == PATH)[0]))
+    return grid.flat(start), grid.flat(end)
 
-            if is_node(grid, n, src, end, True):
-                yield n, dist + 1
-                continue
 
-            queue.append((n, dist + 1))
-
-
-def is_node(
-    grid: npt.NDArray[np.str_],
-    node: tuple[int, int],
-    src: tuple[int, int],
-    end: tuple[int, int],
-    ignore_slopes: bool,
-) -> bool:
+def trail_graph(grid: Grid, ignore_slopes: bool = False) -> Graph:
     """
-    Check if node position is a node in the graph, i.e. is the start or end pos, or
-    has more than two neighbors
+    Build the graph of the trails, by flat index. Paths lead to their neighbors
+    which are not forest, and slopes only lead downhill unless ignore_slopes
+    is True.
 
     Args:
-        grid (npt.NDArray[np.str_]): the grid
-        node (tuple[int, int]): the curr pos
-        src (tuple[int, int]): the start pos
-        end (tuple[int, int]): the end pos
-        ignore_slopes (bool): ignore slopes
+        grid (Grid): the grid
+        ignore_slopes (bool, optional): ignore slopes. Defaults to False.
 
     Returns:
-        bool: true if curr node is a node
+        Graph: the graph of the trails
     """
-    return (
-        node == src
-        or node == end
-        or len(list(neighbors(grid, node, ignore_slopes))) > 2
-    )
-
-
-def neighbors(
-    grid: npt.NDArray[np.str_], node: tuple[int, int], ignore_slopes: bool = False
-) -> Iterator[tuple[int, int]]:
+    tiles = grid.cells.ravel()
+    table = grid.neighbors()
+    sources = np.repeat(np.arange(grid.size), table.shape[1])
+    targets = table.ravel()
+    valid = (tiles[sources] != FOREST) & (targets >= 0)
+    valid[valid] = tiles[targets[valid]] != FOREST
+    if not ignore_slopes:
+        # the direction each tile leads to, -1 for paths which lead everywhere
+        downhill = np.full(256, -2)
+        downhill[PATH] = -1
+        for slope, direction in SLOPES.items():
+            downhill[slope] = direction
+        directions = np.tile(np.arange(table.shape[1]), grid.size)
+        lead = downhill[tiles[sources]]
+        valid &= (lead == -1) | (lead == directions)
+    weights = np.ones(np.count_nonzero(valid), dtype=np.int64)
+    return Graph.from_edges(grid.size, sources[valid], targets[valid], weights)
+
+
+def hike(grid: Grid, ignore_slopes: bool = False) -> int:
     """
-    Iterator for the neighbors of given node
+    Find the longest hike from start to end, on the graph of the trails
+    contracted to their intersections.
 
     Args:
-        grid (npt.NDArray[np.str_]): the grid
-        node (tuple[int, int]): the node
-        ignore_slopes (bool, optional): ignore_slopes. Defaults to False.
+        grid (Grid): the grid
+        ignore_slopes (bool, optional): ignore slopes. Defaults to False.
 
-    Yields:
-        Iterator[tuple[int, int]]: Iterator of neighbor positions
+    Returns:
+        int: the length of the longest hike
     """
-    r, c = node
-    maxr = grid.shape[0] - 1
-    maxc = grid.shape[1] - 1
-    cell = grid[node]
-
-    if cell == "." or ignore_slopes:
-        for dr, dc in deltas_4:
-            rr, rc = r + dr, c + dc
-            if 0 <= rr <= maxr and 0 <= rc <= maxc and grid[rr, rc] != "#":
-                yield (rr, rc)
-    elif cell == ">":
-        yield (r, c + 1)
-    elif cell == "v":
-        yield (r + 1, c)
-
-
-def longest_path(
-    graph: dict[tuple[int, int], set[tuple[int, int]]],
-    end: tuple[int, int],
-    curr: tuple[int, int],
-    dist: int,
-    seen: set[tuple[int, int]],
-) -> int:
+    start, end = endpoints(grid)
+    with phase("contract"):
+        graph, nodes = contract(trail_graph(grid, ignore_slopes), keep=(start, end))
+    ids = {node: i for i, node in enumerate(nodes.tolist())}
+    with phase("search"):
+        return longest_path(graph, ids[start], ids[end])
+
+
+def longest_path(graph: Graph, src: int, dst: int) -> int:
     """
-    Find the longest path in the graph, from curr position to end, given dist
-    and traversed nodes to reach curr position
+    Find the longest path in the graph from src to dst which does not visit
+    a node twice, with a depth first search keeping the visited nodes as
+    a bitmask. When dst has a single predecessor, a path which reaches that
+    predecessor must go straight to dst, which prunes most of the search.
 
     Args:
-        graph (dict[tuple[int, int], set[tuple[int, int]]]): the graph
-        end (tuple[int, int]): the end position
-        curr (tuple[int, int]): the curr position
-        dist (int): distance to reach curr position
-        seen (set[tuple[int, int]]): nodes traversed to reach curr position
+        graph (Graph): the graph
+        src (int): the source node
+        dst (int): the destination node
 
     Returns:
-        int: the longest path
+        int: the length of the longest path, 0 if dst cannot be reached
     """
-    if curr == end:
-        return dist
-
-    best = 0
-    seen.add(curr)
-
-    for n, weight in graph[curr]:
-        if n in seen:
-            continue
-        best = max(best, longest_path(graph, end, n, dist + weight, seen))
-
-    seen.remove(curr)
-    return best
+    indptr = graph.indptr.tolist()
+    edges = [
+        list(zip(graph.indices[i:j].tolist(), graph.weights[i:j].tolist()))
+        for i, j in zip(indptr, indptr[1:])
+    ]
+    predecessors = {u for u, out in enumerate(edges) for n, _ in out if n == dst}
+    if len(predecessors) == 1:
+        last = predecessors.pop()
+        edges[last] = [(n, weight) for n, weight in edges[last] if n == dst]
+
+    def search(curr: int, dist: int, seen: int) -> int:
+        if curr == dst:
+            return dist
+        best = 0
+        for n, weight in edges[curr]:
+            if not seen >> n & 1:
+                length = search(n, dist + weight, seen | 1 << n)
+                if length > best:
+                    best = length
+        return best
+
+    return search(src, 0, 1 << src)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,28 @@
-from utils.utils import Advent
+from advent2023.utils.parse import int_matrix
+from advent2023.utils.utils import Advent
 from itertools import combinations
 
-advent = Advent(24)
 
+def parse(lines: list[str]) -> list[tuple[tuple[int, int, int], tuple[int, int, int]]]:
+    return get_stones(lines)
 
-def main():
-    lines = advent.get_input_lines()
-    stones = get_stones(lines)
 
+def part1(
+    stones: list[tuple[tuple[int, int, int], tuple[int, int, int]]],
+    minx: int = 200000000000000,
+    maxx: int = 400000000000000,
+) -> int:
     total = 0
     for s1, s2 in combinations(stones, 2):
-        if intersect_in_area(*s1, *s2, 200000000000000, 400000000000000):
+        if intersect_in_area(*s1, *s2, minx, maxx):
             total += 1
-    advent.submit(1, total)
+    return total
+
+
+def main():
+    advent = Advent(24)
+    stones = parse(advent.get_input_lines())
+    advent.submit(1, part1(stones))
 
 
 def intersect_in_area(
@@ -44,13 +54,9 @@ def intersect_in_area(
 def get_stones(
     lines: list[str],
 ) -> list[tuple[tuple[int, int, int], tuple[int, int, int]]]:
-    stones = []
-    for line in lines:
-        pos, v = line.split("@")
-        pos = tuple([int(c.strip()) for c in pos.strip().split(",")])
-        v = tuple([int(c.strip()) for c in v.strip().split(",")])
-        stones.append((pos, v))
-    return stones
+    # as python ints, which do not overflow when intersecting trajectories
+    stones = int_matrix(lines).reshape(-1, 6).tolist()
+    return [(tuple(s[:3]), tuple(s[3:])) for s in stones]
 
 
 def det(a: tuple[int, int], b: tuple[int, int]) -> int:
@@ -0,0 +1,38 @@
+"""
+Seeded generators of synthetic puzzle inputs, one module per day. Each module
+exposes a generate(size, seed) function returning an input text which the day's
+parser accepts. size scales the input relative to the size of an official
+input: the number of lines for line-oriented days, the number of cells for
+grid days.
+"""
+import importlib
+
+
+def generate(day: int, size: float = 1, seed: int = 0) -> str:
+    """
+    Generate an input for a day.
+
+    Args:
+        day (int): the day
+        size (float, optional): size relative to an official input. Defaults to 1.
+        seed (int, optional): the random seed. Defaults to 0.
+
+    Returns:
+        str: the input text
+    """
+    module = importlib.import_module(f"advent2023.generators.day{day:02d}")
+    return module.generate(size, seed)
+
+
+def scaled(count: int, size: float) -> int:
+    """
+    Scale a number of items by size.
+    """
+    return max(1, round(count * size))
+
+
+def scaled_side(side: int, size: float) -> int:
+    """
+    Scale the side of a square grid so that its number of cells scales by size.
+    """
+    return max(3, round(side * size**0.5))
@@ -0,0 +1,28 @@
+import random
+import string
+
+from advent2023.day01 import DIGITS
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Lines of letters, digits and spelled out digits, with at least one digit
+    on each line.
+    """
+    rng = random.Random(seed)
+    words = list(DIGITS.keys())
+    lines = []
+    for _ in range(scaled(1000, size)):
+        tokens = [rng.choice(string.digits[1:])]
+        for _ in range(rng.randint(1, 10)):
+            x = rng.random()
+            if x < 0.3:
+                tokens.append(rng.choice(string.digits[1:]))
+            elif x < 0.6:
+                tokens.append(rng.choice(words))
+            else:
+                tokens.append(rng.choice(string.ascii_lowercase))
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,20 @@
+import random
+
+from advent2023.generators import scaled
+
+COLORS = ("red", "green", "blue")
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Games of 1 to 6 draws of up to 15 cubes of each color.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for id in range(1, scaled(100, size) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, 3))
+            draws.append(", ".join([f"{rng.randint(1, 15)} {c}" for c in colors]))
+        lines.append(f"Game {id}: " + "; ".join(draws))
+    return "\n".join(lines) + "\n"
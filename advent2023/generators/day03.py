@@ -0,0 +1,28 @@
+import random
+
+from advent2023.generators import scaled_side
+
+SYMBOLS = "*#+$/@=%-&"
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square schematic of numbers separated by dots, with symbols (mostly
+    gears) scattered between them.
+    """
+    rng = random.Random(seed)
+    n = scaled_side(140, size)
+    grid = [["."] * n for _ in range(n)]
+    for row in grid:
+        c = rng.randint(0, 4)
+        while c < n:
+            if rng.random() < 0.5:
+                number = str(rng.randint(1, 999))[: n - c]
+                row[c : c + len(number)] = number
+                c += len(number)
+            else:
+                row[c] = "*" if rng.random() < 0.4 else rng.choice(SYMBOLS)
+                c += 1
+            # leave at least one dot between numbers and symbols
+            c += rng.randint(1, 6)
+    return "\n".join(["".join(row) for row in grid]) + "\n"
@@ -0,0 +1,33 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Cards of 10 winning numbers and 25 drawn numbers. Cards never win copies
+    of cards past the end of the table.
+    """
+    rng = random.Random(seed)
+    count = scaled(200, size)
+    width = len(str(count))
+    lines = []
+    for id in range(1, count + 1):
+        numbers = rng.sample(range(1, 100), 35 - 10)
+        winning = rng.sample(range(1, 100), 10)
+        matches = min(rng.choice((0, 0, 0, 1, 1, 2, 3, 4, 5, 10)), count - id)
+        draw = winning[:matches] + [n for n in numbers if n not in winning]
+        draw = draw[:25]
+        # pad draws with extra numbers that are not winning
+        while len(draw) < 25:
+            n = rng.randint(1, 99)
+            if n not in winning and n not in draw:
+                draw.append(n)
+        rng.shuffle(draw)
+        lines.append(
+            f"Card {id:>{width}}: "
+            + " ".join([f"{n:2d}" for n in winning])
+            + " | "
+            + " ".join([f"{n:2d}" for n in draw])
+        )
+    return "\n".join(lines) + "\n"
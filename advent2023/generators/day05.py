@@ -0,0 +1,35 @@
+import random
+
+from advent2023.day05 import MAP_KEYS
+from advent2023.generators import scaled
+
+DOMAIN = 2**32
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Seed ranges and conversion maps. Each map cuts part of the domain into
+    consecutive source ranges, and sends them to a shuffled arrangement of the
+    same ranges.
+    """
+    rng = random.Random(seed)
+    seeds = []
+    for _ in range(scaled(10, size)):
+        start = rng.randrange(DOMAIN)
+        seeds += [start, rng.randint(1, min(DOMAIN - start, DOMAIN // 20))]
+    lines = ["seeds: " + " ".join([str(s) for s in seeds])]
+
+    for key in MAP_KEYS:
+        lines += ["", f"{key} map:"]
+        cuts = sorted(rng.sample(range(DOMAIN), scaled(30, size) + 1))
+        ranges = [(a, b - a) for a, b in zip(cuts, cuts[1:])]
+        shuffled = ranges[:]
+        rng.shuffle(shuffled)
+        dest = cuts[0]
+        dests = {}
+        for src, length in shuffled:
+            dests[src] = dest
+            dest += length
+        for src, length in ranges:
+            lines.append(f"{dests[src]} {src} {length}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,33 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Races of two digit times. All races but four have two digit record
+    distances, so that the part 2 race, whose time and distance concatenate all
+    the races' digits, keeps a record about 10^4 times its duration whatever
+    the number of races.
+    """
+    rng = random.Random(seed)
+    count = max(4, scaled(4, size))
+    long = set(rng.sample(range(count), 4))
+    times = []
+    distances = []
+    for i in range(count):
+        time = rng.randint(21, 99)
+        best = time * time // 4
+        if i in long:
+            distance = rng.randint(100, min(999, best - 1))
+        else:
+            distance = rng.randint(10, min(99, best - 1))
+        times.append(time)
+        distances.append(distance)
+    return (
+        "Time:     "
+        + " ".join([f"{t:>4}" for t in times])
+        + "\nDistance: "
+        + " ".join([f"{d:>4}" for d in distances])
+        + "\n"
+    )
@@ -0,0 +1,16 @@
+import random
+
+from advent2023.day07 import CARDS
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Random hands of five cards with bids up to 1000.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(scaled(1000, size)):
+        hand = "".join(rng.choices(CARDS, k=5))
+        lines.append(f"{hand} {rng.randint(1, 1000)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,64 @@
+import random
+import string
+from itertools import count
+
+from advent2023.generators import scaled
+
+
+def is_prime(n: int) -> bool:
+    return n > 1 and all(n % d for d in range(2, int(n**0.5) + 1))
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A network of six chains, from a start node ending in A (the first one is
+    AAA) to an end node ending in Z (ZZZ for the first chain). Each end node
+    loops back to the second node of its chain, so each chain's cycle length is
+    also the number of steps to first reach its end. Cycle lengths are distinct
+    primes.
+    """
+    rng = random.Random(seed)
+    length = max(3, scaled(125, size))
+    lengths = []
+    for n in count(length):
+        if is_prime(n):
+            lengths.append(n)
+        if len(lengths) == 6:
+            break
+    rng.shuffle(lengths)
+
+    # names of intermediate nodes never end in A or Z
+    width = 3
+    while 24 * 26 ** (width - 1) < 2 * sum(lengths):
+        width += 1
+    letters = string.ascii_uppercase
+    middle = {}
+    while len(middle) < sum(lengths):
+        prefix = "".join(rng.choices(letters, k=width - 1))
+        middle[prefix + rng.choice(letters[1:-1])] = None
+    middle = iter(middle)
+    prefixes = {}
+    while len(prefixes) < len(lengths) - 1:
+        prefix = "".join(rng.choices(letters, k=width - 1))
+        if prefix not in ("AA", "ZZ"):
+            prefixes[prefix] = None
+    prefixes = iter(prefixes)
+
+    nodes = {}
+    for i, c in enumerate(lengths):
+        if i == 0:
+            start, end = "AAA", "ZZZ"
+        else:
+            prefix = next(prefixes)
+            start, end = prefix + "A", prefix + "Z"
+        chain = [start] + [next(middle) for _ in range(c - 1)] + [end]
+        for a, b in zip(chain, chain[1:]):
+            nodes[a] = (b, b)
+        nodes[end] = (chain[1], chain[1])
+
+    instructions = "".join(rng.choices("LR", k=263))
+    keys = list(nodes.keys())
+    rng.shuffle(keys)
+    lines = [instructions, ""]
+    lines += [f"{k} = ({nodes[k][0]}, {nodes[k][1]})" for k in keys]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,17 @@
+import random
+from math import comb
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Histories of 21 values of random integer polynomials of degree at most 12.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(scaled(200, size)):
+        coefs = [rng.randint(-5, 10) for _ in range(rng.randint(1, 12) + 1)]
+        values = [sum([a * comb(x, k) for k, a in enumerate(coefs)]) for x in range(21)]
+        lines.append(" ".join([str(v) for v in values]))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+import random
+
+from advent2023.generators import scaled_side
+from advent2023.generators.shapes import polyomino
+
+# pipe connecting each pair of directions
+PIPES = {
+    frozenset(((-1, 0), (1, 0))): "|",
+    frozenset(((0, -1), (0, 1))): "-",
+    frozenset(((-1, 0), (0, 1))): "L",
+    frozenset(((-1, 0), (0, -1))): "J",
+    frozenset(((1, 0), (0, -1))): "7",
+    frozenset(((1, 0), (0, 1))): "F",
+}
+JUNK = "|-LJ7F..."
+BLOCK = 3
+
+
+def loop(rng: random.Random, n: int) -> dict[tuple[int, int], str] | None:
+    """
+    Draw a loop along the border of a random polyomino made of 3x3 blocks.
+
+    Returns:
+        dict[tuple[int, int], str] | None: the loop's pipes, or None if the
+        border is not a simple loop
+    """
+    blocks = polyomino(rng, (n - 2) // BLOCK, (n - 2) // BLOCK, 0.6, 0.9)
+    region = {
+        (1 + BLOCK * r + i, 1 + BLOCK * c + j)
+        for r, c in blocks
+        for i in range(BLOCK)
+        for j in range(BLOCK)
+    }
+    border = {
+        (r, c)
+        for r, c in region
+        if any((r + dr, c + dc) not in region for dr in (-1, 0, 1) for dc in (-1, 0, 1))
+    }
+
+    pipes = {}
+    for r, c in border:
+        dirs = frozenset(
+            (dr, dc)
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if (r + dr, c + dc) in border
+        )
+        if dirs not in PIPES:
+            return None
+        pipes[(r, c)] = PIPES[dirs]
+
+    # check that the border is a single loop
+    start = min(border)
+    prev, curr, length = None, start, 0
+    while True:
+        r, c = curr
+        nxt = [
+            (r + dr, c + dc)
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if (r + dr, c + dc) in border and (r + dr, c + dc) != prev
+        ]
+        prev, curr, length = curr, nxt[0], length + 1
+        if curr == start:
+            break
+    return pipes if length == len(border) else None
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square field of junk pipes, with a loop of pipes drawn along the border of
+    a random polyomino. S sits anywhere on the loop, and its neighbors that are
+    not part of the loop are ground.
+    """
+    rng = random.Random(seed)
+    n = max(2 + 3 * BLOCK, scaled_side(140, size))
+    while True:
+        pipes = loop(rng, n)
+        if pipes is not None:
+            break
+
+    grid = [[rng.choice(JUNK) for _ in range(n)] for _ in range(n)]
+    for (r, c), pipe in pipes.items():
+        grid[r][c] = pipe
+
+    r, c = rng.choice(sorted(pipes))
+    grid[r][c] = "S"
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        if 0 <= r + dr < n and 0 <= c + dc < n and (r + dr, c + dc) not in pipes:
+            grid[r + dr][c + dc] = "."
+    return "\n".join(["".join(row) for row in grid]) + "\n"
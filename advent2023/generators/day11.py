@@ -0,0 +1,24 @@
+import random
+
+from advent2023.generators import scaled_side
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square image of sparse galaxies, with a few empty rows and columns.
+    """
+    rng = random.Random(seed)
+    n = scaled_side(140, size)
+    empty_rows = {r for r in range(n) if rng.random() < 0.06}
+    empty_cols = {c for c in range(n) if rng.random() < 0.06}
+    grid = [["."] * n for _ in range(n)]
+    for r in range(n):
+        for c in range(n):
+            if r not in empty_rows and c not in empty_cols and rng.random() < 0.025:
+                grid[r][c] = "#"
+    # make sure there are at least two galaxies
+    free = [(r, c) for r in range(n) for c in range(n) if r not in empty_rows]
+    free = [(r, c) for r, c in free if c not in empty_cols] or [(0, 0), (n - 1, n - 1)]
+    for r, c in rng.sample(free, min(2, len(free))):
+        grid[r][c] = "#"
+    return "\n".join(["".join(row) for row in grid]) + "\n"
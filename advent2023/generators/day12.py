@@ -0,0 +1,28 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Rows of up to 20 springs, drawn from a valid arrangement of 1 to 6 groups
+    of broken springs in which some springs are replaced by unknowns.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(scaled(1000, size)):
+        groups = [
+            rng.choice((1, 1, 1, 2, 2, 3, 4, 5)) for _ in range(rng.randint(1, 6))
+        ]
+        while sum(groups) + len(groups) - 1 > 20:
+            groups.pop()
+        # spread spare operational springs before, between and after groups
+        slots = [0] * (len(groups) + 1)
+        for _ in range(rng.randint(0, 20 - sum(groups) - len(groups) + 1)):
+            slots[rng.randrange(len(slots))] += 1
+        row = "." * slots[0]
+        for i, g in enumerate(groups):
+            row += "#" * g + "." * (slots[i + 1] + (i < len(groups) - 1))
+        row = "".join([c if rng.random() < 0.55 else "?" for c in row])
+        lines.append(row + " " + ",".join([str(g) for g in groups]))
+    return "\n".join(lines) + "\n"
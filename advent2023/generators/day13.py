@@ -0,0 +1,74 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def differences(grid: list[list[str]]) -> list[int]:
+    """
+    Count, for each possible mirror line (columns first, then rows), the cells
+    which differ from their reflection.
+    """
+    counts = []
+    for g in ([list(r) for r in zip(*grid)], grid):
+        for line in range(1, len(g)):
+            width = min(line, len(g) - line)
+            counts.append(
+                sum(
+                    a != b
+                    for k in range(width)
+                    for a, b in zip(g[line - 1 - k], g[line + k])
+                )
+            )
+    return counts
+
+
+def pattern(rng: random.Random) -> list[list[str]]:
+    """
+    Draw a pattern which mirrors along a column, and mirrors along a row once
+    its smudge is fixed. The smudge sits in a column outside the range
+    reflected by the column mirror, so it does not break it. Patterns with
+    other mirror lines, with or without a smudge, are drawn again.
+    """
+    while True:
+        grid = draw(rng)
+        counts = differences(grid)
+        if counts.count(0) == 1 and counts.count(1) == 1:
+            return grid
+
+
+def draw(rng: random.Random) -> list[list[str]]:
+    rows, cols = rng.randint(7, 17), rng.randint(7, 17)
+    # column mirror, leaving at least one column outside its reflected range
+    col = rng.choice([c for c in range(1, cols) if c != cols - c])
+    width = min(col, cols - col)
+    row = rng.randint(1, rows - 1)
+    height = min(row, rows - row)
+
+    grid = [[rng.choice("#.") for _ in range(cols)] for _ in range(rows)]
+    for k in range(width):
+        for r in range(rows):
+            grid[r][col + k] = grid[r][col - 1 - k]
+    for k in range(height):
+        grid[row + k] = grid[row - 1 - k][:]
+
+    outside = [c for c in range(cols) if not col - width <= c < col + width]
+    r = rng.randrange(row - height, row + height)
+    c = rng.choice(outside)
+    grid[r][c] = "#" if grid[r][c] == "." else "."
+    return grid
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Patterns of 7 to 17 rows and columns, each with a mirror line and a smudge
+    whose fix makes a different mirror line appear. Half the patterns are
+    transposed so that mirrors run both ways.
+    """
+    rng = random.Random(seed)
+    patterns = []
+    for _ in range(scaled(100, size)):
+        grid = pattern(rng)
+        if rng.random() < 0.5:
+            grid = [list(r) for r in zip(*grid)]
+        patterns.append("\n".join(["".join(r) for r in grid]))
+    return "\n\n".join(patterns) + "\n"
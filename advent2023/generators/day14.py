@@ -0,0 +1,13 @@
+import numpy as np
+
+from advent2023.generators import scaled_side
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square platform of round rocks, cube rocks and empty spaces.
+    """
+    rng = np.random.default_rng(seed)
+    n = scaled_side(100, size)
+    grid = rng.choice(np.array(list("O#.")), size=(n, n), p=(0.2, 0.1, 0.7))
+    return "\n".join(["".join(row) for row in grid]) + "\n"
@@ -0,0 +1,25 @@
+import random
+import string
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A single line of steps, inserting or removing lenses drawn from a pool of
+    labels of 2 to 6 letters.
+    """
+    rng = random.Random(seed)
+    count = scaled(4000, size)
+    labels = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(max(1, count // 8))
+    ]
+    steps = []
+    for _ in range(count):
+        label = rng.choice(labels)
+        if rng.random() < 0.6:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+        else:
+            steps.append(f"{label}-")
+    return ",".join(steps) + "\n"
@@ -0,0 +1,15 @@
+import numpy as np
+
+from advent2023.generators import scaled_side
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square contraption of empty space with scattered mirrors and splitters.
+    """
+    rng = np.random.default_rng(seed)
+    n = scaled_side(110, size)
+    grid = rng.choice(
+        np.array(list(".\\/|-")), size=(n, n), p=(0.9, 0.025, 0.025, 0.025, 0.025)
+    )
+    return "\n".join(["".join(row) for row in grid]) + "\n"
@@ -0,0 +1,13 @@
+import numpy as np
+
+from advent2023.generators import scaled_side
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square map of heat losses from 1 to 9.
+    """
+    rng = np.random.default_rng(seed)
+    n = scaled_side(141, size)
+    grid = rng.integers(1, 10, size=(n, n)).astype(str)
+    return "\n".join(["".join(row) for row in grid]) + "\n"
@@ -0,0 +1,55 @@
+import random
+from itertools import accumulate
+
+from advent2023.generators.shapes import outline, polyomino
+
+DIRS = {(0, 1): "R", (1, 0): "D", (0, -1): "L", (-1, 0): "U"}
+HEX_DIRS = {"R": 0, "D": 1, "L": 2, "U": 3}
+
+
+def sign(x: int) -> int:
+    return (x > 0) - (x < 0)
+
+
+def moves(
+    corners: list[tuple[int, int]], heights: list[int], widths: list[int]
+) -> list[tuple[str, int]]:
+    """
+    Turn a polyomino outline into dig moves, stretching the polyomino's rows
+    and columns to the given heights and widths.
+    """
+    ys = [0] + list(accumulate(heights))
+    xs = [0] + list(accumulate(widths))
+    out = []
+    for (r0, c0), (r1, c1) in zip(corners, corners[1:] + corners[:1]):
+        dir = DIRS[(sign(r1 - r0), sign(c1 - c0))]
+        out.append((dir, abs(ys[r1] - ys[r0]) + abs(xs[c1] - xs[c0])))
+    return out
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A dig plan along the outline of a random polyomino. The plan encoded in
+    the colors follows the same outline with much longer rows and columns,
+    so both plans are simple closed loops.
+    """
+    rng = random.Random(seed)
+    n = max(2, round(52 * size**0.5))
+    corners = outline(polyomino(rng, n, n, 0.6, 0.5))
+
+    small = moves(
+        corners,
+        [rng.randint(1, 8) for _ in range(n)],
+        [rng.randint(1, 8) for _ in range(n)],
+    )
+    longest = 0xFFFFF // n
+    large = moves(
+        corners,
+        [rng.randint(longest // 4, longest) for _ in range(n)],
+        [rng.randint(longest // 4, longest) for _ in range(n)],
+    )
+
+    lines = []
+    for (dir, dist), (hex_dir, hex_dist) in zip(small, large):
+        lines.append(f"{dir} {dist} (#{hex_dist:05x}{HEX_DIRS[hex_dir]})")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,51 @@
+import random
+import string
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A tree of workflows rooted at in, where each workflow has 1 to 4
+    conditions sending parts to new workflows, or to A or R once enough
+    workflows were created, followed by a parts list.
+    """
+    rng = random.Random(seed)
+    count = scaled(550, size)
+    width = 2
+    while 26**width < 2 * count:
+        width += 1
+    names = {"in": None}
+    while len(names) < count:
+        name = "".join(rng.choices(string.ascii_lowercase, k=width))
+        if name != "in":
+            names[name] = None
+    names = list(names)
+
+    workflows = []
+    queue = ["in"]
+    created = 1
+    while queue:
+        name = queue.pop(0)
+        rules = []
+        for i in range(rng.randint(2, 5)):
+            if created < count and rng.random() < 0.7:
+                dest = names[created]
+                created += 1
+                queue.append(dest)
+            else:
+                dest = rng.choice("AR")
+            if i == 0:
+                rules.append(dest)
+            else:
+                rating = rng.choice("xmas")
+                op = rng.choice("<>")
+                rules.insert(-1, f"{rating}{op}{rng.randint(2, 3999)}:{dest}")
+        workflows.append(f"{name}{{{','.join(rules)}}}")
+    rng.shuffle(workflows)
+
+    parts = []
+    for _ in range(scaled(200, size)):
+        x, m, a, s = [rng.randint(1, 4000) for _ in range(4)]
+        parts.append(f"{{x={x},m={m},a={a},s={s}}}")
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
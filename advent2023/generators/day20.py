@@ -0,0 +1,50 @@
+import random
+import string
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A network of 12 bit counters. The broadcaster feeds the lowest flip-flop
+    of each counter, and each counter's conjunction, connected to the bits set
+    in the counter's (odd) period, resets the counter when it reaches its
+    period. The conjunction then sends a low pulse to an inverter, which sends
+    a high pulse to the conjunction feeding rx.
+    """
+    rng = random.Random(seed)
+    counters = max(1, scaled(4, size))
+    bits = 12 if counters <= 512 else 16
+    periods = rng.sample(range(2 ** (bits - 1) + 1, 2**bits, 2), counters)
+
+    width = 2
+    while 26**width < 2 * (counters * (bits + 2) + 1):
+        width += 1
+    names = {}
+    while len(names) < counters * (bits + 2) + 1:
+        name = "".join(rng.choices(string.ascii_lowercase, k=width))
+        if name != "rx":
+            names[name] = None
+    names = iter(names)
+
+    output = next(names)
+    lines = [f"&{output} -> rx"]
+    starts = []
+    for period in periods:
+        flips = [next(names) for _ in range(bits)]
+        conj, inverter = next(names), next(names)
+        starts.append(flips[0])
+        conj_children = []
+        for i, flip in enumerate(flips):
+            children = flips[i + 1 : i + 2]
+            if period >> i & 1:
+                children.append(conj)
+            else:
+                conj_children.append(flip)
+            lines.append(f"%{flip} -> {', '.join(children)}")
+        conj_children = [flips[0]] + conj_children + [inverter]
+        lines.append(f"&{conj} -> {', '.join(conj_children)}")
+        lines.append(f"&{inverter} -> {output}")
+    lines.append(f"broadcaster -> {', '.join(starts)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
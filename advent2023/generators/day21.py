@@ -0,0 +1,17 @@
+import numpy as np
+
+from advent2023.generators import scaled_side
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A square garden of odd side with S in its center. Rocks are scattered
+    everywhere except on the border and on the center row and column.
+    """
+    rng = np.random.default_rng(seed)
+    n = scaled_side(131, size) // 2 * 2 + 1
+    grid = rng.choice(np.array(list(".#")), size=(n, n), p=(0.85, 0.15))
+    grid[[0, n // 2, n - 1], :] = "."
+    grid[:, [0, n // 2, n - 1]] = "."
+    grid[n // 2, n // 2] = "S"
+    return "\n".join(["".join(row) for row in grid]) + "\n"
@@ -0,0 +1,33 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A snapshot of bricks of 1 to 4 cubes over a 10x10 area, piled up to a
+    height proportional to their count. Bricks never overlap.
+    """
+    rng = random.Random(seed)
+    count = scaled(1200, size)
+    occupied = set()
+    lines = []
+    for _ in range(count):
+        axis = rng.randrange(3)
+        length = rng.choice((1, 2, 2, 3, 3, 4))
+        start = [rng.randint(0, 9), rng.randint(0, 9), rng.randint(1, count // 4 + 1)]
+        if axis < 2:
+            start[axis] = min(start[axis], 10 - length)
+        while True:
+            cubes = []
+            for k in range(length):
+                cube = start[:]
+                cube[axis] += k
+                cubes.append(tuple(cube))
+            if not occupied.intersection(cubes):
+                break
+            start[2] += 1
+        occupied.update(cubes)
+        end = cubes[-1]
+        lines.append(",".join(map(str, start)) + "~" + ",".join(map(str, end)))
+    return "\n".join(lines) + "\n"
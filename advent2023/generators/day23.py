@@ -0,0 +1,73 @@
+import random
+
+SPACING = 22
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    A maze of junctions laid out on a lattice, linked by corridors to their
+    right and bottom neighbors. Slopes on both ends of each corridor only allow
+    going right or down, so that the slopes make the maze a DAG. Some corridors
+    are dropped as long as every junction stays on a path from start to end.
+    """
+    rng = random.Random(seed)
+    n = max(2, round(6 * size**0.5))
+    offset = SPACING // 2
+    h = 2 * offset + 1 + SPACING * (n - 1)
+    w = 3 + SPACING * (n - 1)
+    pos = {
+        (i, j): (offset + SPACING * i, 1 + SPACING * j)
+        for i in range(n)
+        for j in range(n)
+    }
+
+    edges = {((i, j), (i, j + 1)) for i in range(n) for j in range(n - 1)}
+    edges |= {((i, j), (i + 1, j)) for i in range(n - 1) for j in range(n)}
+    for edge in sorted(edges):
+        if rng.random() < 0.15 and connected(edges - {edge}, n):
+            edges.remove(edge)
+
+    grid = [["#"] * w for _ in range(h)]
+    # corridors from start and to end
+    for r in range(offset):
+        grid[r][1] = "."
+        grid[h - 1 - r][w - 2] = "."
+    grid[offset - 1][1] = "v"
+    grid[h - offset][w - 2] = "v"
+
+    for a, b in edges:
+        (r0, c0), (r1, c1) = pos[a], pos[b]
+        slope = ">" if r0 == r1 else "v"
+        cells = [(r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+        for r, c in cells[1:-1]:
+            grid[r][c] = "."
+        for r, c in (cells[1], cells[-2]):
+            grid[r][c] = slope
+    for r, c in pos.values():
+        grid[r][c] = "."
+    return "\n".join(["".join(row) for row in grid]) + "\n"
+
+
+def connected(edges: set[tuple[tuple[int, int], tuple[int, int]]], n: int) -> bool:
+    """
+    Check that every junction can be reached from the top left junction, and
+    can reach the bottom right junction, following the edges.
+    """
+    forward = {}
+    backward = {}
+    for a, b in edges:
+        forward.setdefault(a, []).append(b)
+        backward.setdefault(b, []).append(a)
+
+    for start, links in (((0, 0), forward), ((n - 1, n - 1), backward)):
+        seen = {start}
+        queue = [start]
+        while queue:
+            node = queue.pop()
+            for nxt in links.get(node, []):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        if len(seen) != n * n:
+            return False
+    return True
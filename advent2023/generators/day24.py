@@ -0,0 +1,21 @@
+import random
+
+from advent2023.generators import scaled
+
+
+def generate(size: float = 1, seed: int = 0) -> str:
+    """
+    Hailstones which a single rock, thrown from around the middle of the test
+    area, hits one after the other.
+    """
+    rng = random.Random(seed)
+    rock = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_v = [rng.randint(-300, 300) for _ in range(3)]
+    count = scaled(300, size)
+    times = rng.sample(range(10**10, 10**12), count)
+    lines = []
+    for t in times:
+        v = [rng.randint(-500, 500) for _ in range(3)]
+        p = [rock[i] + (rock_v[i] - v[i]) * t for i in range(3)]
+        lines.append(", ".join(map(str, p)) + " @ " + ", ".join([f"{x:>4}" for x in v]))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,109 @@
+import random
+
+# 8-neighborhood ring, in clockwise order starting north
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+def can_add(cells: set[tuple[int, int]], cell: tuple[int, int]) -> bool:
+    """
+    Check if cell can be added to a polyomino while keeping it simply connected,
+    i.e. without creating holes or cells that touch only by a corner. That is
+    the case when the occupied cells around cell form a single arc which does
+    not end on a diagonal.
+
+    Args:
+        cells (set[tuple[int, int]]): the polyomino
+        cell (tuple[int, int]): the cell to add
+
+    Returns:
+        bool: True if cell can be added
+    """
+    r, c = cell
+    occupied = [(r + dr, c + dc) in cells for dr, dc in RING]
+    for d in range(1, 8, 2):
+        if occupied[d] and not occupied[d - 1] and not occupied[(d + 1) % 8]:
+            return False
+    arcs = sum([1 for i in range(8) if occupied[i] and not occupied[i - 1]])
+    return arcs == 1
+
+
+def polyomino(
+    rng: random.Random, rows: int, cols: int, fill: float = 0.5, thin: float = 0.0
+) -> set[tuple[int, int]]:
+    """
+    Grow a random simply connected polyomino in a rows x cols grid, until
+    it covers fill of the grid's cells or can no longer grow. Cells touching
+    the polyomino on more than one side are skipped with probability thin,
+    which grows thinner, more branching polyominoes.
+
+    Args:
+        rng (random.Random): the random generator
+        rows (int): number of rows
+        cols (int): number of cols
+        fill (float, optional): target fraction of cells. Defaults to 0.5.
+        thin (float, optional): probability of skipping cells touching
+        the polyomino on more than one side. Defaults to 0.0.
+
+    Returns:
+        set[tuple[int, int]]: the polyomino's cells
+    """
+    start = (rows // 2, cols // 2)
+    cells = {start}
+    frontier = [start]
+    target = fill * rows * cols
+    while frontier and len(cells) < target:
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        cell = frontier.pop()
+        if cell != start:
+            if cell in cells or not can_add(cells, cell):
+                continue
+            r, c = cell
+            sides = sum([(r + dr, c + dc) in cells for dr, dc in RING[::2]])
+            if sides > 1 and rng.random() < thin:
+                continue
+            cells.add(cell)
+        r, c = cell
+        for dr, dc in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+            n = (r + dr, c + dc)
+            if 0 <= n[0] < rows and 0 <= n[1] < cols and n not in cells:
+                frontier.append(n)
+    return cells
+
+
+def outline(cells: set[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Trace the outline of a simply connected polyomino clockwise, returning its
+    corners as lattice points (the corners of cell (r, c) are (r, c),
+    (r, c + 1), (r + 1, c + 1) and (r + 1, c)). The outline starts with a move
+    to the right from the top left corner of the polyomino.
+
+    Args:
+        cells (set[tuple[int, int]]): the polyomino
+
+    Returns:
+        list[tuple[int, int]]: the outline's corners
+    """
+    edges = {}
+    for r, c in cells:
+        if (r - 1, c) not in cells:
+            edges[(r, c)] = (r, c + 1)
+        if (r, c + 1) not in cells:
+            edges[(r, c + 1)] = (r + 1, c + 1)
+        if (r + 1, c) not in cells:
+            edges[(r + 1, c + 1)] = (r + 1, c)
+        if (r, c - 1) not in cells:
+            edges[(r + 1, c)] = (r, c)
+
+    start = min(edges)
+    corners = [start]
+    prev, curr = start, edges[start]
+    while curr != start:
+        nxt = edges[curr]
+        # keep the points where the outline changes direction
+        if (curr[0] - prev[0]) * (nxt[1] - curr[1]) != (curr[1] - prev[1]) * (
+            nxt[0] - curr[0]
+        ):
+            corners.append(curr)
+        prev, curr = curr, nxt
+    return corners
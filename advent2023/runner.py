@@ -0,0 +1,286 @@
+import cProfile
+import logging
+import os
+import pstats
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from advent2023.solvers import PARTS, Solver, get_solver
+from advent2023.utils.ledger import Ledger, SubmissionQueue
+from advent2023.utils.profiling import Timings, phase, save_profile
+from advent2023.utils.utils import LEDGER_FILE, Advent
+
+LOGGER = logging.getLogger(__name__)
+
+# Rough solving times (in seconds) of the slowest parts on a puzzle input, used
+# to schedule the longest jobs first when solving in parallel. Other parts are
+# assumed to take DEFAULT_COST.
+COSTS = {
+    (16, 2): 8.0,
+    (10, 2): 6.0,
+    (12, 2): 4.0,
+    (23, 2): 3.5,
+    (14, 2): 3.0,
+    (22, 1): 1.8,
+    (22, 2): 1.5,
+    (12, 1): 1.0,
+    (17, 2): 0.9,
+    (13, 2): 0.8,
+    (20, 2): 0.5,
+    (17, 1): 0.5,
+    (21, 1): 0.3,
+}
+DEFAULT_COST = 0.1
+
+
+@dataclass
+class Result:
+    day: int
+    part: int
+    answer: Any
+    elapsed: float
+    # elapsed times of the phases timed within the part, by path
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+def parse(solver: Solver, advent: Advent, cache: bool = True) -> Any:
+    if cache:
+        return advent.get_parsed(solver.parse, solver.version)
+    return solver.parse(advent.get_input_bytes())
+
+
+def solve(
+    day: int,
+    parts: Iterable[int] = PARTS,
+    submit: bool = False,
+    year: int = 2023,
+    cache: bool = True,
+    queue: SubmissionQueue | None = None,
+    stream: bool = False,
+) -> list[Result]:
+    """
+    Solve the given parts for a day, optionally submitting the answers. If
+    stream is set and the day supports it, each part consumes the records of
+    the input as they are read from the input file, instead of a parsed copy
+    of the whole input, so the input can be larger than memory.
+
+    Args:
+        day (int): the day
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+        submit (bool, optional): submit the answers. Defaults to False.
+        year (int, optional): the year. Defaults to 2023.
+        cache (bool, optional): use the parsed input cache. Defaults to True.
+        queue (SubmissionQueue | None, optional): the submission queue.
+        Defaults to None, i.e. a queue for the day.
+        stream (bool, optional): stream the input. Defaults to False.
+
+    Returns:
+        list[Result]: the answer and solving time for each part
+    """
+    solver = get_solver(day)
+    advent = Advent(day, year, queue)
+    stream = streams(solver, stream)
+
+    with Timings() as timings:
+        if not stream:
+            with phase("parse"):
+                data = parse(solver, advent, cache)
+            LOGGER.info(
+                f"Parsed input for day {day:02d} in {timings.phases['parse']:.3f}s."
+            )
+
+        results = []
+        for part in parts:
+            fn = solver.part(part)
+            if fn is None:
+                LOGGER.info(f"No solver for day {day:02d} PART {part}.")
+                continue
+
+            with phase(f"part{part}"):
+                if stream:
+                    data = solver.stream(advent.stream_records(solver.separator))
+                answer = fn(data)
+            results.append(result(day, part, answer, timings))
+
+            if submit:
+                advent.submit(part, answer)
+    return results
+
+
+def streams(solver: Solver, stream: bool) -> bool:
+    if stream and not solver.streams:
+        LOGGER.info(f"Day {solver.day:02d} cannot be streamed, parsing its input.")
+    return stream and solver.streams
+
+
+def result(day: int, part: int, answer: Any, timings: Timings) -> Result:
+    name = f"part{part}"
+    phases = {
+        path: elapsed
+        for path, elapsed in timings.phases.items()
+        if path.startswith(name + "/")
+    }
+    return Result(day, part, answer, timings.phases[name], phases)
+
+
+def run(
+    days: Iterable[int],
+    parts: Iterable[int] = PARTS,
+    submit: bool = False,
+    year: int = 2023,
+    cache: bool = True,
+    profile: Path | None = None,
+    stream: bool = False,
+) -> list[Result]:
+    """
+    Solve the given days one after the other in the current process, with
+    answers submitted through a single queue. If profile is given, each day
+    is solved under cProfile, and its stats are saved to profile/dayNN.pstats
+    along with their collapsed stacks in profile/dayNN.folded.
+
+    Args:
+        days (Iterable[int]): the days
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+        submit (bool, optional): submit the answers. Defaults to False.
+        year (int, optional): the year. Defaults to 2023.
+        cache (bool, optional): use the parsed input cache. Defaults to True.
+        profile (Path | None, optional): directory of the profiles. Defaults
+        to None, i.e. no profiling.
+        stream (bool, optional): stream the inputs of the days which support
+        it. Defaults to False.
+
+    Returns:
+        list[Result]: the results, ordered by day and part
+    """
+    parts = tuple(parts)
+    queue = SubmissionQueue(Ledger(LEDGER_FILE)) if submit else None
+    results = []
+    for day in days:
+        if profile is None:
+            results.extend(solve(day, parts, submit, year, cache, queue, stream))
+            continue
+        profiler = cProfile.Profile()
+        results.extend(
+            profiler.runcall(solve, day, parts, submit, year, cache, queue, stream)
+        )
+        save_profile(pstats.Stats(profiler), profile / f"day{day:02d}")
+    return results
+
+
+def solve_part(
+    day: int,
+    part: int,
+    year: int = 2023,
+    cache: bool = True,
+    stream: bool = False,
+    jobs: int = 1,
+) -> Result:
+    """
+    Parse the input and solve a single part of a day. This is the unit of work
+    of the process pool, so it only takes and returns picklable values.
+
+    Args:
+        day (int): the day
+        part (int): the part
+        year (int, optional): the year. Defaults to 2023.
+        cache (bool, optional): use the parsed input cache. Defaults to True.
+        stream (bool, optional): stream the input. Defaults to False.
+        jobs (int, optional): number of processes of the part, if it can
+        spread its work over a pool of processes. Defaults to 1.
+
+    Returns:
+        Result: the answer and solving time for the part
+    """
+    solver = get_solver(day)
+    advent = Advent(day, year)
+    stream = streams(solver, stream)
+    with Timings() as timings:
+        if not stream:
+            with phase("parse"):
+                data = parse(solver, advent, cache)
+            LOGGER.info(
+                f"Parsed input for day {day:02d} in {timings.phases['parse']:.3f}s."
+            )
+
+        with phase(f"part{part}"):
+            if stream:
+                data = solver.stream(advent.stream_records(solver.separator))
+            answer = solver.part(part, jobs)(data)
+    return result(day, part, answer, timings)
+
+
+def run_parallel(
+    days: Iterable[int],
+    parts: Iterable[int] = PARTS,
+    submit: bool = False,
+    year: int = 2023,
+    cache: bool = True,
+    jobs: int | None = None,
+    stream: bool = False,
+) -> list[Result]:
+    """
+    Solve the given days in a pool of processes. Each part of a day is a
+    separate job, since parts do not share any state besides the parsed
+    input, which each job parses (or loads from the cache) again. Jobs are
+    scheduled longest expected job first, so that the total time approaches
+    that of the slowest part. When there are more processes than jobs, the
+    parts which can spread their work over a pool of processes (e.g. day 16
+    part 2) share the spare processes. Inputs are downloaded if needed and
+    answers submitted through a single queue in the current process.
+
+    Args:
+        days (Iterable[int]): the days
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+        submit (bool, optional): submit the answers. Defaults to False.
+        year (int, optional): the year. Defaults to 2023.
+        cache (bool, optional): use the parsed input cache. Defaults to True.
+        jobs (int | None, optional): number of processes. Defaults to None,
+        i.e. the number of CPUs.
+        stream (bool, optional): stream the inputs of the days which support
+        it. Defaults to False.
+
+    Returns:
+        list[Result]: the results, ordered by day and part
+    """
+    parts = tuple(parts)
+    queue = SubmissionQueue(Ledger(LEDGER_FILE)) if submit else None
+    advents = {day: Advent(day, year, queue) for day in days}
+    for advent in advents.values():
+        advent.get_input_bytes()
+
+    tasks = []
+    for day in advents:
+        solver = get_solver(day)
+        for part in parts:
+            if solver.part(part) is None:
+                LOGGER.info(f"No solver for day {day:02d} PART {part}.")
+            else:
+                tasks.append((day, part))
+    tasks.sort(key=lambda task: COSTS.get(task, DEFAULT_COST), reverse=True)
+
+    jobs = jobs or os.cpu_count()
+    part_jobs = max(jobs // max(len(tasks), 1), 1)
+    with ProcessPoolExecutor(max_workers=min(jobs, max(len(tasks), 1))) as pool:
+        futures = [
+            pool.submit(solve_part, day, part, year, cache, stream, part_jobs)
+            for day, part in tasks
+        ]
+        results = sorted(
+            (future.result() for future in futures), key=lambda r: (r.day, r.part)
+        )
+
+    if submit:
+        for r in results:
+            queue.put(advents[r.day], r.part, r.answer)
+        queue.run()
+    return results
+
+
+def print_results(results: Iterable[Result]):
+    for r in results:
+        print(f"Day {r.day:02d} part {r.part}: {r.answer} ({r.elapsed:.3f}s)")
+        for path, elapsed in r.phases.items():
+            print(f"    {path}: {elapsed:.3f}s")
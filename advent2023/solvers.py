@@ -0,0 +1,153 @@
+import hashlib
+import importlib
+import inspect
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from advent2023.utils.utils import split_lines
+
+# Days and parts that have a solver
+DAYS = tuple(range(1, 25))
+PARTS = (1, 2)
+
+
+@dataclass(frozen=True)
+class Solver:
+    """
+    A day's solver. Each day module exposes a parse function, which turns the
+    input lines into the puzzle's data, and part1 / part2 functions which
+    compute the answers from that data. Days which work directly on the
+    input bytes expose a parse_bytes function instead of parse.
+
+    Parts which can spread their work over a pool of processes take a jobs
+    argument, the number of processes, which part() binds when asked to.
+
+    Days whose parts only go once through their records, in order, can also
+    expose a parse_line function parsing a single record (a line, or the
+    records separated by the module's SEPARATOR), so that their parts can
+    consume the records as they are streamed from the input file.
+    """
+
+    day: int
+    module: ModuleType
+
+    def parse(self, data: bytes | memoryview) -> Any:
+        if hasattr(self.module, "parse_bytes"):
+            return self.module.parse_bytes(data)
+        return self.module.parse(split_lines(str(data, "utf-8")))
+
+    def part(self, part: int, jobs: int = 1) -> Callable[[Any], Any] | None:
+        fn = getattr(self.module, f"part{part}", None)
+        if fn is not None and jobs != 1 and self.parallel(part):
+            return partial(fn, jobs=jobs)
+        return fn
+
+    def parallel(self, part: int) -> bool:
+        fn = getattr(self.module, f"part{part}", None)
+        return fn is not None and "jobs" in inspect.signature(fn).parameters
+
+    @property
+    def streams(self) -> bool:
+        return hasattr(self.module, "parse_line")
+
+    @property
+    def separator(self) -> str:
+        return getattr(self.module, "SEPARATOR", "\n")
+
+    def stream(self, records: Iterable[str]) -> Iterator[Any]:
+        return map(self.module.parse_line, records)
+
+    @property
+    def version(self) -> str:
+        """
+        Version of the parser, the digest of the sources of the day module and
+        of the modules of the package it uses, directly or not (e.g. the grid
+        or parse utilities), so that any change to them invalidates the
+        module's cached parsed inputs.
+        """
+        digest = hashlib.sha256()
+        for file in _sources(self.module):
+            digest.update(file.read_bytes())
+        return digest.hexdigest()[:12]
+
+    @property
+    def parts(self) -> tuple[int, ...]:
+        return tuple(p for p in PARTS if self.part(p) is not None)
+
+
+def _sources(module: ModuleType) -> list[Path]:
+    package = __name__.split(".")[0] + "."
+    seen = {module.__name__}
+    modules = [module]
+    files = []
+    while modules:
+        module = modules.pop()
+        files.append(Path(module.__file__))
+        for value in vars(module).values():
+            name = (
+                value.__name__
+                if isinstance(value, ModuleType)
+                else getattr(value, "__module__", None)
+            )
+            if (
+                isinstance(name, str)
+                and name.startswith(package)
+                and name not in seen
+                and name in sys.modules
+            ):
+                seen.add(name)
+                modules.append(sys.modules[name])
+    return sorted(files)
+
+
+def get_solver(day: int) -> Solver:
+    """
+    Get the solver for a day, importing its module on first use.
+
+    Args:
+        day (int): the day
+
+    Raises:
+        ValueError: if there is no solver for the day
+
+    Returns:
+        Solver: the day's solver
+    """
+    if day not in DAYS:
+        raise ValueError(f"No solver for day {day}.")
+    return Solver(day, importlib.import_module(f"advent2023.day{day:02d}"))
+
+
+def parse_days(specs: Iterable[str]) -> list[int]:
+    """
+    Parse a list of day specifications, each of which is either a day number,
+    a range of days (e.g. 5-9) or "all".
+
+    Args:
+        specs (Iterable[str]): the day specifications
+
+    Raises:
+        ValueError: if a specification is invalid
+
+    Returns:
+        list[int]: the sorted days, all days if specs is empty
+    """
+    days = set()
+    for spec in specs:
+        if spec == "all":
+            days.update(DAYS)
+        elif "-" in spec:
+            start, end = spec.split("-")
+            days.update(range(int(start), int(end) + 1))
+        else:
+            days.add(int(spec))
+
+    invalid = days - set(DAYS)
+    if invalid:
+        raise ValueError(f"No solver for day(s) {sorted(invalid)}.")
+    return sorted(days) if days else list(DAYS)
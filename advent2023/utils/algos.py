@@ -1,6 +1,12 @@
-from typing import Any
+import heapq
+import logging
+from typing import Any, TypeVar
 from collections import deque
-from collections.abc import Sequence, Container, Iterator
+from collections.abc import Callable, Sequence, Container, Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
 
 
 deltas_4 = ((-1, 0), (0, -1), (0, 1), (1, 0))
@@ -15,6 +21,15 @@ deltas_8 = (
     (1, 1),
 )
 
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Largest step between the keys of a node and of its neighbors (the edge
+# weight, plus the change of heuristic for A*) for which dijkstra uses a
+# bucket queue
+MAX_BUCKET_WEIGHT = 1 << 10
+
 
 def neighbors(
     grid: Sequence[Sequence[Any]], node: tuple[int, int]
@@ -73,3 +88,453 @@ def grid_find_adjacent(
 
             for n in neighbors(grid, node):
                 queue.append((1 + dist, n))
+
+
+def bfs(
+    passable: npt.NDArray[np.bool_],
+    sources: Iterable[tuple[int, int]],
+    cutoff: int | None = None,
+    diagonal: bool = False,
+) -> npt.NDArray[np.int64]:
+    """
+    Breadth-first search from many sources at once over the passable cells of
+    a grid. The search expands a whole frontier of flat indices at a time with
+    numpy, on a copy of the grid padded with an impassable border so that
+    neighbor offsets never wrap around a row.
+
+    Args:
+        passable (npt.NDArray[np.bool_]): mask of the passable cells
+        sources (Iterable[tuple[int, int]]): the source positions
+        cutoff (int | None, optional): maximum distance to search. Defaults to None.
+        diagonal (bool, optional): move diagonally too. Defaults to False.
+
+    Returns:
+        npt.NDArray[np.int64]: distance of each cell to the closest source, -1 for
+        cells which are unreachable or further than cutoff
+    """
+    rows, cols = passable.shape
+    width = cols + 2
+    unvisited = np.zeros((rows + 2, width), dtype=bool)
+    unvisited[1:-1, 1:-1] = passable
+    unvisited = unvisited.ravel()
+    offsets = np.array(
+        [dr * width + dc for dr, dc in (deltas_8 if diagonal else deltas_4)]
+    )
+
+    distances = np.full(unvisited.size, -1, dtype=np.int64)
+    sources = np.array(list(sources), dtype=np.intp).reshape(-1, 2)
+    frontier = np.unique((sources[:, 0] + 1) * width + sources[:, 1] + 1)
+    frontier = frontier[unvisited[frontier]]
+    unvisited[frontier] = False
+    distances[frontier] = 0
+
+    # slot of each node in the next frontier, used to drop duplicates
+    slots = np.empty(unvisited.size, dtype=np.intp)
+    dist = 0
+    while frontier.size and (cutoff is None or dist < cutoff):
+        dist += 1
+        nodes = (frontier[:, None] + offsets).ravel()
+        nodes = nodes[unvisited[nodes]]
+        index = np.arange(nodes.size)
+        slots[nodes] = index
+        frontier = nodes[slots[nodes] == index]
+        unvisited[frontier] = False
+        distances[frontier] = dist
+
+    return distances.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+def reachable_in(distances: npt.NDArray[np.int64], steps: int) -> npt.NDArray[np.bool_]:
+    """
+    Get the cells on which a walk of exactly steps steps can end, given the
+    distances returned by bfs: walking back and forth between two cells, a
+    cell can be reached in any number of steps greater than its distance and of
+    the same parity.
+
+    Args:
+        distances (npt.NDArray[np.int64]): the distances from the sources
+        steps (int): the number of steps
+
+    Returns:
+        npt.NDArray[np.bool_]: mask of the cells reachable in exactly steps steps
+    """
+    return (distances >= 0) & (distances <= steps) & (distances % 2 == steps % 2)
+
+
+@dataclass
+class Graph:
+    """
+    A directed weighted graph in compressed sparse row form. Nodes are the
+    integers in range(nodes), and the edges leaving node u go to
+    indices[indptr[u]:indptr[u + 1]] with weights[indptr[u]:indptr[u + 1]].
+    """
+
+    indptr: npt.NDArray[np.intp]
+    indices: npt.NDArray[np.intp]
+    weights: npt.NDArray[Any]
+
+    @classmethod
+    def from_edges(
+        cls,
+        nodes: int,
+        sources: npt.ArrayLike,
+        targets: npt.ArrayLike,
+        weights: npt.ArrayLike,
+    ) -> "Graph":
+        """
+        Build a graph from arrays of edges.
+
+        Args:
+            nodes (int): number of nodes
+            sources (npt.ArrayLike): source node of each edge
+            targets (npt.ArrayLike): target node of each edge
+            weights (npt.ArrayLike): weight of each edge
+
+        Returns:
+            Graph: the graph
+        """
+        sources = np.asarray(sources, dtype=np.intp)
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(nodes + 1, dtype=np.intp)
+        np.cumsum(np.bincount(sources, minlength=nodes), out=indptr[1:])
+        return cls(
+            indptr,
+            np.asarray(targets, dtype=np.intp)[order],
+            np.asarray(weights)[order],
+        )
+
+    @property
+    def nodes(self) -> int:
+        return len(self.indptr) - 1
+
+
+def dijkstra(
+    graph: Graph,
+    sources: Iterable[int],
+    targets: Iterable[int] | None = None,
+    heuristic: npt.ArrayLike | None = None,
+) -> npt.NDArray[np.int64 | np.float64]:
+    """
+    Find the shortest distances from sources to the nodes of a graph with
+    non-negative weights. Small integer weights use a circular bucket (Dial)
+    queue of MAX_BUCKET_WEIGHT + 1 buckets at most, indexed by distance
+    modulo the number of buckets, and other weights a binary heap. If targets
+    are given, the search stops as soon as one of them is reached. With a
+    heuristic, a lower bound of the distance from each node to the targets
+    which must be consistent, the search is an A* search, whose keys are the
+    distance plus the heuristic. A heuristic which is not an integer array,
+    or which makes keys step by more than MAX_BUCKET_WEIGHT along an edge,
+    uses the binary heap.
+
+    Args:
+        graph (Graph): the graph
+        sources (Iterable[int]): the source nodes
+        targets (Iterable[int] | None, optional): the target nodes. Defaults to None.
+        heuristic (npt.ArrayLike | None, optional): lower bound of the distance
+        from each node to the targets. Defaults to None.
+
+    Returns:
+        npt.NDArray[np.int64 | np.float64]: distance of each node settled by the
+        search, -1 for the other nodes
+    """
+    sources = list(sources)
+    integral = np.issubdtype(graph.weights.dtype, np.integer)
+    if heuristic is None:
+        h = [0] * graph.nodes
+        steps = graph.weights
+    else:
+        heuristic = np.asarray(heuristic)
+        h = heuristic.tolist()
+        starts = np.repeat(np.arange(graph.nodes), np.diff(graph.indptr))
+        steps = graph.weights + heuristic[graph.indices] - heuristic[starts]
+        if sources:
+            steps = np.append(steps, np.ptp(heuristic[sources]))
+    # queued keys are at most span above the smallest one, so a circular
+    # queue of span + 1 buckets never holds two keys in the same bucket.
+    # Keys must be integers
+    bucketed = integral and np.issubdtype(steps.dtype, np.integer)
+    span = max(int(steps.max()), 0) if bucketed and steps.size else 0
+    bucketed = bucketed and span <= MAX_BUCKET_WEIGHT
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    weights = graph.weights.tolist()
+    is_target = bytearray(graph.nodes)
+    for t in targets or ():
+        is_target[t] = 1
+
+    inf = float("inf")
+    dist = [inf] * graph.nodes
+    settled = bytearray(graph.nodes)
+    for s in sources:
+        dist[s] = 0
+
+    if bucketed:
+        # buckets[k % size] holds the nodes queued with distance + heuristic k
+        size = span + 1
+        buckets: list[list[int]] = [[] for _ in range(size)]
+        for s in sources:
+            buckets[h[s] % size].append(s)
+
+        queued = len(sources)
+        key = min((h[s] for s in sources), default=0)
+        while queued:
+            bucket = buckets[key % size]
+            while bucket:
+                u = bucket.pop()
+                queued -= 1
+                if settled[u]:
+                    continue
+                settled[u] = 1
+                if is_target[u]:
+                    return _distances(dist, settled, integral)
+
+                du = dist[u]
+                for e in range(indptr[u], indptr[u + 1]):
+                    v = indices[e]
+                    d = du + weights[e]
+                    if d < dist[v]:
+                        dist[v] = d
+                        buckets[(d + h[v]) % size].append(v)
+                        queued += 1
+            key += 1
+    else:
+        queue = [(h[s], s) for s in sources]
+        heapq.heapify(queue)
+        while queue:
+            _, u = heapq.heappop(queue)
+            if settled[u]:
+                continue
+            settled[u] = 1
+            if is_target[u]:
+                break
+
+            du = dist[u]
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                d = du + weights[e]
+                if d < dist[v]:
+                    dist[v] = d
+                    heapq.heappush(queue, (d + h[v], v))
+
+    return _distances(dist, settled, integral)
+
+
+def _distances(
+    dist: list[float], settled: bytearray, integral: bool
+) -> npt.NDArray[np.int64 | np.float64]:
+    distances = np.where(
+        np.frombuffer(settled, dtype=np.uint8).astype(bool),
+        np.array(dist, dtype=np.float64),
+        -1,
+    )
+    return distances.astype(np.int64) if integral else distances
+
+
+def contract(
+    graph: Graph, keep: Iterable[int] = ()
+) -> tuple[Graph, npt.NDArray[np.intp]]:
+    """
+    Contract the corridors of a graph, i.e. its chains of nodes which have
+    exactly two distinct neighbors, into single weighted edges between the
+    remaining nodes (junctions, dead ends and the nodes in keep). Nodes
+    without any edge are dropped. Edges keep their direction, so a corridor
+    that can only be walked one way gives a single edge, and a corridor that
+    cannot be walked from one junction to the other gives none. Each corridor
+    is walked once from each end, so the contraction is linear in the size of
+    the graph.
+
+    Args:
+        graph (Graph): the graph
+        keep (Iterable[int], optional): nodes to keep. Defaults to ().
+
+    Returns:
+        tuple[Graph, npt.NDArray[np.intp]]: the contracted graph, and the
+        node in graph of each of its nodes
+    """
+    n = graph.nodes
+    sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+    pairs = np.concatenate(
+        [
+            np.stack([sources, graph.indices], axis=1),
+            np.stack([graph.indices, sources], axis=1),
+        ]
+    )
+    pairs = np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0)
+    degree = np.bincount(pairs[:, 0], minlength=n)
+
+    junction = (degree > 0) & (degree != 2)
+    junction[list(keep)] = True
+    nodes = np.flatnonzero(junction)
+    ids = np.full(n, -1, dtype=np.intp)
+    ids[nodes] = np.arange(len(nodes))
+
+    is_junction = junction.tolist()
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    weights = graph.weights.tolist()
+    src, dst, dists = [], [], []
+    for u in nodes.tolist():
+        for e in range(indptr[u], indptr[u + 1]):
+            prev, curr, dist = u, indices[e], weights[e]
+            # follow the corridor until the next junction
+            while not is_junction[curr]:
+                for f in range(indptr[curr], indptr[curr + 1]):
+                    if indices[f] != prev:
+                        break
+                else:
+                    curr = -1
+                    break
+                prev, curr, dist = curr, indices[f], dist + weights[f]
+            if curr >= 0:
+                src.append(u)
+                dst.append(curr)
+                dists.append(dist)
+
+    return (
+        Graph.from_edges(
+            len(nodes),
+            ids[np.array(src, dtype=np.intp)],
+            ids[np.array(dst, dtype=np.intp)],
+            np.asarray(dists, dtype=graph.weights.dtype),
+        ),
+        nodes,
+    )
+
+
+@dataclass
+class Cycle:
+    """
+    A cycle in a sequence of states x0, x1 = step(x0), ...: the states repeat
+    with the given period from index start on, and state is x[start].
+    """
+
+    start: int
+    period: int
+    state: Any
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
+def find_cycle(
+    step: Callable[[T], T],
+    state: T,
+    fingerprint: Callable[[T], int] | None = None,
+    limit: int | None = None,
+) -> Cycle | None:
+    """
+    Find the cycle in the sequence of states obtained by applying step
+    repeatedly to state. States are compared with ==, or np.array_equal for
+    arrays.
+
+    Without fingerprint, this uses Brent's algorithm, which only keeps two
+    states at any time and applies step about 2 * start + 3 * period times.
+    With fingerprint, a cheap 64-bit hash of a state, the index of each
+    fingerprint is kept instead, and the first repeated fingerprint is
+    confirmed by stepping again from state to the earlier of the two states,
+    and comparing them, which applies step 2 * start + period times. A
+    fingerprint collision falls back to Brent's algorithm.
+
+    Args:
+        step (Callable[[T], T]): the step function
+        state (T): the initial state
+        fingerprint (Callable[[T], int] | None, optional): the state
+        fingerprint. Defaults to None.
+        limit (int | None, optional): maximum number of steps to search.
+        Defaults to None.
+
+    Returns:
+        Cycle | None: the cycle, None if it was not found within limit steps
+    """
+    if fingerprint is not None:
+        return _find_cycle_hashed(step, state, fingerprint, limit)
+
+    # find the period, with the tortoise jumping to the hare every power of 2
+    power = period = steps = 1
+    tortoise, hare = state, step(state)
+    while not _same(tortoise, hare):
+        if limit is not None and steps >= limit:
+            return None
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        period += 1
+        steps += 1
+
+    # find the start, with the hare period steps ahead of the tortoise
+    tortoise = hare = state
+    for _ in range(period):
+        hare = step(hare)
+    start = 0
+    while not _same(tortoise, hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+
+    return Cycle(start, period, tortoise)
+
+
+def _find_cycle_hashed(
+    step: Callable[[T], T],
+    state: T,
+    fingerprint: Callable[[T], int],
+    limit: int | None = None,
+) -> Cycle | None:
+    first = state
+    seen = {}
+    index = 0
+    while limit is None or index <= limit:
+        key = fingerprint(state)
+        if key in seen:
+            # compare the states the fingerprints were taken from, stepping
+            # again from the first state to the earlier one
+            start = seen[key]
+            other = first
+            for _ in range(start):
+                other = step(other)
+            if _same(other, state):
+                return Cycle(start, index - start, other)
+            # the fingerprints can no longer be trusted
+            LOGGER.warning(f"Fingerprint collision at step {index}, using Brent.")
+            return find_cycle(step, first, limit=limit)
+        seen[key] = index
+        state = step(state)
+        index += 1
+    return None
+
+
+def iterate(
+    step: Callable[[T], T],
+    state: T,
+    n: int,
+    fingerprint: Callable[[T], int] | None = None,
+) -> T:
+    """
+    Apply step n times to state, skipping the repeats of the cycle in the
+    sequence of states if there is one. Costs O(start + period) steps of the
+    cycle, and at most O(n) if there is no cycle.
+
+    Args:
+        step (Callable[[T], T]): the step function
+        state (T): the initial state
+        n (int): the number of steps
+        fingerprint (Callable[[T], int] | None, optional): the state
+        fingerprint, see find_cycle. Defaults to None.
+
+    Returns:
+        T: the state after n steps
+    """
+    cycle = find_cycle(step, state, fingerprint, limit=n)
+    if cycle is None or n < cycle.start:
+        remaining = n
+    else:
+        state = cycle.state
+        remaining = (n - cycle.start) % cycle.period
+    for _ in range(remaining):
+        state = step(state)
+    return state
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from advent2023.utils.grid import Grid
+
+LOGGER = logging.getLogger(__name__)
+
+# Storage formats, tried in this order when loading
+SUFFIXES = (".npy", ".grid", ".npz", ".pkl")
+# Version of the storage formats, part of the cache keys, to bump whenever
+# the way values are stored changes
+FORMAT = 1
+
+
+def cache_key(year: int, day: int, version: str, data: bytes | memoryview) -> str:
+    """
+    Build the cache key of a parsed input. The key changes whenever the
+    input bytes, the parser version or the storage format version change.
+
+    Args:
+        year (int): the year
+        day (int): the day
+        version (str): the parser version
+        data (bytes | memoryview): the input bytes
+
+    Returns:
+        str: the cache key
+    """
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    return f"{year}_{day:02d}_{FORMAT}_{version}_{digest}"
+
+
+def load(path: Path) -> Any | None:
+    """
+    Load a cached value. Arrays and grids are memory-mapped read-only, lists
+    of arrays are loaded from a npz archive and other values are unpickled
+    from a memory-mapped file.
+
+    Args:
+        path (Path): the cache entry's path, without suffix
+
+    Returns:
+        Any | None: the cached value, None if there is no entry for path
+    """
+    for suffix in SUFFIXES:
+        file = path.with_name(path.name + suffix)
+        if not file.is_file():
+            continue
+        if suffix == ".npy":
+            return np.load(file, mmap_mode="r")
+        if suffix == ".grid":
+            return Grid(np.load(file, mmap_mode="r"))
+        if suffix == ".npz":
+            with np.load(file) as npz:
+                return [npz[f"arr_{i}"] for i in range(len(npz.files))]
+        with open(file, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            return pickle.loads(m)
+    return None
+
+
+def save(path: Path, value: Any):
+    """
+    Save a value to the cache, as a npy file for arrays and grids, a npz
+    archive for lists of arrays and a pickle otherwise. The file is written
+    to a temporary file first and then moved into place, so that concurrent
+    readers never see a partial entry. Stale entries of the same input, from
+    other parser versions or storage formats, are removed.
+
+    Args:
+        path (Path): the cache entry's path, without suffix
+        value (Any): the value
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(value, np.ndarray):
+        suffix = ".npy"
+    elif isinstance(value, Grid):
+        suffix = ".grid"
+    elif (
+        isinstance(value, list)
+        and value
+        and all(isinstance(v, np.ndarray) for v in value)
+    ):
+        suffix = ".npz"
+    else:
+        suffix = ".pkl"
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        if suffix == ".npy":
+            np.save(f, value)
+        elif suffix == ".grid":
+            np.save(f, value.cells)
+        elif suffix == ".npz":
+            np.savez(f, *value)
+        else:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # keys are year_day_format_version_digest, drop the entries of the same
+    # input parsed by other parsers or stored in other formats. Entries of
+    # other inputs are kept, as several inputs of a day can be in use
+    prefix = "_".join(path.name.split("_")[:2]) + "_"
+    digest = path.name.rsplit("_", 1)[-1]
+    for stale in path.parent.glob(f"{prefix}*_{digest}.*"):
+        if stale.suffix in SUFFIXES and stale.name != path.name + suffix:
+            stale.unlink(missing_ok=True)
+
+    os.replace(tmp, path.with_name(path.name + suffix))
+    LOGGER.info(f"Cached parsed input to {path.name}{suffix}.")
@@ -0,0 +1,183 @@
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from time import monotonic, sleep
+
+import requests
+
+from advent2023.utils.utils import Advent, check_response, get_session, url
+
+LOGGER = logging.getLogger(__name__)
+
+# Puzzle days of a year
+DAYS = range(1, 26)
+# Default number of concurrent downloads, and of pooled connections
+MAX_WORKERS = 4
+# Default minimum delay (in seconds) between the start of two requests
+MIN_INTERVAL = 1.0
+# Retries of a request the server asked to retry later (429 or 503)
+RETRIES = 3
+
+
+class RateLimiter:
+    """
+    Spaces out requests made from any number of threads, so that two requests
+    never start less than interval seconds apart. Requests can still overlap,
+    so a pool of connections keeps busy while the rate stays polite.
+    """
+
+    def __init__(self, interval: float = MIN_INTERVAL) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        """
+        Wait for the turn of the next request.
+        """
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            sleep(start - now)
+
+    def pause(self, delay: float):
+        """
+        Hold back all the requests for delay seconds, e.g. when the server asks
+        to retry later.
+
+        Args:
+            delay (float): the delay (in seconds)
+        """
+        with self._lock:
+            self._next = max(self._next, monotonic() + delay)
+
+
+def retry_delay(retry_after: str | None, default: float) -> float:
+    """
+    Get the delay (in seconds) before retrying a request from the value of a
+    Retry-After header, either a number of seconds or an HTTP date.
+
+    Args:
+        retry_after (str | None): the header value
+        default (float): the delay if the header is missing or invalid
+
+    Returns:
+        float: the delay
+    """
+    if retry_after is None:
+        return default
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        LOGGER.warning(f"Invalid Retry-After header: {retry_after}.")
+        return default
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def download(
+    advent: Advent,
+    session: requests.Session,
+    limiter: RateLimiter,
+    retries: int = RETRIES,
+) -> Path:
+    """
+    Download the input of a day with a shared session and rate limiter, and
+    save it to its file. Requests the server asks to retry later are retried,
+    after the delay given by its Retry-After header, or after an exponential
+    backoff if it has none.
+
+    Args:
+        advent (Advent): the day
+        session (requests.Session): the session
+        limiter (RateLimiter): the rate limiter
+        retries (int, optional): number of retries. Defaults to RETRIES.
+
+    Raises:
+        requests.HTTPError: if the input cannot be downloaded
+
+    Returns:
+        Path: the input file
+    """
+    for attempt in range(retries + 1):
+        limiter.wait()
+        LOGGER.info(f"Downloading input for {advent.year} day {advent.day:02d}.")
+        r = session.get(url(advent.year, advent.day, "input"))
+        if r.status_code in (429, 503) and attempt < retries:
+            delay = retry_delay(
+                r.headers.get("Retry-After"), limiter.interval * 2**attempt
+            )
+            LOGGER.info(f"Server busy, retrying in {delay:.1f}s.")
+            limiter.pause(delay)
+            continue
+        advent.save_input(check_response(r))
+        break
+    return advent.input_file
+
+
+def prefetch(
+    years: int | Iterable[int],
+    days: Iterable[int] = DAYS,
+    jobs: int = MAX_WORKERS,
+    interval: float = MIN_INTERVAL,
+) -> list[Path]:
+    """
+    Download the missing inputs of the given days of one or more years
+    concurrently, over a pool of at most jobs connections, with requests
+    started at least interval seconds apart. Inputs which are already in
+    INPUTS_DIR are not downloaded again.
+
+    Args:
+        years (int | Iterable[int]): the year(s)
+        days (Iterable[int], optional): the days. Defaults to DAYS.
+        jobs (int, optional): number of concurrent downloads. Defaults to
+        MAX_WORKERS.
+        interval (float, optional): minimum delay between two requests.
+        Defaults to MIN_INTERVAL.
+
+    Raises:
+        requests.HTTPError: if some inputs cannot be downloaded, once all the
+        others are
+
+    Returns:
+        list[Path]: the downloaded input files
+    """
+    years = [years] if isinstance(years, int) else list(years)
+    days = list(days)
+    missing = [
+        advent
+        for advent in (Advent(day, year) for year in years for day in days)
+        if not advent.input_file.is_file()
+    ]
+    if not missing:
+        LOGGER.info("All inputs are already downloaded.")
+        return []
+
+    session = get_session(pool_size=jobs)
+    limiter = RateLimiter(interval)
+    with ThreadPoolExecutor(max_workers=min(jobs, len(missing))) as pool:
+        futures = {
+            pool.submit(download, advent, session, limiter): advent
+            for advent in missing
+        }
+
+    paths, failed = [], []
+    for future, advent in futures.items():
+        try:
+            paths.append(future.result())
+        except requests.HTTPError:
+            failed.append(f"{advent.year} day {advent.day:02d}")
+    if failed:
+        raise requests.HTTPError(f"Unable to download inputs for {', '.join(failed)}.")
+    return paths
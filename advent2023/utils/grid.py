@@ -0,0 +1,335 @@
+import numpy as np
+import numpy.typing as npt
+
+from advent2023.utils.algos import deltas_4, deltas_8
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+class Grid:
+    """
+    A 2D grid of characters, stored as a uint8 array with one byte per cell.
+    Cells are addressed either by (row, col) or by their flat index
+    row * cols + col, which the precomputed neighbor tables use.
+    """
+
+    cells: npt.NDArray[np.uint8]
+
+    def __init__(self, cells: npt.NDArray[np.uint8]) -> None:
+        self.cells = cells
+        self._neighbors: dict[bool, npt.NDArray[np.intp]] = {}
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "Grid":
+        """
+        Build a grid from the input bytes, without copying them. The rows of the
+        grid are the input lines, which must all have the same length.
+
+        Args:
+            data (bytes | memoryview): the input bytes
+
+        Raises:
+            ValueError: if the lines have different lengths
+
+        Returns:
+            Grid: the grid
+        """
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        end = len(buffer)
+        while end and buffer[end - 1] in WHITESPACE:
+            end -= 1
+        buffer = buffer[:end]
+
+        newlines = np.flatnonzero(buffer == NEWLINE)
+        stride = newlines[0] + 1 if newlines.size else end + 1
+        cols = stride - 1
+        if cols and buffer[cols - 1] == CARRIAGE_RETURN:
+            cols -= 1
+        rows = newlines.size + 1
+
+        expected = np.arange(1, rows) * stride - 1
+        if (rows - 1) * stride + cols != end or np.any(newlines != expected):
+            raise ValueError("Grid lines have different lengths.")
+
+        cells = np.lib.stride_tricks.as_strided(
+            buffer, shape=(rows, cols), strides=(stride, 1), writeable=False
+        )
+        return cls(cells)
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        """
+        Build a grid from lines of text, which must all have the same length.
+
+        Args:
+            lines (list[str]): the lines
+
+        Raises:
+            ValueError: if the lines have different lengths
+
+        Returns:
+            Grid: the grid
+        """
+        return cls.from_bytes("\n".join(lines).encode())
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __str__(self) -> str:
+        return "\n".join(row.tobytes().decode() for row in self.cells)
+
+    def mask(self, chars: str) -> npt.NDArray[np.bool_]:
+        """
+        Get the mask of the cells holding any of chars.
+
+        Args:
+            chars (str): the characters
+
+        Returns:
+            npt.NDArray[np.bool_]: the mask
+        """
+        return np.isin(self.cells, np.frombuffer(chars.encode(), dtype=np.uint8))
+
+    def find(self, char: str) -> npt.NDArray[np.intp]:
+        """
+        Find the positions of the cells holding char.
+
+        Args:
+            char (str): the character
+
+        Returns:
+            npt.NDArray[np.intp]: the (row, col) positions, in row-major order
+        """
+        return np.argwhere(self.cells == ord(char))
+
+    def index(self, char: str) -> tuple[int, int]:
+        """
+        Find the position of the first cell holding char.
+
+        Args:
+            char (str): the character
+
+        Raises:
+            ValueError: if char is not in the grid
+
+        Returns:
+            tuple[int, int]: the (row, col) position
+        """
+        positions = self.find(char)
+        if not len(positions):
+            raise ValueError(f"{char!r} is not in grid.")
+        return int(positions[0][0]), int(positions[0][1])
+
+    def flat(self, node: tuple[int, int]) -> int:
+        return node[0] * self.shape[1] + node[1]
+
+    def coords(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.shape[1])
+
+    def offsets(self, diagonal: bool = False) -> tuple[int, ...]:
+        """
+        Flat index offsets of the neighbors of a cell, in the order of deltas_4
+        (or deltas_8 if diagonal is True). Only valid for cells which are not on
+        the border of the grid.
+
+        Args:
+            diagonal (bool, optional): include diagonal neighbors. Defaults to False.
+
+        Returns:
+            tuple[int, ...]: the offsets
+        """
+        cols = self.shape[1]
+        return tuple(dr * cols + dc for dr, dc in (deltas_8 if diagonal else deltas_4))
+
+    def neighbors(self, diagonal: bool = False) -> npt.NDArray[np.intp]:
+        """
+        Table of the flat indices of the neighbors of each cell, in the order of
+        deltas_4 (or deltas_8 if diagonal is True), with -1 for neighbors outside
+        the grid. The table is computed once per grid.
+
+        Args:
+            diagonal (bool, optional): include diagonal neighbors. Defaults to False.
+
+        Returns:
+            npt.NDArray[np.intp]: the (size, 4) or (size, 8) neighbor table
+        """
+        if diagonal not in self._neighbors:
+            rows, cols = self.shape
+            r, c = np.divmod(np.arange(rows * cols), cols)
+            deltas = deltas_8 if diagonal else deltas_4
+            table = np.empty((rows * cols, len(deltas)), dtype=np.intp)
+            for i, (dr, dc) in enumerate(deltas):
+                rr, cc = r + dr, c + dc
+                inside = (0 <= rr) & (rr < rows) & (0 <= cc) & (cc < cols)
+                table[:, i] = np.where(inside, rr * cols + cc, -1)
+            self._neighbors[diagonal] = table
+        return self._neighbors[diagonal]
+
+
+class BitGrid:
+    """
+    A 2D grid of booleans, packed as one Python int per row, where bit c of a
+    row holds column c. Operations work on whole rows of bits at once, so a
+    step over the grid costs a few int operations per row instead of one
+    Python operation per cell.
+    """
+
+    rows: list[int]
+    cols: int
+
+    def __init__(self, rows: list[int], cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+
+    @classmethod
+    def from_mask(cls, mask: npt.NDArray[np.bool_]) -> "BitGrid":
+        """
+        Pack a boolean mask row by row.
+
+        Args:
+            mask (npt.NDArray[np.bool_]): the mask
+
+        Returns:
+            BitGrid: the packed grid
+        """
+        packed = np.packbits(mask, axis=1, bitorder="little")
+        rows = [int.from_bytes(row.tobytes(), "little") for row in packed]
+        return cls(rows, mask.shape[1])
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int) -> "BitGrid":
+        return cls([0] * rows, cols)
+
+    def to_mask(self) -> npt.NDArray[np.bool_]:
+        """
+        Unpack the grid into a boolean mask.
+
+        Returns:
+            npt.NDArray[np.bool_]: the mask
+        """
+        width = (self.cols + 7) // 8
+        data = b"".join(row.to_bytes(width, "little") for row in self.rows)
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(len(self.rows), width)
+        bits = np.unpackbits(packed, axis=1, count=self.cols, bitorder="little")
+        return bits.astype(bool)
+
+    def transpose(self) -> "BitGrid":
+        """
+        Pack the grid column by column, i.e. transpose it.
+
+        Returns:
+            BitGrid: the transposed grid
+        """
+        return BitGrid.from_mask(self.to_mask().T)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), self.cols
+
+    @property
+    def full(self) -> int:
+        return (1 << self.cols) - 1
+
+    def __getitem__(self, node: tuple[int, int]) -> bool:
+        r, c = node
+        return bool(self.rows[r] >> c & 1)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BitGrid):
+            return NotImplemented
+        return self.cols == other.cols and self.rows == other.rows
+
+    def __and__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid([a & b for a, b in zip(self.rows, other.rows)], self.cols)
+
+    def __or__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid([a | b for a, b in zip(self.rows, other.rows)], self.cols)
+
+    def __xor__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid([a ^ b for a, b in zip(self.rows, other.rows)], self.cols)
+
+    def __invert__(self) -> "BitGrid":
+        full = self.full
+        return BitGrid([row ^ full for row in self.rows], self.cols)
+
+    def popcount(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def shift(self, dr: int, dc: int) -> "BitGrid":
+        """
+        Move every cell by dr rows and dc cols, dropping the cells which move
+        out of the grid.
+
+        Args:
+            dr (int): the row offset
+            dc (int): the col offset
+
+        Returns:
+            BitGrid: the shifted grid
+        """
+        n = len(self.rows)
+        if dr >= 0:
+            rows = [0] * min(dr, n) + self.rows[: max(n - dr, 0)]
+        else:
+            rows = self.rows[-dr:] + [0] * min(-dr, n)
+        if dc > 0:
+            full = self.full
+            rows = [row << dc & full for row in rows]
+        elif dc < 0:
+            rows = [row >> -dc for row in rows]
+        return BitGrid(rows, self.cols)
+
+    def spread(self, diagonal: bool = False) -> "BitGrid":
+        """
+        Get the cells which are a neighbor of a cell of the grid, in the 4
+        directions (or 8 if diagonal is True).
+
+        Args:
+            diagonal (bool, optional): include diagonal neighbors. Defaults to False.
+
+        Returns:
+            BitGrid: the neighbor cells
+        """
+        full = self.full
+        # shift each row left and right once, then combine the rows
+        left = [row >> 1 for row in self.rows]
+        right = [row << 1 & full for row in self.rows]
+        middle = [a | b for a, b in zip(left, right)]
+        if diagonal:
+            sides = [a | b for a, b in zip(middle, self.rows)]
+        else:
+            sides = self.rows
+
+        n = len(self.rows)
+        rows = []
+        for r in range(n):
+            row = middle[r]
+            if r > 0:
+                row |= sides[r - 1]
+            if r < n - 1:
+                row |= sides[r + 1]
+            rows.append(row)
+        return BitGrid(rows, self.cols)
+
+    def dilate(self, diagonal: bool = False) -> "BitGrid":
+        """
+        Dilate the grid by its 4-neighborhood (or 8-neighborhood if diagonal
+        is True).
+
+        Args:
+            diagonal (bool, optional): include diagonal neighbors. Defaults to False.
+
+        Returns:
+            BitGrid: the dilated grid
+        """
+        return self | self.spread(diagonal)
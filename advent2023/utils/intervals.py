@@ -0,0 +1,279 @@
+from collections.abc import Iterable, Iterator, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+# Bounds used for the complement of a set of intervals
+MIN = np.iinfo(np.int64).min
+MAX = np.iinfo(np.int64).max
+
+
+def _overlaps(
+    a_starts: npt.NDArray[np.int64],
+    a_ends: npt.NDArray[np.int64],
+    b_starts: npt.NDArray[np.int64],
+    b_ends: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.intp]]:
+    """
+    Intersect two sorted lists of disjoint half-open intervals. Each interval
+    of a only overlaps a contiguous run of intervals of b, found by binary
+    search, so the cost is linear in the number of overlapping pairs.
+
+    Args:
+        a_starts (npt.NDArray[np.int64]): the starts of the intervals of a
+        a_ends (npt.NDArray[np.int64]): the ends of the intervals of a
+        b_starts (npt.NDArray[np.int64]): the starts of the intervals of b
+        b_ends (npt.NDArray[np.int64]): the ends of the intervals of b
+
+    Returns:
+        tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.intp]]:
+        the starts and ends of the intersections, in order, and the index of
+        the interval of b each of them comes from
+    """
+    first = np.searchsorted(b_ends, a_starts, side="right")
+    last = np.searchsorted(b_starts, a_ends, side="left")
+    counts = np.maximum(last - first, 0)
+    a_index = np.repeat(np.arange(len(a_starts)), counts)
+    # index of each pair in its run, added to the run's first interval of b
+    run = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    b_index = np.repeat(first, counts) + run
+    starts = np.maximum(a_starts[a_index], b_starts[b_index])
+    ends = np.minimum(a_ends[a_index], b_ends[b_index])
+    return starts, ends, b_index
+
+
+class IntervalSet:
+    """
+    A set of integers, stored as sorted, disjoint and non-adjacent half-open
+    intervals [starts[i], ends[i]) in two parallel int64 arrays. Intervals are
+    merged whenever a set is built, so the number of intervals only depends
+    on the integers in the set, not on how it was computed.
+    """
+
+    starts: npt.NDArray[np.int64]
+    ends: npt.NDArray[np.int64]
+
+    def __init__(self, starts: npt.ArrayLike = (), ends: npt.ArrayLike = ()) -> None:
+        starts = np.asarray(starts, dtype=np.int64).ravel()
+        ends = np.asarray(ends, dtype=np.int64).ravel()
+        if starts.shape != ends.shape:
+            raise ValueError("Interval starts and ends have different lengths.")
+        keep = starts < ends
+        starts, ends = starts[keep], ends[keep]
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+
+        # an interval starts a new group if it starts after all previous ends
+        if len(starts):
+            reach = np.maximum.accumulate(ends)
+            new = np.ones(len(starts), dtype=bool)
+            new[1:] = starts[1:] > reach[:-1]
+            groups = np.flatnonzero(new)
+            starts = starts[groups]
+            ends = np.maximum.reduceat(ends, groups)
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """
+        Build a set from (start, end) half-open intervals, in any order.
+
+        Args:
+            intervals (Iterable[tuple[int, int]]): the intervals
+
+        Returns:
+            IntervalSet: the set
+        """
+        bounds = np.array(list(intervals), dtype=np.int64).reshape(-1, 2)
+        return cls(bounds[:, 0], bounds[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __contains__(self, value: int) -> bool:
+        i = np.searchsorted(self.ends, value, side="right")
+        return bool(i < len(self.starts) and self.starts[i] <= value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(
+            self.ends, other.ends
+        )
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    @property
+    def size(self) -> int:
+        return int(np.sum(self.ends - self.starts))
+
+    def min(self) -> int:
+        if not len(self.starts):
+            raise ValueError("min of an empty interval set.")
+        return int(self.starts[0])
+
+    def max(self) -> int:
+        if not len(self.starts):
+            raise ValueError("max of an empty interval set.")
+        return int(self.ends[-1]) - 1
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(
+            np.concatenate([self.starts, other.starts]),
+            np.concatenate([self.ends, other.ends]),
+        )
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        starts, ends, _ = _overlaps(self.starts, self.ends, other.starts, other.ends)
+        return IntervalSet(starts, ends)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self & ~other
+
+    def __invert__(self) -> "IntervalSet":
+        return IntervalSet(
+            np.concatenate([[MIN], self.ends]), np.concatenate([self.starts, [MAX]])
+        )
+
+    def shift(self, offset: int) -> "IntervalSet":
+        return IntervalSet(self.starts + offset, self.ends + offset)
+
+
+class IntervalMap:
+    """
+    A piecewise translation of the integers: values in [starts[i], ends[i])
+    are moved by offsets[i], and values outside all the intervals are left
+    as they are. The intervals are stored sorted in parallel arrays, and must
+    not overlap.
+    """
+
+    starts: npt.NDArray[np.int64]
+    ends: npt.NDArray[np.int64]
+    offsets: npt.NDArray[np.int64]
+
+    def __init__(
+        self, starts: npt.ArrayLike, ends: npt.ArrayLike, offsets: npt.ArrayLike
+    ) -> None:
+        starts = np.asarray(starts, dtype=np.int64).ravel()
+        ends = np.asarray(ends, dtype=np.int64).ravel()
+        offsets = np.asarray(offsets, dtype=np.int64).ravel()
+        if not starts.shape == ends.shape == offsets.shape:
+            raise ValueError(
+                "Interval starts, ends and offsets have different lengths."
+            )
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.offsets = offsets[order]
+        if np.any(self.starts[1:] < self.ends[:-1]):
+            raise ValueError("Intervals of a map must not overlap.")
+
+    @property
+    def domain(self) -> IntervalSet:
+        return IntervalSet(self.starts, self.ends)
+
+    def __call__(self, values: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """
+        Map values.
+
+        Args:
+            values (npt.ArrayLike): the values
+
+        Returns:
+            npt.NDArray[np.int64]: the mapped values
+        """
+        values = np.asarray(values, dtype=np.int64)
+        if not len(self.starts):
+            return values.copy()
+        # the only interval which can hold a value is the first ending after it
+        i = np.searchsorted(self.ends, values, side="right")
+        i = np.minimum(i, len(self.starts) - 1)
+        inside = (self.starts[i] <= values) & (values < self.ends[i])
+        return values + np.where(inside, self.offsets[i], 0)
+
+    def apply(self, intervals: IntervalSet) -> IntervalSet:
+        """
+        Map a set of intervals. The parts of the set inside the map's
+        intervals are moved by their offsets, and the rest is kept, so the
+        result has at most as many intervals as the set and the map together.
+
+        Args:
+            intervals (IntervalSet): the set
+
+        Returns:
+            IntervalSet: the mapped set
+        """
+        starts, ends, index = _overlaps(
+            intervals.starts, intervals.ends, self.starts, self.ends
+        )
+        unmapped = intervals - self.domain
+        offsets = self.offsets[index]
+        return IntervalSet(
+            np.concatenate([starts + offsets, unmapped.starts]),
+            np.concatenate([ends + offsets, unmapped.ends]),
+        )
+
+
+class Box:
+    """
+    An n-dimensional box of integers, the product of one half-open interval
+    [lows[i], highs[i]) per axis. Boxes are immutable, and splitting one
+    along an axis gives two boxes instead of copying per-axis ranges around.
+    """
+
+    lows: tuple[int, ...]
+    highs: tuple[int, ...]
+
+    def __init__(self, lows: Sequence[int], highs: Sequence[int]) -> None:
+        if len(lows) != len(highs):
+            raise ValueError("Box lows and highs have different lengths.")
+        self.lows = tuple(lows)
+        self.highs = tuple(highs)
+
+    def __repr__(self) -> str:
+        return f"Box({self.lows}, {self.highs})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Box):
+            return NotImplemented
+        return self.lows == other.lows and self.highs == other.highs
+
+    @property
+    def empty(self) -> bool:
+        return any(low >= high for low, high in zip(self.lows, self.highs))
+
+    @property
+    def volume(self) -> int:
+        volume = 1
+        for low, high in zip(self.lows, self.highs):
+            volume *= max(high - low, 0)
+        return volume
+
+    def __and__(self, other: "Box") -> "Box":
+        return Box(
+            [max(a, b) for a, b in zip(self.lows, other.lows)],
+            [min(a, b) for a, b in zip(self.highs, other.highs)],
+        )
+
+    def split(self, axis: int, at: int) -> tuple["Box", "Box"]:
+        """
+        Split the box along an axis, into the values below at and the values
+        from at on. Either part can be empty.
+
+        Args:
+            axis (int): the axis
+            at (int): the split value
+
+        Returns:
+            tuple[Box, Box]: the parts below and above at
+        """
+        low, high = self.lows[axis], self.highs[axis]
+        at = min(max(at, low), high)
+        below = Box(self.lows, self.highs[:axis] + (at,) + self.highs[axis + 1 :])
+        above = Box(self.lows[:axis] + (at,) + self.lows[axis + 1 :], self.highs)
+        return below, above
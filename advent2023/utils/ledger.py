@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from advent2023.utils.utils import Advent
+
+LOGGER = logging.getLogger(__name__)
+
+# Verdicts of the AOC server for a submitted answer
+RIGHT = "right"
+WRONG = "wrong"
+TOO_HIGH = "too high"
+TOO_LOW = "too low"
+COMPLETED = "completed"
+WAIT = "wait"
+
+# Retries of a submission the server asked to wait for
+RETRIES = 3
+
+WAIT_LEFT = re.compile(r"you have (?:(\d+)m ?)?(?:(\d+)s)? left to wait")
+WAIT_AFTER = re.compile(r"please wait (one|\d+) (minute|second)s?")
+
+
+@dataclass
+class Submission:
+    answer: str
+    verdict: str
+    date: str
+
+
+@dataclass
+class Entry:
+    """
+    What is known about the answer of a part: the right answer once found,
+    the wrong answers, and the bounds given by the server for numeric
+    answers (low < answer < high), along with every submission made. A part
+    is completed when the server says it was already solved, e.g. before the
+    ledger kept its answers, in which case the right answer may be unknown.
+    """
+
+    correct: str | None = None
+    wrong: list[str] = field(default_factory=list)
+    low: int | None = None
+    high: int | None = None
+    completed: bool = False
+    submissions: list[Submission] = field(default_factory=list)
+
+    def settle(self, answer: str) -> bool | None:
+        """
+        Check an answer against what is known.
+
+        Args:
+            answer (str): the answer
+
+        Returns:
+            bool | None: True if it is known to be right, or if the part is
+            completed and it is not known to be wrong, False if it is known to
+            be wrong, None if it must be submitted to find out
+        """
+        if self.correct is not None:
+            return answer == self.correct
+        if answer in self.wrong:
+            return False
+        if self.completed:
+            return True
+        try:
+            value = int(answer)
+        except ValueError:
+            return None
+        if (self.low is not None and value <= self.low) or (
+            self.high is not None and value >= self.high
+        ):
+            return False
+        return None
+
+    def record(self, answer: str, verdict: str):
+        date = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.submissions.append(Submission(answer, verdict, date))
+        if verdict == RIGHT:
+            self.correct = answer
+            self.completed = True
+        elif verdict == COMPLETED:
+            self.completed = True
+        elif verdict in (WRONG, TOO_HIGH, TOO_LOW):
+            self.wrong.append(answer)
+        if verdict == TOO_LOW:
+            value = int(answer)
+            self.low = value if self.low is None else max(self.low, value)
+        elif verdict == TOO_HIGH:
+            value = int(answer)
+            self.high = value if self.high is None else min(self.high, value)
+
+
+class Ledger:
+    """
+    Answers submitted for each year, day and part, persisted as a json file,
+    so that answers known to be right or wrong, and parts already completed,
+    are settled without asking the server again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[tuple[int, int, int], Entry] = {}
+        if path.is_file():
+            with open(path, "r") as f:
+                self.entries = _from_json(json.load(f))
+
+    def entry(self, year: int, day: int, part: int) -> Entry:
+        return self.entries.setdefault((year, day, part), Entry())
+
+    def save(self):
+        """
+        Save the ledger, writing it to a temporary file first and then moving
+        it into place, so that it is never left half written.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(_to_json(self.entries), f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def _to_json(entries: dict[tuple[int, int, int], Entry]) -> dict[str, Any]:
+    data = {}
+    for (year, day, part), entry in sorted(entries.items()):
+        parts = data.setdefault(str(year), {}).setdefault(f"{day:02d}", {})
+        parts[str(part)] = asdict(entry)
+    return data
+
+
+def _from_json(data: dict[str, Any]) -> dict[tuple[int, int, int], Entry]:
+    entries = {}
+    for year, days in data.items():
+        for day, parts in days.items():
+            for part, entry in parts.items():
+                submissions = [Submission(**s) for s in entry.pop("submissions", [])]
+                entries[(int(year), int(day), int(part))] = Entry(
+                    **entry, submissions=submissions
+                )
+    return entries
+
+
+def parse_verdict(text: str) -> tuple[str, float]:
+    """
+    Parse the server's response to a submission.
+
+    Args:
+        text (str): the response text
+
+    Returns:
+        tuple[str, float]: the verdict, and the time (in seconds) to wait
+        before submitting again
+    """
+    text = text.lower()
+    if "you have to wait" in text or "left to wait" in text:
+        match = WAIT_LEFT.search(text)
+        if match and any(match.groups()):
+            minutes, seconds = match.groups()
+            return WAIT, 60 * int(minutes or 0) + int(seconds or 0)
+        return WAIT, 60.0
+    if "did you already complete it" in text:
+        return COMPLETED, 0.0
+    if "that's the right answer" in text:
+        return RIGHT, 0.0
+
+    wait = 60.0
+    match = WAIT_AFTER.search(text)
+    if match:
+        count = 1 if match.group(1) == "one" else int(match.group(1))
+        wait = count * (60.0 if match.group(2) == "minute" else 1.0)
+    if "your answer is too high" in text:
+        return TOO_HIGH, wait
+    if "your answer is too low" in text:
+        return TOO_LOW, wait
+    return WRONG, wait
+
+
+class SubmissionQueue:
+    """
+    Submits answers one at a time, settling those the ledger already knows
+    locally. The queue honors the wait the server asks for after a wrong or
+    early answer, holding back the next submission until it has passed and
+    retrying submissions that were turned down for being too early.
+    """
+
+    def __init__(
+        self,
+        ledger: Ledger,
+        retries: int = RETRIES,
+        wait: Callable[[float], None] = sleep,
+    ) -> None:
+        self.ledger = ledger
+        self.retries = retries
+        self.wait = wait
+        self._pending: deque[tuple["Advent", int, Any]] = deque()
+        self._ready = 0.0
+
+    def put(self, advent: "Advent", part: int, answer: Any):
+        self._pending.append((advent, part, answer))
+
+    def run(self) -> list[bool]:
+        """
+        Submit the queued answers, in order.
+
+        Returns:
+            list[bool]: whether each answer is right (or its part completed)
+        """
+        verdicts = []
+        while self._pending:
+            verdicts.append(self.submit(*self._pending.popleft()))
+        return verdicts
+
+    def submit(self, advent: "Advent", part: int, answer: Any) -> bool:
+        """
+        Submit an answer, unless the ledger already knows if it is right or
+        the part is already completed.
+
+        Args:
+            advent (Advent): the day
+            part (int): the part
+            answer (Any): the answer
+
+        Returns:
+            bool: True if answer is right or the part is already completed,
+            False otherwise
+        """
+        answer = str(answer)
+        entry = self.ledger.entry(advent.year, advent.day, part)
+        known = entry.settle(answer)
+        if known is not None:
+            status = "wrong"
+            if known:
+                status = "right" if entry.correct is not None else "completed"
+            LOGGER.info(
+                f"Answer {answer} for day {advent.day:02d} PART {part} is known to be"
+                f" {status}, not submitting it."
+            )
+            return known
+
+        for _ in range(self.retries + 1):
+            delay = self._ready - monotonic()
+            if delay > 0:
+                LOGGER.info(f"Waiting {delay:.0f}s before submitting.")
+                self.wait(delay)
+
+            verdict, wait = parse_verdict(advent.post_answer(part, answer))
+            self._ready = monotonic() + wait
+            if verdict != WAIT:
+                break
+        LOGGER.info(f"Verdict for day {advent.day:02d} PART {part}: {verdict}.")
+
+        if verdict != WAIT:
+            entry.record(answer, verdict)
+            self.ledger.save()
+        return verdict in (RIGHT, COMPLETED)
@@ -0,0 +1,230 @@
+import functools
+import shelve
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Eviction policies: least recently used, least frequently used
+LRU = "lru"
+LFU = "lfu"
+POLICIES = (LRU, LFU)
+
+_MISSING = object()
+
+
+@dataclass
+class CacheInfo:
+    """
+    Statistics of a memoized function. Disk hits are misses of the memory
+    tier found in the disk tier, and are not counted as misses.
+    """
+
+    hits: int
+    misses: int
+    disk_hits: int
+    evictions: int
+    size: int
+    maxsize: int | None
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / calls if calls else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.disk_hits} disk hits, {self.misses} misses"
+            f" ({self.hit_rate:.1%} hit rate), {self.evictions} evictions,"
+            f" size {self.size}/{self.maxsize or 'unbounded'}"
+        )
+
+
+class Memo(Generic[T]):
+    """
+    A memoized function, with an optional bound on the number of results
+    kept in memory. When the bound is reached, the least recently used (LRU)
+    or least frequently used (LFU) result is evicted. Results are keyed on
+    key(*args) if key is given, e.g. to key on a few ints rather than on
+    large arguments, or on the part of the arguments a result depends on so
+    that callers with different arguments share results.
+
+    If path is given, evicted results are spilled to a disk tier (a shelve
+    database), which is looked up on misses, and save() writes the results in
+    memory to it, so that they persist from one run to the next. Keys of the
+    disk tier are the repr of the keys, which must be stable across runs.
+
+    Bookkeeping is done under a lock, so a memo can be shared by threads,
+    but concurrent calls with the same key may both compute the result.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., T],
+        maxsize: int | None = None,
+        policy: str = LRU,
+        key: Callable[..., Hashable] | None = None,
+        path: Path | None = None,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy}.")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self.path = path
+        self._lock = threading.Lock()
+        self._shelf: shelve.Shelf | None = None
+        self._reset()
+
+    def _reset(self):
+        self._data: OrderedDict[Hashable, T] = OrderedDict()
+        # LFU bookkeeping: use count of each key, and keys by use count in
+        # the order they reached it
+        self._counts: dict[Hashable, int] = {}
+        self._by_count: dict[int, dict[Hashable, None]] = {}
+        self._min_count = 0
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def __call__(self, *args) -> T:
+        key = self.key(*args) if self.key is not None else args
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._touch(key)
+                return self._data[key]
+            value = _MISSING
+            if self.path is not None:
+                value = self.shelf.get(repr(key), _MISSING)
+            if value is not _MISSING:
+                self.disk_hits += 1
+                self._insert(key, value)
+                return value
+            self.misses += 1
+
+        # computed without holding the lock, as fn may call the memo again
+        value = self.fn(*args)
+        with self._lock:
+            if key not in self._data:
+                self._insert(key, value)
+        return value
+
+    def _touch(self, key: Hashable):
+        if self.maxsize is None:
+            return
+        if self.policy == LRU:
+            self._data.move_to_end(key)
+            return
+        count = self._counts[key]
+        bucket = self._by_count[count]
+        del bucket[key]
+        if not bucket:
+            del self._by_count[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._by_count.setdefault(count + 1, {})[key] = None
+
+    def _insert(self, key: Hashable, value: T):
+        if self.maxsize is not None and len(self._data) >= self.maxsize:
+            self._evict()
+        self._data[key] = value
+        if self.maxsize is not None and self.policy == LFU:
+            self._counts[key] = 1
+            self._by_count.setdefault(1, {})[key] = None
+            self._min_count = 1
+
+    def _evict(self):
+        if self.policy == LRU:
+            key, value = self._data.popitem(last=False)
+        else:
+            bucket = self._by_count[self._min_count]
+            key = next(iter(bucket))
+            del bucket[key]
+            if not bucket:
+                del self._by_count[self._min_count]
+            del self._counts[key]
+            value = self._data.pop(key)
+        self.evictions += 1
+        if self.path is not None:
+            self.shelf[repr(key)] = value
+
+    @property
+    def shelf(self) -> shelve.Shelf:
+        """
+        The disk tier, opened on first use.
+        """
+        if self._shelf is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._shelf = shelve.open(str(self.path))
+        return self._shelf
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.disk_hits,
+                self.evictions,
+                len(self._data),
+                self.maxsize,
+            )
+
+    def clear(self):
+        """
+        Clear the memory tier and the statistics. The disk tier is kept.
+        """
+        with self._lock:
+            self._reset()
+
+    def save(self):
+        """
+        Write the results in memory to the disk tier, and flush it.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            for key, value in self._data.items():
+                self.shelf[repr(key)] = value
+            self.shelf.sync()
+
+    def close(self):
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+
+def memoize(
+    maxsize: int | None = None,
+    policy: str = LRU,
+    key: Callable[..., Hashable] | None = None,
+    path: Path | None = None,
+) -> Callable[[Callable[..., T]], Memo[T]]:
+    """
+    Decorator memoizing a function in a Memo.
+
+    Args:
+        maxsize (int | None, optional): maximum number of results kept in
+        memory. Defaults to None, i.e. unbounded.
+        policy (str, optional): eviction policy, LRU or LFU. Defaults to LRU.
+        key (Callable[..., Hashable] | None, optional): function computing the
+        key of the arguments. Defaults to None, i.e. the arguments tuple.
+        path (Path | None, optional): path of the disk tier. Defaults to None,
+        i.e. no disk tier.
+
+    Returns:
+        Callable[[Callable[..., T]], Memo[T]]: the decorator
+    """
+
+    def decorator(fn: Callable[..., T]) -> Memo[T]:
+        return Memo(fn, maxsize, policy, key, path)
+
+    return decorator
@@ -0,0 +1,76 @@
+import re
+from collections.abc import Iterable
+from itertools import chain, islice
+
+import numpy as np
+import numpy.typing as npt
+
+# A signed integer: a minus sign only counts as a sign right before digits
+INT = re.compile(r"-?\d+")
+
+# Bounds of an int64, to which numpy saturates integers which do not fit
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+# Number of lines whose integers are extracted at once by int_matrix, which
+# bounds the number of tokens held as strings
+BATCH_SIZE = 4096
+
+
+def _to_array(tokens: Iterable[str]) -> npt.NDArray[np.int64]:
+    # numpy parses the whole string at once, rather than one int() per token
+    text = " ".join(tokens)
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+    # integers beyond an int64 are saturated, so only tokens read as one of
+    # its bounds need to be checked
+    if values.size and (values.min() == INT64_MIN or values.max() == INT64_MAX):
+        for token in text.split():
+            if not INT64_MIN <= int(token) <= INT64_MAX:
+                raise OverflowError(f"Integer {token} does not fit in an int64.")
+    return values
+
+
+def ints(text: str) -> npt.NDArray[np.int64]:
+    """
+    Extract all the signed integers of a text, in order, ignoring anything
+    else (e.g. "Card 3: 41 -7 | 2" gives [3, 41, -7, 2]). Integers must fit
+    in an int64.
+
+    Args:
+        text (str): the text
+
+    Raises:
+        OverflowError: if an integer does not fit in an int64
+
+    Returns:
+        npt.NDArray[np.int64]: the integers
+    """
+    return _to_array(INT.findall(text))
+
+
+def int_matrix(
+    lines: Iterable[str],
+) -> npt.NDArray[np.int64] | list[npt.NDArray[np.int64]]:
+    """
+    Extract the signed integers of each line. If all lines have the same
+    number of integers, they are returned as a matrix with one row per line,
+    otherwise as a list of arrays, one per line.
+
+    Args:
+        lines (Iterable[str]): the lines
+
+    Raises:
+        OverflowError: if an integer does not fit in an int64
+
+    Returns:
+        npt.NDArray[np.int64] | list[npt.NDArray[np.int64]]: the integers of
+        each line
+    """
+    counts, batches = [], []
+    lines = iter(lines)
+    while batch := [INT.findall(line) for line in islice(lines, BATCH_SIZE)]:
+        counts.extend(len(row) for row in batch)
+        batches.append(_to_array(chain.from_iterable(batch)))
+    values = np.concatenate(batches) if batches else np.empty(0, dtype=np.int64)
+    if len(set(counts)) <= 1:
+        return values.reshape(len(counts), counts[0] if counts else 0)
+    return np.split(values, np.cumsum(counts)[:-1])
@@ -0,0 +1,300 @@
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+import weakref
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, TypeVar
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Environment variable which turns progress bars on
+PROGRESS_ENV = "ADVENT_PROGRESS"
+
+# Stacks taking less than this (in seconds) are left out of collapsed stacks
+MIN_STACK_TIME = 1e-6
+
+# Growth of the traced memory (as a fraction) after which a new snapshot of
+# the allocation sites is taken while tracing memory
+SNAPSHOT_GROWTH = 0.1
+
+# Allocations left out of the allocation sites: those of the tracing itself,
+# of its watcher thread, and of the weak references the thread uses
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, str(Path(weakref.__file__).with_name("*weakref*.py"))),
+]
+
+
+class Timings:
+    """
+    Elapsed times of named phases. While a Timings is active (used as a
+    context manager), each phase entered in the same thread or task is
+    recorded in it under its path, e.g. "part2/search" for a "search" phase
+    entered within a "part2" phase.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self._stack: list[str] = []
+        self._token: Token | None = None
+
+    def __enter__(self) -> "Timings":
+        self._token = _TIMINGS.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _TIMINGS.reset(self._token)
+        self._token = None
+
+    def add(self, path: str, elapsed: float):
+        self.phases[path] = self.phases.get(path, 0.0) + elapsed
+        self.calls[path] = self.calls.get(path, 0) + 1
+
+
+_TIMINGS: ContextVar[Timings | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a named phase, as a context manager or a decorator. The time is
+    added to the active Timings, if any, so phases cost a single lookup
+    when nothing is recording them.
+
+    Args:
+        name (str): the phase's name
+
+    Yields:
+        Iterator[None]: nothing
+    """
+    timings = _TIMINGS.get()
+    if timings is None:
+        yield
+        return
+
+    timings._stack.append(name)
+    path = "/".join(timings._stack)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(path, perf_counter() - start)
+        timings._stack.pop()
+
+
+def progress(iterable: Iterable[T], **kwargs) -> Iterable[T]:
+    """
+    Wrap iterable in a tqdm progress bar if progress bars are turned on with
+    the ADVENT_PROGRESS environment variable, and return it as is otherwise,
+    so that loops do not pay for a progress bar by default.
+
+    Args:
+        iterable (Iterable[T]): the iterable
+        **kwargs: arguments passed to tqdm
+
+    Returns:
+        Iterable[T]: the iterable, with or without a progress bar
+    """
+    if os.environ.get(PROGRESS_ENV, "") in ("", "0"):
+        return iterable
+
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Rebuild call stacks from profiling stats, in the collapsed format of
+    flamegraph tools ("root;caller;callee"). cProfile only records time per
+    caller and callee pair, so the time of a function is split among the
+    stacks it is called from in proportion to the time each caller spent in
+    it. Recursive calls, direct or not, are folded into the first call.
+
+    Args:
+        stats (pstats.Stats): the stats
+
+    Returns:
+        dict[str, float]: the own time (in seconds) of each stack
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for func, (*_, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    stacks = defaultdict(float)
+
+    def walk(func, path: tuple[str, ...], seen: frozenset, own: float, total: float):
+        path = path + (_label(func),)
+        if own > 0:
+            stacks[";".join(path)] += own
+        cumulative = entries[func][3]
+        scale = total / cumulative if cumulative else 0.0
+        for callee, (_, _, tt, ct) in callees[func].items():
+            if callee in seen:
+                # the callees of a recursive call are already walked from its
+                # first call, only its own time is left to fold into it
+                first = path.index(_label(callee))
+                stacks[";".join(path[: first + 1])] += tt * scale
+                continue
+            if ct * scale < MIN_STACK_TIME:
+                continue
+            walk(callee, path, seen | {callee}, tt * scale, ct * scale)
+
+    for func, (_, nc, tt, ct, callers) in entries.items():
+        # roots are called from outside the profiled functions (e.g. by
+        # Profile.runcall), and may also call themselves recursively, whose
+        # own time is folded back in by walk
+        if nc > sum(edge[0] for edge in callers.values()):
+            own = tt - sum(edge[2] for edge in callers.values())
+            walk(func, (), frozenset([func]), own, ct)
+    return dict(stacks)
+
+
+def save_profile(stats: pstats.Stats, path: Path):
+    """
+    Save profiling stats as a .pstats file, and their collapsed stacks as a
+    .folded file (one "stack microseconds" line per stack), which flamegraph
+    tools such as flamegraph.pl or speedscope read.
+
+    Args:
+        stats (pstats.Stats): the stats
+        path (Path): the path of the files, without suffix
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(path.with_suffix(".pstats"))
+    stacks = collapsed_stacks(stats)
+    with open(path.with_suffix(".folded"), "w") as f:
+        for stack, own in sorted(stacks.items()):
+            if round(own * 1e6):
+                f.write(f"{stack} {round(own * 1e6)}\n")
+    LOGGER.info(f"Profile saved to {path.with_suffix('.pstats').absolute()}.")
+
+
+@dataclass
+class Allocation:
+    """
+    Memory allocated by a source line and still in use at the time of a
+    snapshot.
+    """
+
+    site: str
+    size: int
+    count: int
+
+
+@dataclass
+class Memory:
+    """
+    Memory usage of a phase: the peak size (in bytes) of the memory allocated
+    through Python during the phase, and the largest allocation sites when
+    the phase was closest to its peak.
+    """
+
+    peak: int
+    sites: list[Allocation]
+
+
+class _PeakWatcher(threading.Thread):
+    """
+    Thread polling the traced memory, which takes a snapshot of the allocated
+    memory each time it grew by SNAPSHOT_GROWTH since the last snapshot, so
+    that the last snapshot is taken close to the peak.
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._size = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._size * (1 + SNAPSHOT_GROWTH):
+                self.snapshot = tracemalloc.take_snapshot()
+                self._size = current
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def trace_memory(fn: Callable[[], Any], top: int = 5, interval: float = 0.01) -> Memory:
+    """
+    Run fn once while tracing memory allocations with tracemalloc. The peak
+    is exact, but allocation sites are sampled every interval seconds, so
+    they are those of the last snapshot before the peak (or of the memory
+    still in use at the end, for phases too short to be sampled). Tracing
+    slows fn down several times, so it should not be timed at the same time.
+    If memory is already being traced, tracing goes on afterwards and the
+    caller's traces are kept, fn's usage being measured against them.
+
+    Args:
+        fn (Callable[[], Any]): the phase to run
+        top (int, optional): number of allocation sites. Defaults to 5.
+        interval (float, optional): sampling interval (in seconds). Defaults
+        to 0.01.
+
+    Returns:
+        Memory: the phase's memory usage
+    """
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # keep the caller's traces, and only count what fn adds to them
+        baseline = tracemalloc.take_snapshot()
+    else:
+        baseline = None
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+
+    watcher = _PeakWatcher(interval)
+    watcher.start()
+    try:
+        fn()
+        end = tracemalloc.take_snapshot()
+    finally:
+        watcher.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+
+    snapshot = (watcher.snapshot or end).filter_traces(_TRACE_FILTERS)
+    if baseline is None:
+        stats = [(s.traceback, s.size, s.count) for s in snapshot.statistics("lineno")]
+    else:
+        diffs = snapshot.compare_to(baseline.filter_traces(_TRACE_FILTERS), "lineno")
+        stats = [(d.traceback, d.size_diff, d.count_diff) for d in diffs]
+        stats = [stat for stat in stats if stat[1] > 0]
+    sites = [
+        Allocation(
+            f"{Path(traceback[0].filename).name}:{traceback[0].lineno}",
+            size,
+            count,
+        )
+        for traceback, size, count in stats[:top]
+    ]
+    return Memory(peak - start, sites)
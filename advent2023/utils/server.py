@@ -0,0 +1,188 @@
+import json
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import monotonic
+from urllib.parse import parse_qs
+
+LOGGER = logging.getLogger(__name__)
+
+# Paths served, /<year>/day/<day>/<input|answer>
+PATH = re.compile(r"^/(\d+)/day/(\d+)/(input|answer)$")
+
+# Response texts of the AOC server
+NOT_LOGGED_IN = "Puzzle inputs differ by user.  Please log in to get your puzzle input."
+RIGHT = "That's the right answer!"
+WRONG = "That's not the right answer.  Please wait {:d} seconds before trying again."
+TOO_SOON = (
+    "You gave an answer too recently; you have to wait after submitting an answer"
+    " before trying again.  You have {:d}s left to wait."
+)
+WRONG_LEVEL = (
+    "You don't seem to be solving the right level.  Did you already complete it?"
+)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the AOC server, serving the /<year>/day/<day>/input
+    and /<year>/day/<day>/answer endpoints, so that downloading inputs and
+    submitting answers can be tested and benchmarked offline. Inputs are read
+    from inputs_dir, laid out like INPUTS_DIR, and answers are checked against
+    answers. Like the real server, it requires a session cookie, only accepts
+    part 2 once part 1 is solved, and makes clients wait after a wrong answer.
+    Input requests are answered 503, with each Retry-After header value in
+    busy in turn, before being served.
+
+    Use it as a context manager to serve from a background thread, and point
+    clients to it by setting the ADVENT_URL environment variable to its url.
+    """
+
+    def __init__(
+        self,
+        inputs_dir: Path,
+        answers: dict[tuple[int, int, int], str] | None = None,
+        wait: float = 60.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.inputs_dir = inputs_dir
+        self.answers = answers or {}
+        self.wait = wait
+        self.solved: set[tuple[int, int, int]] = set()
+        self.cooldowns: dict[tuple[int, int], float] = {}
+        # Retry-After header values of the next input requests, answered 503
+        self.busy: list[str] = []
+        # method and path of each request received
+        self.requests: list[tuple[str, str]] = []
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self._thread.join()
+        self.server_close()
+
+    def get_input(self, year: int, day: int) -> str | None:
+        path = self.inputs_dir / f"{year}_{day:02d}.txt"
+        return path.read_text() if path.is_file() else None
+
+    def check_answer(self, year: int, day: int, part: int, answer: str) -> str:
+        """
+        Check an answer, the way the AOC server does.
+
+        Args:
+            year (int): the year
+            day (int): the day
+            part (int): the part
+            answer (str): the answer
+
+        Returns:
+            str: the server's response text
+        """
+        with self.lock:
+            left = self.cooldowns.get((year, day), 0) - monotonic()
+            if left > 0:
+                return TOO_SOON.format(int(left) + 1)
+            if (year, day, part) in self.solved or (
+                part == 2 and (year, day, 1) not in self.solved
+            ):
+                return WRONG_LEVEL
+            if self.answers.get((year, day, part)) == answer:
+                self.solved.add((year, day, part))
+                return RIGHT
+            self.cooldowns[(year, day)] = monotonic() + self.wait
+            return WRONG.format(round(self.wait))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self):
+        match = self._route("input")
+        if match is None:
+            return
+        with self.server.lock:
+            retry_after = self.server.busy.pop(0) if self.server.busy else None
+        if retry_after is not None:
+            self._send(503, "Service Unavailable", {"Retry-After": retry_after})
+            return
+        text = self.server.get_input(*match)
+        if text is None:
+            self._send(404, "404 Not Found")
+        else:
+            self._send(200, text)
+
+    def do_POST(self):
+        match = self._route("answer")
+        if match is None:
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        try:
+            part = int(form["level"][0])
+            answer = form["answer"][0]
+        except (KeyError, ValueError):
+            self._send(400, "Bad Request")
+            return
+        text = self.server.check_answer(*match, part, answer)
+        self._send(200, f"<main><article><p>{text}</p></article></main>")
+
+    def _route(self, endpoint: str) -> tuple[int, int] | None:
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+        match = PATH.match(self.path)
+        if match is None or match.group(3) != endpoint:
+            self._send(404, "404 Not Found")
+            return None
+        if "session=" not in self.headers.get("Cookie", ""):
+            self._send(400, NOT_LOGGED_IN)
+            return None
+        return int(match.group(1)), int(match.group(2))
+
+    def _send(self, status: int, text: str, headers: dict[str, str] | None = None):
+        body = text.encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        LOGGER.debug(format % args)
+
+
+def load_answers(path: Path) -> dict[tuple[int, int, int], str]:
+    """
+    Load the answers checked by a stand-in server from a json file, holding
+    the answers by year, day and part, e.g. {"2023": {"1": {"1": "142"}}}.
+
+    Args:
+        path (Path): the json file
+
+    Returns:
+        dict[tuple[int, int, int], str]: the answers, by (year, day, part)
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {
+        (int(year), int(day), int(part)): str(answer)
+        for year, days in data.items()
+        for day, parts in days.items()
+        for part, answer in parts.items()
+    }
@@ -0,0 +1,176 @@
+import os
+import weakref
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+T = TypeVar("T")
+
+# Segments attached by the current process, by name
+_attached: dict[str, tuple[SharedMemory, npt.NDArray]] = {}
+# Data of the tasks of the current worker process, set up when it starts
+_worker_data: Any = None
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """
+    Handle of a numpy array placed in a shared memory segment, which is all
+    that needs to be sent to another process for it to use the array.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedArrays:
+    """
+    Owner of the shared memory segments holding arrays shared with other
+    processes. Segments are closed and unlinked when the owner is closed (at
+    the latest when exiting its context), or when it is garbage collected,
+    so that they never outlive the process that created them.
+    """
+
+    def __init__(self) -> None:
+        self._segments: list[SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _unlink, self._segments)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def share(self, array: npt.ArrayLike) -> SharedArray:
+        """
+        Copy an array into a new shared memory segment.
+
+        Args:
+            array (npt.ArrayLike): the array
+
+        Returns:
+            SharedArray: the handle of the shared array
+        """
+        array = np.ascontiguousarray(array)
+        # segments cannot be empty
+        segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(segment)
+        np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+        return SharedArray(segment.name, array.shape, array.dtype.str)
+
+    def close(self):
+        self._finalizer()
+
+
+def _unlink(segments: list[SharedMemory]):
+    while segments:
+        segment = segments.pop()
+        segment.close()
+        segment.unlink()
+
+
+def attach(handle: SharedArray) -> npt.NDArray:
+    """
+    Get a read-only view of a shared array, attaching to its segment by name
+    the first time the current process uses it. The array is not copied.
+
+    Args:
+        handle (SharedArray): the handle of the shared array
+
+    Returns:
+        npt.NDArray: the array
+    """
+    if handle.name not in _attached:
+        segment = SharedMemory(handle.name)
+        array = np.ndarray(handle.shape, handle.dtype, buffer=segment.buf)
+        array.flags.writeable = False
+        _attached[handle.name] = segment, array
+    return _attached[handle.name][1]
+
+
+def pack_lines(
+    lines: Sequence[str],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]:
+    """
+    Pack lines into a single buffer of utf-8 bytes, along with the offsets of
+    the lines in the buffer, so that they can be shared as two arrays.
+
+    Args:
+        lines (Sequence[str]): the lines
+
+    Returns:
+        tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]: the buffer, and
+        the start offset of each line followed by the buffer's length
+    """
+    encoded = [line.encode() for line in lines]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(line) for line in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_line(
+    buffer: npt.NDArray[np.uint8], offsets: npt.NDArray[np.int64], index: int
+) -> str:
+    return buffer[offsets[index] : offsets[index + 1]].tobytes().decode()
+
+
+def map_shared(
+    fn: Callable[..., T],
+    arrays: dict[str, npt.ArrayLike],
+    tasks: Iterable[tuple],
+    jobs: int | None = None,
+    setup: Callable[[dict[str, npt.NDArray]], Any] | None = None,
+) -> list[T]:
+    """
+    Run fn(data, *task) for each task in a pool of processes. The arrays are
+    placed in shared memory once, and each worker attaches to them by name
+    when it starts, so that tasks only carry their own arguments (e.g. a few
+    integers) rather than a copy of the arrays each. data is the dict of the
+    attached arrays, or what setup returns for it, which each worker calls
+    once (e.g. to build a lookup table from the arrays). fn and setup must
+    be picklable, i.e. module-level functions. The segments are unlinked
+    once the tasks are done, or one of them failed.
+
+    Args:
+        fn (Callable[..., T]): the task function
+        arrays (dict[str, npt.ArrayLike]): the arrays to share, by name
+        tasks (Iterable[tuple]): the arguments of each task
+        jobs (int | None, optional): number of processes. Defaults to None,
+        i.e. the number of CPUs.
+        setup (Callable[[dict[str, npt.NDArray]], Any] | None, optional):
+        builds the data of the tasks of a worker from the arrays. Defaults to
+        None.
+
+    Returns:
+        list[T]: the result of each task, in order
+    """
+    tasks = list(tasks)
+    jobs = min(jobs or os.cpu_count(), max(len(tasks), 1))
+    # a few chunks per worker, to balance tasks of uneven lengths
+    chunksize = max(len(tasks) // (jobs * 4), 1)
+    with SharedArrays() as shared:
+        handles = {key: shared.share(array) for key, array in arrays.items()}
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(handles, setup)
+        ) as pool:
+            return list(pool.map(partial(_run, fn), tasks, chunksize=chunksize))
+
+
+def _init_worker(
+    handles: dict[str, SharedArray],
+    setup: Callable[[dict[str, npt.NDArray]], Any] | None,
+):
+    global _worker_data
+    arrays = {key: attach(handle) for key, handle in handles.items()}
+    _worker_data = setup(arrays) if setup is not None else arrays
+
+
+def _run(fn: Callable[..., T], task: tuple) -> T:
+    return fn(_worker_data, *task)
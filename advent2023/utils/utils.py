@@ -1,10 +1,17 @@
 import logging
-import re
+import mmap
+import os
 import sys
+import tempfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 
 import requests
 
+from advent2023.utils import cache
+from advent2023.utils.ledger import Ledger, SubmissionQueue
+
 # Setup basic logging on import
 LOGGER = logging.getLogger(__name__)
 logging.basicConfig(
@@ -12,28 +19,160 @@ logging.basicConfig(
 )
 
 
-# AOC server url
-URL = "https://adventofcode.com/{:d}/day/{:d}/{:s}"
+# AOC server url, which URL_ENV overrides (e.g. with a local stand-in server)
+DEFAULT_URL = "https://adventofcode.com"
+URL = "{:s}/{:d}/day/{:d}/{:s}"
+URL_ENV = "ADVENT_URL"
+# Environment variable holding the session cookie, used before SESSION_FILE
+SESSION_ENV = "ADVENT_SESSION"
 
 # Paths for inputs dir and session cookie
 ROOT_DIR = Path().parent.parent.parent
 INPUTS_DIR = ROOT_DIR / "inputs"
+CACHE_DIR = ROOT_DIR / ".cache"
 SESSION_FILE = ROOT_DIR / ".secret-session-cookie"
+LEDGER_FILE = ROOT_DIR / "ledger.json"
+
+NEWLINE = ord("\n")
+WHITESPACE = b" \t\n\r\x0b\x0c"
+
+# Number of characters read at once when streaming an input file
+STREAM_BUFFER = 1 << 20
+
+
+def split_lines(input: str) -> list[str]:
+    """
+    Split input text into a list of stripped lines.
+
+    Args:
+        input (str): the input text
+
+    Returns:
+        list[str]: the input lines
+    """
+    return list(map(lambda l: l.strip(), input.rstrip("\n").split("\n")))
+
+
+def read_records(
+    path: Path, sep: str = "\n", buffer_size: int = STREAM_BUFFER
+) -> Iterator[str]:
+    """
+    Stream the records of a file, separated by sep, stripped of leading and
+    trailing whitespace. The file is read buffer_size characters at a time,
+    so memory use does not grow with the size of the file. Like split_lines,
+    blank records at the end of the file are left out.
+
+    Args:
+        path (Path): the file
+        sep (str, optional): the record separator. Defaults to "\n".
+        buffer_size (int, optional): characters read at once. Defaults to
+        STREAM_BUFFER.
+
+    Yields:
+        Iterator[str]: the records
+    """
+    blanks = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for record in _split_chunks(f, sep, buffer_size):
+            record = record.strip()
+            if not record:
+                blanks += 1
+                continue
+            for _ in range(blanks):
+                yield ""
+            blanks = 0
+            yield record
+
+
+def _split_chunks(f, sep: str, buffer_size: int) -> Iterator[str]:
+    rest = ""
+    while chunk := f.read(buffer_size):
+        *records, rest = (rest + chunk).split(sep)
+        yield from records
+    yield rest
+
+
+def url(year: int, day: int, path: str) -> str:
+    return URL.format(os.environ.get(URL_ENV, DEFAULT_URL), year, day, path)
+
+
+def get_session(pool_size: int = 1) -> requests.Session:
+    """
+    Setup a requests session with the secret session cookie, read from the
+    ADVENT_SESSION environment variable or from SESSION_FILE. The session
+    keeps up to pool_size connections open to the server.
+
+    Args:
+        pool_size (int, optional): size of the connection pool. Defaults to 1.
+
+    Raises:
+        FileNotFoundError: if the session cookie file cannot be read
+
+    Returns:
+        requests.Session: the session
+    """
+    session = os.environ.get(SESSION_ENV, "")
+    if not session and SESSION_FILE.is_file():
+        with open(SESSION_FILE, "r") as f:
+            session = f.read().rstrip()
+
+    if not session:
+        error = f"Unable to read session cookie info. {SESSION_FILE.absolute()} is not a file."
+        LOGGER.critical(error)
+        raise FileNotFoundError(error)
+
+    S = requests.Session()
+    S.headers[
+        "User-Agent"
+    ] = "github.com/jonasrenault/advent2023 by jonasrenault@gmail.com"
+    S.cookies.set("session", session)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    S.mount("http://", adapter)
+    S.mount("https://", adapter)
+    LOGGER.info("Session cookie loaded.")
+    return S
+
+
+def check_response(r: requests.Response) -> str:
+    """
+    Check that the server answered a request, and return the response's text.
+
+    Args:
+        r (requests.Response): the response
+
+    Raises:
+        requests.HTTPError: if the request failed or the session was rejected
+
+    Returns:
+        str: the response's text
+    """
+    if r.status_code != 200 or "please identify yourself" in r.text.lower():
+        error = f"An error occured while requesting server: {r.status_code}, {r.url}"
+        LOGGER.critical(error)
+        LOGGER.critical("Did you remember to log in and update your session cookie ?")
+        raise requests.HTTPError(error, response=r)
+    return r.text
 
 
 class Advent:
     year: int
     day: int
-    session = ""
-    S = requests.Session()
 
-    def __init__(self, day: int, year: int = 2023) -> None:
+    def __init__(
+        self, day: int, year: int = 2023, queue: SubmissionQueue | None = None
+    ) -> None:
         """
-        Save year and day and setup requests session with secret cookie.
+        Save year and day. The requests session used to talk to the AOC server
+        is only created (and the session cookie only read) when an input needs to
+        be downloaded or an answer submitted. The input file is only read once,
+        on first access. Answers are submitted through queue, which can be
+        shared between days, or through a queue of their own.
 
         Args:
             day (int): the day
             year (int, optional): the year. Defaults to 2023.
+            queue (SubmissionQueue | None, optional): the submission queue.
+            Defaults to None.
 
         Raises:
             ValueError: if day and/or year is invalid
@@ -45,20 +184,41 @@ class Advent:
 
         self.year = year
         self.day = day
-        self.S.headers[
-            "User-Agent"
-        ] = "github.com/jonasrenault/advent2023 by jonasrenault@gmail.com"
+        self._session: requests.Session | None = None
+        self._buffer: mmap.mmap | bytes | None = None
+        self._queue = queue
 
-        if SESSION_FILE.is_file():
-            with open(SESSION_FILE, "r") as f:
-                self.session = f.read().rstrip()
-                self.S.cookies.set("session", self.session)
+    @property
+    def S(self) -> requests.Session:
+        """
+        Requests session with secret cookie, created on first use.
 
-        if not self.session:
-            error = f"Unable to read session cookie info. {SESSION_FILE.absolute()} is not a file."
-            LOGGER.critical(error)
-            raise FileNotFoundError(error)
-        LOGGER.info("Session cookie loaded.")
+        Raises:
+            FileNotFoundError: if the session cookie file cannot be read
+
+        Returns:
+            requests.Session: the session
+        """
+        if self._session is None:
+            self._session = get_session()
+        return self._session
+
+    @property
+    def queue(self) -> SubmissionQueue:
+        """
+        Submission queue, backed by the answer ledger in LEDGER_FILE, created
+        on first use if none was given.
+
+        Returns:
+            SubmissionQueue: the queue
+        """
+        if self._queue is None:
+            self._queue = SubmissionQueue(Ledger(LEDGER_FILE))
+        return self._queue
+
+    @property
+    def input_file(self) -> Path:
+        return INPUTS_DIR / "{}_{:02d}.txt".format(self.year, self.day)
 
     def get_input(self) -> str:
         """
@@ -67,41 +227,94 @@ class Advent:
         Returns:
             str: the input as text
         """
-        if not INPUTS_DIR.is_dir():
-            INPUTS_DIR.mkdir(exist_ok=True)
-            LOGGER.info(f"Created inputs directory {INPUTS_DIR.absolute()}.")
+        return str(self.get_input_bytes(), "utf-8")
 
-        input_file = INPUTS_DIR / "{}_{:02d}.txt".format(self.year, self.day)
+    def get_input_bytes(self) -> memoryview:
+        """
+        Get the input as a read-only view of the memory-mapped input file,
+        downloading it first if needed. The file is only mapped once per
+        instance, so repeated calls do not read it again.
 
-        try:
-            with open(input_file, "r") as f:
-                input = f.read()
+        Returns:
+            memoryview: the input bytes
+        """
+        if self._buffer is None:
+            if not self.input_file.is_file():
+                self._download_input()
+            with open(self.input_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self._buffer = b""
             LOGGER.info(f"Read input from disk for {self.year} day {self.day:02d}.")
-            return input
-        except FileNotFoundError:
-            pass
+        return memoryview(self._buffer)
 
+    def iter_lines(self) -> Iterator[memoryview]:
+        """
+        Iterate over the input lines as slices of the input bytes, stripped of
+        leading and trailing whitespace, without copying them.
+
+        Yields:
+            Iterator[memoryview]: the input lines
+        """
+        view = self.get_input_bytes()
+        buffer = self._buffer
+        end = len(buffer)
+        while end and buffer[end - 1] == NEWLINE:
+            end -= 1
+
+        start = 0
+        while start <= end:
+            stop = buffer.find(b"\n", start, end)
+            if stop == -1:
+                stop = end
+            first, last = start, stop
+            while first < last and buffer[first] in WHITESPACE:
+                first += 1
+            while last > first and buffer[last - 1] in WHITESPACE:
+                last -= 1
+            yield view[first:last]
+            start = stop + 1
+
+    def stream_records(self, sep: str = "\n") -> Iterator[str]:
+        """
+        Stream the input records (lines by default) from a buffered reader of
+        the input file, downloading it first if needed, rather than mapping
+        the whole file. Each call reads the file again.
+
+        Args:
+            sep (str, optional): the record separator. Defaults to "\n".
+
+        Returns:
+            Iterator[str]: the input records
+        """
+        if not self.input_file.is_file():
+            self._download_input()
+        return read_records(self.input_file, sep)
+
+    def _download_input(self):
         LOGGER.info(f"Downloading input for {self.year} day {self.day:02d}.")
-        r = self.S.get(URL.format(self.year, self.day, "input"))
-        res = self._check_and_get_text(r)
+        r = self.S.get(url(self.year, self.day, "input"))
+        self.save_input(check_response(r))
 
-        with open(input_file, "w") as f:
-            f.write(res)
+    def save_input(self, text: str):
+        """
+        Save the input to its file in INPUTS_DIR. The input is written to a
+        temporary file first and then moved into place, so that concurrent
+        downloads or readers never see a partial input.
 
-        LOGGER.info(f"Input saved to {input_file.absolute()}.")
-        return res
+        Args:
+            text (str): the input
+        """
+        if not INPUTS_DIR.is_dir():
+            INPUTS_DIR.mkdir(exist_ok=True)
+            LOGGER.info(f"Created inputs directory {INPUTS_DIR.absolute()}.")
 
-    def _check_and_get_text(self, r: requests.Response):
-        if r.status_code != 200 or "please identify yourself" in r.text.lower():
-            error = (
-                f"An error occured while requesting server: {r.status_code}, {r.url}"
-            )
-            LOGGER.critical(error)
-            LOGGER.critical(
-                "Did you remember to log in and update your session cookie ?"
-            )
-            raise requests.HTTPError(error)
-        return r.text
+        fd, tmp = tempfile.mkstemp(dir=INPUTS_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.input_file)
+        LOGGER.info(f"Input saved to {self.input_file.absolute()}.")
 
     def get_input_lines(self) -> list[str]:
         """
@@ -110,13 +323,35 @@ class Advent:
         Returns:
             list[str]: the input lines
         """
-        input = self.get_input()
-        lines = list(map(lambda l: l.strip(), input.rstrip("\n").split("\n")))
-        return lines
+        return [str(line, "utf-8") for line in self.iter_lines()]
+
+    def get_parsed(self, parse: Callable[[memoryview], Any], version: str) -> Any:
+        """
+        Parse the input bytes, or load them from the parsed input cache in
+        CACHE_DIR if they were already parsed by the same version of the parser.
+
+        Args:
+            parse (Callable[[memoryview], Any]): the parser
+            version (str): the parser version
+
+        Returns:
+            Any: the parsed input
+        """
+        data = self.get_input_bytes()
+        path = CACHE_DIR / cache.cache_key(self.year, self.day, version, data)
+        parsed = cache.load(path)
+        if parsed is not None:
+            LOGGER.info(f"Loaded parsed input from cache for day {self.day:02d}.")
+            return parsed
+
+        parsed = parse(data)
+        cache.save(path, parsed)
+        return parsed
 
     def submit(self, part: int, answer) -> bool:
         """
-        Submit answer for part.
+        Submit answer for part, through the submission queue, which settles
+        answers already known to be right or wrong without asking the server.
 
         Args:
             part (int): the part
@@ -125,28 +360,22 @@ class Advent:
         Returns:
             bool: True if answer is correct, False otherwise.
         """
-        LOGGER.info(f"Submitting answer for day {self.day:02d} PART {part}: {answer}.")
+        return self.queue.submit(self, part, answer)
+
+    def post_answer(self, part: int, answer) -> str:
+        """
+        Post answer for part to the server.
+
+        Args:
+            part (int): the part
+            answer (_type_): the answer
 
+        Returns:
+            str: the server's response text
+        """
+        LOGGER.info(f"Submitting answer for day {self.day:02d} PART {part}: {answer}.")
         r = self.S.post(
-            URL.format(self.year, self.day, "answer"),
+            url(self.year, self.day, "answer"),
             data={"level": part, "answer": answer},
         )
-        res = self._check_and_get_text(r).lower()
-        if "did you already complete it" in res:
-            LOGGER.info("Already completed or wrong day/part.")
-            return False
-
-        if "that's the right answer" in res:
-            LOGGER.info("Right answer.")
-            return True
-
-        if "you have to wait" in res:
-            matches = re.compile(r"you have ([\w ]+) left to wait").findall(res)
-            if matches:
-                LOGGER.info(f"Submitting too fast, {matches[0]} left to wait.")
-            else:
-                LOGGER.info(f"Submitting too fast.")
-            return False
-
-        LOGGER.info("Wrong answer.")
-        return False
+        return check_response(r)
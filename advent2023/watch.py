@@ -0,0 +1,205 @@
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from time import sleep
+from types import CodeType, ModuleType
+
+from advent2023.runner import Result, parse, print_results, result
+from advent2023.solvers import PARTS, get_solver
+from advent2023.utils.profiling import Timings, phase
+from advent2023.utils.utils import Advent
+
+LOGGER = logging.getLogger(__name__)
+
+# Delay (in seconds) between two polls of the watched files
+POLL_INTERVAL = 0.2
+
+# Functions which turn the input into the puzzle's data
+PARSERS = ("parse", "parse_bytes", "parse_line")
+
+
+def _names(code: CodeType) -> Iterable[str]:
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _names(const)
+
+
+def parser_digest(module: ModuleType) -> str:
+    """
+    Digest of the source of a day module's parser: its parse functions and
+    the module's functions, classes and constants they use, directly or not.
+    When a module is reloaded with the same digest, its parser did not
+    change, so data parsed by the previous version can be reused. Changes to
+    other modules are not taken into account.
+
+    Args:
+        module (ModuleType): the day module
+
+    Returns:
+        str: the digest
+    """
+    digest = hashlib.sha256()
+    names = [name for name in PARSERS if hasattr(module, name)]
+    seen = set(names)
+    while names:
+        name = names.pop()
+        obj = inspect.unwrap(getattr(module, name))
+        if inspect.isfunction(obj) or inspect.isclass(obj):
+            if obj.__module__ != module.__name__:
+                continue
+            digest.update(inspect.getsource(obj).encode())
+            codes = [obj.__code__] if inspect.isfunction(obj) else []
+            if inspect.isclass(obj):
+                codes = [
+                    f.__code__ for f in vars(obj).values() if inspect.isfunction(f)
+                ]
+            for code in codes:
+                for used in _names(code):
+                    if used not in seen and hasattr(module, used):
+                        seen.add(used)
+                        names.append(used)
+        elif not (inspect.ismodule(obj) or callable(obj)):
+            digest.update(f"{name}={obj!r}".encode())
+    return digest.hexdigest()
+
+
+class Watcher:
+    """
+    Keeps a day's solver, input and parsed input warm between runs, watching
+    the modification times of the day's module and input file. When the
+    input changes, it is parsed again. When the module changes, it is
+    reloaded, and the input is only parsed again if the parser changed.
+    """
+
+    def __init__(
+        self,
+        day: int,
+        parts: Iterable[int] = PARTS,
+        year: int = 2023,
+        cache: bool = True,
+    ) -> None:
+        self.day = day
+        self.parts = tuple(parts)
+        self.year = year
+        self.cache = cache
+        self.solver = get_solver(day)
+        self.advent = Advent(day, year)
+        self.advent.get_input_bytes()
+        self.data = None
+        self.digest = parser_digest(self.solver.module)
+        self.mtimes = self._mtimes()
+
+    @property
+    def module_file(self) -> Path:
+        return Path(self.solver.module.__file__)
+
+    def _mtimes(self) -> tuple[int, int]:
+        return (
+            self.module_file.stat().st_mtime_ns,
+            self.advent.input_file.stat().st_mtime_ns,
+        )
+
+    def changed(self) -> bool:
+        return self._mtimes() != self.mtimes
+
+    def reload(self):
+        """
+        Reload what changed since the last run.
+        """
+        module_mtime, input_mtime = self._mtimes()
+        # updated first, so that a module failing to reload is only reloaded
+        # again once it changes
+        previous, self.mtimes = self.mtimes, (module_mtime, input_mtime)
+        if input_mtime != previous[1]:
+            LOGGER.info(f"Input for day {self.day:02d} changed.")
+            self.advent = Advent(self.day, self.year)
+            self.data = None
+        if module_mtime != previous[0]:
+            LOGGER.info(f"Reloading {self.solver.module.__name__}.")
+            # bytecode is only checked against the source's mtime in seconds,
+            # so it could be stale after quick successive edits
+            pyc = importlib.util.cache_from_source(str(self.module_file))
+            Path(pyc).unlink(missing_ok=True)
+            importlib.reload(self.solver.module)
+            digest = parser_digest(self.solver.module)
+            if digest != self.digest:
+                self.data = None
+                self.digest = digest
+
+    def run(self) -> list[Result]:
+        """
+        Solve the parts, parsing the input first if it was not parsed yet.
+
+        Returns:
+            list[Result]: the answer and solving time for each part
+        """
+        with Timings() as timings:
+            if self.data is None:
+                with phase("parse"):
+                    self.data = parse(self.solver, self.advent, self.cache)
+                LOGGER.info(
+                    f"Parsed input for day {self.day:02d}"
+                    f" in {timings.phases['parse']:.3f}s."
+                )
+            else:
+                LOGGER.info(f"Reusing parsed input for day {self.day:02d}.")
+
+            results = []
+            for part in self.parts:
+                fn = self.solver.part(part)
+                if fn is None:
+                    continue
+                with phase(f"part{part}"):
+                    answer = fn(self.data)
+                results.append(result(self.day, part, answer, timings))
+        return results
+
+
+def watch(
+    days: Iterable[int],
+    parts: Iterable[int] = PARTS,
+    year: int = 2023,
+    cache: bool = True,
+    interval: float = POLL_INTERVAL,
+):
+    """
+    Solve the given days, then solve them again whenever their module or
+    input file changes, printing the answers and timings after each run,
+    until interrupted. Errors raised while reloading or solving a day are
+    logged, and the day is run again on its next change.
+
+    Args:
+        days (Iterable[int]): the days
+        parts (Iterable[int], optional): the parts to solve. Defaults to PARTS.
+        year (int, optional): the year. Defaults to 2023.
+        cache (bool, optional): use the parsed input cache. Defaults to True.
+        interval (float, optional): delay between two polls (in seconds).
+        Defaults to POLL_INTERVAL.
+    """
+    watchers = [Watcher(day, parts, year, cache) for day in days]
+    pending = list(watchers)
+    LOGGER.info("Watching for changes, press Ctrl-C to stop.")
+    try:
+        while True:
+            for watcher in pending:
+                try:
+                    print_results(watcher.run())
+                except Exception:
+                    LOGGER.exception(f"Day {watcher.day:02d} failed.")
+            sleep(interval)
+            pending = []
+            for watcher in watchers:
+                if not watcher.changed():
+                    continue
+                try:
+                    watcher.reload()
+                    pending.append(watcher)
+                except Exception:
+                    LOGGER.exception(f"Unable to reload day {watcher.day:02d}.")
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pytest
+
+from advent2023.utils import utils
+from advent2023.utils.server import StandInServer
+
+# Years and days of the inputs served by the stand-in server
+YEARS = (2022, 2023)
+DAYS = (1, 2, 3)
+# Answers checked by the stand-in server, by (year, day, part)
+ANSWERS = {(2023, 1, 1): "142", (2023, 1, 2): "281"}
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    served = tmp_path / "served"
+    served.mkdir()
+    for year in YEARS:
+        for day in DAYS:
+            (served / f"{year}_{day:02d}.txt").write_text(f"{year} {day}\n")
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path / "inputs")
+    with StandInServer(served, ANSWERS) as server:
+        monkeypatch.setenv(utils.URL_ENV, server.url)
+        monkeypatch.setenv(utils.SESSION_ENV, "offline")
+        yield server
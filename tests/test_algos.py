@@ -0,0 +1,299 @@
+import logging
+from collections import deque
+
+import numpy as np
+import pytest
+
+from advent2023.utils.algos import (
+    MAX_BUCKET_WEIGHT,
+    Cycle,
+    Graph,
+    bfs,
+    contract,
+    deltas_4,
+    deltas_8,
+    dijkstra,
+    find_cycle,
+    iterate,
+    reachable_in,
+)
+
+# Fingerprints of the states: none (Brent's algorithm), a hash, and a
+# constant which always collides
+FINGERPRINTS = [None, hash, lambda state: 0]
+FINGERPRINT_IDS = ["brent", "hashed", "collision"]
+
+
+def rho(x: int) -> int:
+    # 0, 1, 2, then 3, 4, 5, 6 repeating
+    return x + 1 if x < 6 else 3
+
+
+def rho_naive(n: int) -> int:
+    return n if n < 3 else 3 + (n - 3) % 4
+
+
+@pytest.mark.parametrize("fingerprint", FINGERPRINTS, ids=FINGERPRINT_IDS)
+def test_find_cycle(fingerprint):
+    assert find_cycle(rho, 0, fingerprint) == Cycle(3, 4, 3)
+    assert find_cycle(rho, 5, fingerprint) == Cycle(0, 4, 5)
+
+
+@pytest.mark.parametrize("fingerprint", FINGERPRINTS, ids=FINGERPRINT_IDS)
+def test_find_cycle_limit(fingerprint):
+    assert find_cycle(rho, 0, fingerprint, limit=2) is None
+    assert find_cycle(rho, 0, fingerprint, limit=100) == Cycle(3, 4, 3)
+    assert find_cycle(lambda x: x + 1, 0, fingerprint, limit=100) is None
+
+
+def test_find_cycle_collision(caplog: pytest.LogCaptureFixture):
+    # 0 and 4 share a fingerprint, and 4 repeats one period later
+    def fingerprint(x: int) -> int:
+        return 0 if x == 4 else x
+
+    with caplog.at_level(logging.WARNING):
+        assert find_cycle(rho, 0, fingerprint) == Cycle(3, 4, 3)
+    assert "collision" in caplog.text
+
+
+def test_find_cycle_arrays():
+    def step(a: np.ndarray) -> np.ndarray:
+        return np.roll(np.minimum(a + 1, 2), 1)
+
+    state = np.zeros(3, dtype=np.int64)
+    for fingerprint in (None, lambda a: hash(a.tobytes())):
+        cycle = find_cycle(step, state, fingerprint)
+        assert (cycle.start, cycle.period) == (2, 1)
+        assert np.array_equal(cycle.state, [2, 2, 2])
+
+
+@pytest.mark.parametrize("fingerprint", FINGERPRINTS, ids=FINGERPRINT_IDS)
+def test_iterate(fingerprint):
+    for n in range(20):
+        assert iterate(rho, 0, n, fingerprint) == rho_naive(n)
+    assert iterate(rho, 0, 10**12, fingerprint) == rho_naive(10**12)
+
+
+def bfs_naive(passable, sources, cutoff=None, diagonal=False) -> np.ndarray:
+    rows, cols = passable.shape
+    distances = np.full(passable.shape, -1, dtype=np.int64)
+    queue = deque()
+    for r, c in sources:
+        if passable[r, c] and distances[r, c] < 0:
+            distances[r, c] = 0
+            queue.append((r, c))
+    while queue:
+        r, c = queue.popleft()
+        if cutoff is not None and distances[r, c] >= cutoff:
+            continue
+        for dr, dc in deltas_8 if diagonal else deltas_4:
+            rr, cc = r + dr, c + dc
+            inside = 0 <= rr < rows and 0 <= cc < cols
+            if inside and passable[rr, cc] and distances[rr, cc] < 0:
+                distances[rr, cc] = distances[r, c] + 1
+                queue.append((rr, cc))
+    return distances
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("cutoff", [None, 0, 3])
+def test_bfs(cutoff: int | None, diagonal: bool):
+    rng = np.random.default_rng(0)
+    passable = rng.random((9, 13)) < 0.7
+    sources = [(0, 0), (4, 6), (8, 12), (4, 6)]
+    expected = bfs_naive(passable, sources, cutoff, diagonal)
+    assert np.array_equal(bfs(passable, sources, cutoff, diagonal), expected)
+
+
+def test_bfs_unreachable():
+    passable = np.array(
+        [
+            [True, False, True],
+            [True, False, True],
+        ]
+    )
+    distances = bfs(passable, [(0, 0)])
+    assert distances.tolist() == [[0, -1, -1], [1, -1, -1]]
+    # walls and no sources reach nothing
+    assert (bfs(passable, [(0, 1)]) == -1).all()
+    assert (bfs(passable, []) == -1).all()
+
+
+def test_reachable_in():
+    distances = np.array([0, 1, 2, 3, -1])
+    assert reachable_in(distances, 2).tolist() == [True, False, True, False, False]
+    assert reachable_in(distances, 3).tolist() == [False, True, False, True, False]
+
+
+def random_graph(nodes: int, edges: int, weights: np.ndarray) -> Graph:
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, nodes, edges)
+    targets = rng.integers(0, nodes, edges)
+    return Graph.from_edges(nodes, sources, targets, weights)
+
+
+def bellman_ford(graph: Graph, sources: list[int]) -> np.ndarray:
+    dist = np.full(graph.nodes, np.inf)
+    dist[sources] = 0
+    edges = [
+        (u, graph.indices[e], graph.weights[e])
+        for u in range(graph.nodes)
+        for e in range(graph.indptr[u], graph.indptr[u + 1])
+    ]
+    for _ in range(graph.nodes):
+        for u, v, w in edges:
+            dist[v] = min(dist[v], dist[u] + w)
+    return np.where(np.isinf(dist), -1, dist)
+
+
+# Edge weights of the bucket queue (small ints) and of the heap (large ints
+# and floats)
+WEIGHTS = {
+    "bucket": np.random.default_rng(1).integers(0, 10, 120),
+    "heap": np.random.default_rng(1).integers(0, 10, 120) * MAX_BUCKET_WEIGHT,
+    "float": np.random.default_rng(1).random(120) * 10,
+}
+
+
+@pytest.mark.parametrize("weights", WEIGHTS.values(), ids=WEIGHTS.keys())
+def test_dijkstra(weights: np.ndarray):
+    graph = random_graph(40, 120, weights)
+    for sources in ([0], [0, 7, 21]):
+        distances = dijkstra(graph, sources)
+        assert distances.dtype == (float if weights.dtype == float else np.int64)
+        assert np.allclose(distances, bellman_ford(graph, sources))
+
+
+def grid_graph(rows: int, cols: int, weights: np.ndarray) -> Graph:
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in deltas_4:
+                if 0 <= r + dr < rows and 0 <= c + dc < cols:
+                    edges.append((r * cols + c, (r + dr) * cols + c + dc))
+    src, dst = np.array(edges).T
+    return Graph.from_edges(rows * cols, src, dst, weights[dst])
+
+
+@pytest.mark.parametrize("weights", WEIGHTS.values(), ids=WEIGHTS.keys())
+@pytest.mark.parametrize("float_heuristic", [False, True])
+def test_astar(weights: np.ndarray, float_heuristic: bool):
+    # entering a cell costs at least 1, so the manhattan distance to the
+    # bottom right corner is a consistent heuristic
+    rows, cols = 10, 12
+    graph = grid_graph(rows, cols, 1 + weights)
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    heuristic = (rows - 1 - r) + (cols - 1 - c)
+    if float_heuristic:
+        heuristic = heuristic.astype(float)
+    target = rows * cols - 1
+
+    expected = dijkstra(graph, [0])
+    distances = dijkstra(graph, [0], [target], heuristic)
+    assert np.isclose(distances[target], expected[target])
+    # the search stops at the target, before settling every node
+    assert (distances == -1).any()
+    settled = distances >= 0
+    assert np.allclose(distances[settled], expected[settled])
+
+
+def test_dijkstra_wrap():
+    # distances along the chain go far past the number of buckets, which
+    # wraps around the circular queue
+    nodes = 50
+    weights = np.arange(nodes - 1) % 2 * MAX_BUCKET_WEIGHT
+    graph = Graph.from_edges(nodes, np.arange(nodes - 1), np.arange(1, nodes), weights)
+    expected = np.concatenate(([0], np.cumsum(weights)))
+    assert dijkstra(graph, [0]).tolist() == expected.tolist()
+    heuristic = expected[-1] - expected
+    distances = dijkstra(graph, [0], [nodes - 1], heuristic)
+    assert distances.tolist() == expected.tolist()
+
+
+def test_dijkstra_unreachable():
+    graph = Graph.from_edges(4, [0, 1], [1, 0], [1, 1])
+    assert dijkstra(graph, [0]).tolist() == [0, 1, -1, -1]
+    assert dijkstra(graph, [3], [0]).tolist() == [-1, -1, -1, 0]
+    empty = Graph.from_edges(2, [], [], np.zeros(0, dtype=np.int64))
+    assert dijkstra(empty, [1]).tolist() == [-1, 0]
+
+
+def edge_list(graph: Graph) -> list[tuple[int, int, int]]:
+    return sorted(
+        (u, int(graph.indices[e]), int(graph.weights[e]))
+        for u in range(graph.nodes)
+        for e in range(graph.indptr[u], graph.indptr[u + 1])
+    )
+
+
+def undirected(nodes: int, edges: list[tuple[int, int, int]]) -> Graph:
+    src, dst, weights = np.array(edges + [(v, u, w) for u, v, w in edges]).T
+    return Graph.from_edges(nodes, src, dst, weights)
+
+
+def test_contract():
+    # a path with a branch at 2, and an isolated node 6
+    graph = undirected(7, [(0, 1, 1), (1, 2, 2), (2, 3, 3), (3, 4, 4), (2, 5, 5)])
+    contracted, nodes = contract(graph)
+    assert nodes.tolist() == [0, 2, 4, 5]
+    assert edge_list(contracted) == [
+        (0, 1, 3),
+        (1, 0, 3),
+        (1, 2, 7),
+        (1, 3, 5),
+        (2, 1, 7),
+        (3, 1, 5),
+    ]
+
+    contracted, nodes = contract(graph, keep=[3])
+    assert nodes.tolist() == [0, 2, 3, 4, 5]
+    assert (1, 2, 3) in edge_list(contracted)
+    assert (2, 3, 4) in edge_list(contracted)
+
+
+def test_contract_directed():
+    # the corridor 0 -> 1 -> 2 -> 3 can only be walked one way
+    graph = Graph.from_edges(4, [0, 1, 2], [1, 2, 3], [1, 1, 1])
+    contracted, nodes = contract(graph)
+    assert nodes.tolist() == [0, 3]
+    assert edge_list(contracted) == [(0, 1, 3)]
+
+    # 1 cannot be walked through from either end
+    graph = Graph.from_edges(3, [0, 2], [1, 1], [1, 1])
+    contracted, nodes = contract(graph)
+    assert nodes.tolist() == [0, 2]
+    assert edge_list(contracted) == []
+
+
+def test_contract_float_weights():
+    graph = Graph.from_edges(
+        4, [0, 1, 1, 2, 2, 3], [1, 0, 2, 1, 3, 2], [1.5, 1.5, 2.0, 2.0, 1.0, 1.0]
+    )
+    contracted, nodes = contract(graph, keep=(0, 3))
+    assert nodes.tolist() == [0, 3]
+    assert contracted.weights.dtype == graph.weights.dtype
+    assert contracted.weights.tolist() == [4.5, 4.5]
+
+    # no corridor leaves the kept nodes
+    contracted, nodes = contract(Graph.from_edges(2, [], [], np.zeros(0)), keep=[1])
+    assert nodes.tolist() == [1]
+    assert contracted.weights.dtype == np.float64
+
+
+def test_contract_distances():
+    passable = np.random.default_rng(3).random((10, 10)) < 0.6
+    cells = list(zip(*np.nonzero(passable)))
+    index = {cell: i for i, cell in enumerate(cells)}
+    edges = [
+        (index[r, c], index[r + dr, c + dc], 1)
+        for r, c in cells
+        for dr, dc in ((0, 1), (1, 0))
+        if (r + dr, c + dc) in index
+    ]
+    graph = undirected(len(cells), edges)
+    contracted, nodes = contract(graph, keep=[0])
+    assert nodes[0] == 0 and len(nodes) < len(cells)
+
+    # distances between the remaining nodes are kept
+    expected = dijkstra(graph, [0])[nodes]
+    assert np.array_equal(dijkstra(contracted, [0]), expected)
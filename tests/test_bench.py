@@ -0,0 +1,63 @@
+from typing import Any
+
+import pytest
+
+from advent2023.bench import Regression, compare
+
+
+def timing(median: float, peak: int | None = None) -> dict[str, Any]:
+    t = {"min": median, "median": median, "p95": median, "peak_rss": 0}
+    if peak is not None:
+        t["memory"] = {"peak": peak, "sites": []}
+    return t
+
+
+def report(results: dict[str, dict[str, dict[str, Any]]]) -> dict[str, Any]:
+    return {"meta": {}, "results": results}
+
+
+def test_compare_threshold():
+    baseline = report({"01": {"parse": timing(1.0), "part1": timing(2.0)}})
+    # exactly at the threshold is not a regression
+    current = report({"01": {"parse": timing(1.25), "part1": timing(2.5)}})
+    assert compare(current, baseline, threshold=0.25) == []
+
+    current = report({"01": {"parse": timing(1.26), "part1": timing(2.0)}})
+    assert compare(current, baseline, threshold=0.25) == [
+        Regression(1, "parse", 1.0, 1.26)
+    ]
+    assert compare(current, baseline, threshold=0.3) == []
+    # faster phases never regress
+    assert compare(report({"01": {"parse": timing(0.1)}}), baseline, 0) == []
+
+
+def test_compare_missing():
+    baseline = report({"01": {"parse": timing(1.0)}})
+    current = report(
+        {
+            "01": {"parse": timing(1.0), "part1": timing(9.0)},
+            "02": {"parse": timing(9.0)},
+        }
+    )
+    assert compare(current, baseline) == []
+    # phases of the baseline missing from the report are ignored too
+    assert compare(report({}), baseline) == []
+
+
+def test_compare_memory():
+    baseline = report({"01": {"part1": timing(1.0, 100)}})
+    current = report({"01": {"part1": timing(2.0, 200)}})
+    regressions = compare(current, baseline)
+    assert regressions == [
+        Regression(1, "part1", 1.0, 2.0),
+        Regression(1, "part1", 100, 200, "memory"),
+    ]
+    assert [r.ratio for r in regressions] == [2.0, 2.0]
+    assert compare(report({"01": {"part1": timing(1.0, 110)}}), baseline) == []
+
+
+@pytest.mark.parametrize("current, base", [(200, None), (None, 100), (None, None)])
+def test_compare_memory_missing(current: int | None, base: int | None):
+    # memory is only compared when both reports measured it
+    baseline = report({"01": {"part1": timing(1.0, base)}})
+    assert compare(report({"01": {"part1": timing(1.0, current)}}), baseline) == []
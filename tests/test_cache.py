@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from advent2023.utils import cache, utils
+from advent2023.utils.grid import Grid
+
+
+def entries(directory: Path) -> list[str]:
+    return sorted(file.name for file in directory.iterdir())
+
+
+def test_cache_key():
+    key = cache.cache_key(2023, 5, "abc", b"input")
+    assert key.startswith(f"2023_05_{cache.FORMAT}_abc_")
+    assert key == cache.cache_key(2023, 5, "abc", memoryview(b"input"))
+    assert key != cache.cache_key(2023, 5, "abd", b"input")
+    assert key != cache.cache_key(2023, 5, "abc", b"input\n")
+
+
+def test_cache_array(tmp_path: Path):
+    path = tmp_path / "2023_01_key"
+    value = np.arange(12, dtype=np.int64).reshape(3, 4)
+    cache.save(path, value)
+    assert entries(tmp_path) == ["2023_01_key.npy"]
+
+    loaded = cache.load(path)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, value) and loaded.dtype == value.dtype
+    assert not loaded.flags.writeable
+
+
+def test_cache_grid(tmp_path: Path):
+    path = tmp_path / "2023_03_key"
+    grid = Grid.from_lines(["#.", ".#", "##"])
+    cache.save(path, grid)
+    assert entries(tmp_path) == ["2023_03_key.grid"]
+
+    loaded = cache.load(path)
+    assert isinstance(loaded, Grid)
+    assert isinstance(loaded.cells, np.memmap)
+    assert str(loaded) == str(grid)
+    assert not loaded.cells.flags.writeable
+
+
+def test_cache_arrays(tmp_path: Path):
+    path = tmp_path / "2023_13_key"
+    value = [np.zeros((2, 3), dtype=bool), np.arange(5), np.ones(0)]
+    cache.save(path, value)
+    assert entries(tmp_path) == ["2023_13_key.npz"]
+
+    loaded = cache.load(path)
+    assert len(loaded) == len(value)
+    for array, expected in zip(loaded, value):
+        assert np.array_equal(array, expected) and array.dtype == expected.dtype
+
+
+@pytest.mark.parametrize("value", [{"a": (1, 2)}, [1, "b"], [], 0])
+def test_cache_pickle(tmp_path: Path, value):
+    path = tmp_path / "2023_07_key"
+    cache.save(path, value)
+    assert entries(tmp_path) == ["2023_07_key.pkl"]
+    assert cache.load(path) == value
+
+
+def test_cache_missing(tmp_path: Path):
+    assert cache.load(tmp_path / "2023_01_key") is None
+
+
+def test_cache_stale(tmp_path: Path):
+    # keys are year_day_format_version_digest
+    cache.save(tmp_path / "2023_01_1_old_aaaa", [1])
+    cache.save(tmp_path / "2023_01_0_new_aaaa", np.zeros(2))
+    cache.save(tmp_path / "2023_01_1_old_bbbb", [2])
+    cache.save(tmp_path / "2023_02_1_old_aaaa", [3])
+    (tmp_path / "2023_01_1_notes_aaaa.txt").write_text("kept")
+
+    cache.save(tmp_path / "2023_01_1_new_aaaa", [4])
+    # only the entries of the same input from other parsers or formats are
+    # removed
+    assert entries(tmp_path) == [
+        "2023_01_1_new_aaaa.pkl",
+        "2023_01_1_notes_aaaa.txt",
+        "2023_01_1_old_bbbb.pkl",
+        "2023_02_1_old_aaaa.pkl",
+    ]
+    assert cache.load(tmp_path / "2023_01_1_old_aaaa") is None
+    assert cache.load(tmp_path / "2023_01_1_new_aaaa") == [4]
+    assert cache.load(tmp_path / "2023_01_1_old_bbbb") == [2]
+
+
+def test_get_parsed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path / "inputs")
+    monkeypatch.setattr(utils, "CACHE_DIR", tmp_path / "cache")
+    parsed = []
+
+    def parse(data: memoryview) -> list[int]:
+        parsed.append(bytes(data))
+        return [int(x) for x in bytes(data).split()]
+
+    def get_parsed(text: str, version: str) -> list[int]:
+        advent = utils.Advent(1)
+        advent.save_input(text)
+        return advent.get_parsed(parse, version)
+
+    assert get_parsed("1 2", "v1") == [1, 2]
+    assert get_parsed("1 2", "v1") == [1, 2]
+    assert parsed == [b"1 2"]
+
+    # a new parser version or a new input misses the cache
+    assert get_parsed("1 2", "v2") == [1, 2]
+    assert get_parsed("3 4", "v2") == [3, 4]
+    assert parsed == [b"1 2", b"1 2", b"3 4"]
+    # a new parser version replaces the entry of the same input, while the
+    # entries of other inputs stay warm
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+    assert get_parsed("1 2", "v2") == [1, 2]
+    assert get_parsed("3 4", "v2") == [3, 4]
+    assert len(parsed) == 3
+    assert get_parsed("1 2", "v1") == [1, 2]
+    assert len(parsed) == 4
@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from time import monotonic
+
+import pytest
+import requests
+
+from advent2023.utils import fetch, utils
+from advent2023.utils.server import RIGHT, StandInServer
+from advent2023.utils.utils import Advent
+from tests.conftest import DAYS, YEARS
+
+# Minimum delay (in seconds) between two requests in the tests
+INTERVAL = 0.05
+
+
+def test_prefetch(server: StandInServer):
+    start = monotonic()
+    paths = fetch.prefetch(YEARS, DAYS, jobs=3, interval=INTERVAL)
+    elapsed = monotonic() - start
+
+    expected = [f"{year}_{day:02d}.txt" for year in YEARS for day in DAYS]
+    assert sorted(path.name for path in paths) == expected
+    for path in paths:
+        year, day = path.stem.split("_")
+        assert path.read_text() == f"{year} {int(day)}\n"
+    assert not list(utils.INPUTS_DIR.glob("*.tmp"))
+    assert len(server.requests) == len(expected)
+    assert elapsed >= (len(expected) - 1) * INTERVAL
+
+    # inputs already downloaded are not requested again
+    assert fetch.prefetch(YEARS, DAYS, interval=INTERVAL) == []
+    assert len(server.requests) == len(expected)
+
+
+def test_prefetch_missing(server: StandInServer):
+    with pytest.raises(requests.HTTPError, match="2023 day 04"):
+        fetch.prefetch(2023, [1, 4], interval=INTERVAL)
+    assert [path.name for path in utils.INPUTS_DIR.iterdir()] == ["2023_01.txt"]
+
+
+def http_date(seconds: float) -> str:
+    return format_datetime(
+        datetime.now(timezone.utc) + timedelta(seconds=seconds), usegmt=True
+    )
+
+
+def test_retry_delay():
+    assert fetch.retry_delay(None, 2.0) == 2.0
+    assert fetch.retry_delay("3", 2.0) == 3.0
+    assert fetch.retry_delay("0.5", 2.0) == 0.5
+    assert fetch.retry_delay("soon", 2.0) == 2.0
+    assert fetch.retry_delay(http_date(-60), 2.0) == 0.0
+    assert 50 <= fetch.retry_delay(http_date(60), 2.0) <= 60
+
+
+def test_download_retry(server: StandInServer):
+    # busy once with a date, once with a number of seconds, once without
+    # a valid delay
+    server.busy = [http_date(-60), "0", "later"]
+    advent = Advent(1, 2023)
+    session = utils.get_session()
+    path = fetch.download(advent, session, fetch.RateLimiter(INTERVAL))
+    assert path.read_text() == "2023 1\n"
+    assert len(server.requests) == 4
+
+    # the last retry's response is final
+    server.busy = ["0", "0"]
+    with pytest.raises(requests.HTTPError):
+        fetch.download(Advent(2, 2023), session, fetch.RateLimiter(INTERVAL), 1)
+
+
+def test_rate_limiter():
+    limiter = fetch.RateLimiter(INTERVAL)
+    starts = []
+
+    def request():
+        limiter.wait()
+        starts.append(monotonic())
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(starts) - min(starts) >= 3 * INTERVAL
+
+
+def test_post_answer(server: StandInServer):
+    advent = Advent(1, 2023)
+    assert "not the right answer" in advent.post_answer(1, 141)
+    server.cooldowns.clear()
+    assert RIGHT in advent.post_answer(1, 142)
+    assert server.solved == {(2023, 1, 1)}
+    assert server.requests[-1] == ("POST", "/2023/day/1/answer")
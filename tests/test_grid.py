@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from advent2023.utils.grid import BitGrid, Grid
+
+SHIFTS = [(dr, dc) for dr in range(-6, 7, 2) for dc in range(-11, 12, 3)]
+
+
+def random_mask(rows: int = 5, cols: int = 11, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((rows, cols)) < 0.4
+
+
+def shifted(mask: np.ndarray, dr: int, dc: int) -> np.ndarray:
+    rows, cols = mask.shape
+    out = np.zeros_like(mask)
+    if abs(dr) >= rows or abs(dc) >= cols:
+        return out
+    src = mask[max(-dr, 0) : rows - max(dr, 0), max(-dc, 0) : cols - max(dc, 0)]
+    out[max(dr, 0) : rows - max(-dr, 0), max(dc, 0) : cols - max(-dc, 0)] = src
+    return out
+
+
+def test_grid_from_bytes():
+    data = b"#..\n.#.\n..#\n\n"
+    grid = Grid.from_bytes(data)
+    assert grid.shape == (3, 3)
+    assert np.array_equal(grid.mask("#"), np.eye(3, dtype=bool))
+    assert str(grid) == "#..\n.#.\n..#"
+    # the cells are a view of the input
+    assert np.shares_memory(grid.cells, np.frombuffer(data, dtype=np.uint8))
+
+
+def test_grid_from_bytes_crlf():
+    grid = Grid.from_bytes(b"ab\r\ncd\r\n")
+    assert str(grid) == "ab\ncd"
+
+
+def test_grid_from_bytes_ragged():
+    with pytest.raises(ValueError):
+        Grid.from_bytes(b"abc\nde\nfgh")
+    with pytest.raises(ValueError):
+        Grid.from_bytes(b"ab\ncde")
+
+
+def test_grid_find():
+    grid = Grid.from_lines(["S.#", "#.S"])
+    assert grid.find("S").tolist() == [[0, 0], [1, 2]]
+    assert grid.index("#") == (0, 2)
+    with pytest.raises(ValueError):
+        grid.index("x")
+    assert grid.coords(grid.flat((1, 2))) == (1, 2)
+
+
+def test_grid_neighbors():
+    grid = Grid.from_lines(["abc", "def", "ghi"])
+    neighbors = grid.neighbors()
+    # up, left, right, down
+    assert neighbors[0].tolist() == [-1, -1, 1, 3]
+    assert neighbors[4].tolist() == [1, 3, 5, 7]
+    assert neighbors[8].tolist() == [5, 7, -1, -1]
+    assert tuple(neighbors[4] - 4) == grid.offsets()
+    assert sorted(grid.neighbors(diagonal=True)[4]) == [0, 1, 2, 3, 5, 6, 7, 8]
+    assert grid.neighbors() is neighbors
+
+
+@pytest.mark.parametrize("cols", [1, 8, 11, 70])
+def test_bitgrid_mask(cols: int):
+    mask = random_mask(cols=cols)
+    bits = BitGrid.from_mask(mask)
+    assert np.array_equal(bits.to_mask(), mask)
+    assert bits.popcount() == mask.sum()
+    assert bits.shape == mask.shape
+    assert bits[1, cols - 1] == mask[1, cols - 1]
+
+
+def test_bitgrid_operators():
+    a, b = random_mask(seed=1), random_mask(seed=2)
+    ba, bb = BitGrid.from_mask(a), BitGrid.from_mask(b)
+    assert np.array_equal((ba & bb).to_mask(), a & b)
+    assert np.array_equal((ba | bb).to_mask(), a | b)
+    assert np.array_equal((ba ^ bb).to_mask(), a ^ b)
+    # inverting keeps the bits within the cols
+    assert np.array_equal((~ba).to_mask(), ~a)
+    assert (~ba).popcount() == (~a).sum()
+    assert ba == BitGrid.from_mask(a) and ba != bb
+
+
+@pytest.mark.parametrize("dr, dc", SHIFTS)
+def test_bitgrid_shift(dr: int, dc: int):
+    mask = random_mask()
+    bits = BitGrid.from_mask(mask).shift(dr, dc)
+    assert bits.shape == mask.shape
+    assert np.array_equal(bits.to_mask(), shifted(mask, dr, dc))
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_bitgrid_dilate(diagonal: bool):
+    mask = random_mask()
+    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if diagonal:
+        deltas += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    spread = np.zeros_like(mask)
+    for dr, dc in deltas:
+        spread |= shifted(mask, dr, dc)
+
+    bits = BitGrid.from_mask(mask)
+    assert np.array_equal(bits.spread(diagonal).to_mask(), spread)
+    assert np.array_equal(bits.dilate(diagonal).to_mask(), spread | mask)
+
+
+def test_bitgrid_transpose():
+    mask = random_mask()
+    transposed = BitGrid.from_mask(mask).transpose()
+    assert transposed.shape == (11, 5)
+    assert np.array_equal(transposed.to_mask(), mask.T)
+
+
+def test_bitgrid_empty():
+    bits = BitGrid.zeros(3, 4)
+    assert bits.popcount() == 0
+    assert bits.dilate(True) == bits
+    assert (~bits).popcount() == 12
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from advent2023.utils.intervals import Box, IntervalMap, IntervalSet
+
+# Values of the random sets, compared with python sets of the same values
+UNIVERSE = range(-5, 60)
+
+
+def random_set(seed: int, count: int = 6) -> IntervalSet:
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, 50, count)
+    return IntervalSet(starts, starts + rng.integers(0, 8, count))
+
+
+def values(intervals: IntervalSet) -> set[int]:
+    return {v for start, end in intervals for v in range(start, end)}
+
+
+def test_merge():
+    intervals = IntervalSet.from_intervals([(5, 8), (0, 2), (2, 4), (6, 7), (9, 9)])
+    # adjacent intervals are merged, nested and empty ones are dropped
+    assert list(intervals) == [(0, 4), (5, 8)]
+    assert intervals.size == 7
+    assert (intervals.min(), intervals.max()) == (0, 7)
+    assert 4 not in intervals and 5 in intervals and 8 not in intervals
+    assert IntervalSet([3, 1], [5, 9]) == IntervalSet([1], [9])
+
+    with pytest.raises(ValueError):
+        IntervalSet([1, 2], [3])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_operators(seed: int):
+    a, b = random_set(seed), random_set(seed + 100)
+    assert values(a) == {v for v in UNIVERSE if v in a}
+    assert values(a | b) == values(a) | values(b)
+    assert values(a & b) == values(a) & values(b)
+    assert values(a - b) == values(a) - values(b)
+    assert {v for v in UNIVERSE if v in ~a} == set(UNIVERSE) - values(a)
+    assert ~~a == a
+    assert values(a.shift(-3)) == {v - 3 for v in values(a)}
+    # sets are always stored merged
+    assert np.all(a.starts[1:] > a.ends[:-1])
+
+
+def test_empty():
+    empty = IntervalSet()
+    a = random_set(0)
+    assert len(empty) == 0 and empty.size == 0 and 0 not in empty
+    assert a | empty == a and a & empty == empty and a - empty == a
+    assert empty - a == empty
+    assert ~empty & a == a
+    assert a - a == empty
+    with pytest.raises(ValueError):
+        empty.min()
+    with pytest.raises(ValueError):
+        empty.max()
+
+
+# Map moving [10, 20) by +100 and [25, 30) by -25
+MAP = IntervalMap([25, 10], [30, 20], [-25, 100])
+
+
+def mapped(value: int) -> int:
+    if 10 <= value < 20:
+        return value + 100
+    if 25 <= value < 30:
+        return value - 25
+    return value
+
+
+def test_map_values():
+    points = np.arange(0, 40)
+    assert MAP(points).tolist() == [mapped(v) for v in points]
+    assert IntervalMap([], [], [])(points).tolist() == points.tolist()
+
+
+@pytest.mark.parametrize(
+    "intervals",
+    [
+        [(5, 15)],
+        [(15, 27)],
+        [(0, 40)],
+        [(10, 20)],
+        [(0, 5), (18, 26), (29, 35)],
+        [(20, 25)],
+        [],
+    ],
+)
+def test_map_apply(intervals: list[tuple[int, int]]):
+    source = IntervalSet.from_intervals(intervals)
+    assert values(MAP.apply(source)) == {mapped(v) for v in values(source)}
+
+
+def test_map_overlap():
+    with pytest.raises(ValueError):
+        IntervalMap([0, 5], [10, 15], [1, 1])
+
+
+def test_box():
+    box = Box((0, 0, 0), (4, 5, 6))
+    assert box.volume == 120 and not box.empty
+    below, above = box.split(1, 2)
+    assert below == Box((0, 0, 0), (4, 2, 6))
+    assert above == Box((0, 2, 0), (4, 5, 6))
+    assert below.volume + above.volume == box.volume
+
+    # splitting outside the box gives an empty part
+    below, above = box.split(0, 10)
+    assert below == box and above.empty and above.volume == 0
+
+    assert (box & Box((2, 2, 2), (9, 9, 9))).volume == 2 * 3 * 4
+    assert (box & Box((5, 0, 0), (9, 9, 9))).empty
@@ -0,0 +1,165 @@
+from functools import cache
+from time import perf_counter
+from typing import Any
+
+import pytest
+
+from advent2023.generators import generate
+from advent2023.solvers import get_solver
+from advent2023.utils.profiling import trace_memory
+
+pytestmark = pytest.mark.large
+
+# Answers for the inputs generated with size 1 and seed 0, by (day, part)
+ANSWERS = {
+    (1, 1): 55037,
+    (1, 2): 55869,
+    (2, 1): 2275,
+    (2, 2): 117610,
+    (3, 1): 575826,
+    (3, 2): 44754358,
+    (4, 1): 13080,
+    (4, 2): 12784783751089,
+    (5, 1): 48342468,
+    (5, 2): 41555690,
+    (6, 1): 3671694,
+    (6, 2): 86712177,
+    (7, 1): 249917038,
+    (7, 2): 251896137,
+    (8, 1): 149,
+    (8, 2): 7128096979109,
+    (9, 1): 192277671,
+    (9, 2): 404,
+    (10, 1): 3013,
+    (10, 2): 4333,
+    (11, 1): 10958050,
+    (11, 2): 794712368644,
+    (12, 1): 2831,
+    (12, 2): 196956024161,
+    (13, 1): 31538,
+    (13, 2): 29946,
+    (14, 1): 118197,
+    (14, 2): 95728,
+    (15, 1): 522201,
+    (15, 2): 316423,
+    (16, 1): 7395,
+    (16, 2): 7861,
+    (17, 1): 870,
+    (17, 2): 957,
+    (18, 1): 31624,
+    (18, 2): 243828428828,
+    (19, 1): 1519058,
+    (19, 2): 231722672000000,
+    (20, 1): 912155310,
+    (20, 2): 94051706362875,
+    (21, 1): 3602,
+    (22, 1): 392,
+    (22, 2): 23799,
+    (23, 1): 242,
+    (23, 2): 770,
+    (24, 1): 24321,
+}
+
+# Budgets of each phase (parse, part1 and part2) of a day, by input size:
+# wall time (in seconds) and peak memory allocated through Python (in MB).
+# Budgets leave a few times the time and memory measured, to catch
+# regressions of the complexity of a solver rather than noise. The budgets
+# of the larger size scale with the growth of each solver, so a solver whose
+# complexity regresses exceeds them even when it stays within those of size 1.
+BUDGET = {1: (0.5, 16), 2: (1, 16)}
+BUDGETS = {
+    1: {
+        7: (1, 16),
+        12: (4, 16),
+        14: (1, 16),
+        16: (5, 32),
+        17: (1, 128),
+        20: (4, 16),
+        22: (8, 16),
+        23: (5, 16),
+        24: (1, 16),
+    },
+    2: {
+        7: (2, 16),
+        12: (8, 16),
+        14: (3, 16),
+        16: (15, 64),
+        17: (2, 256),
+        20: (10, 16),
+        22: (30, 16),
+        24: (3, 16),
+    },
+}
+
+DAYS = sorted({day for day, _ in ANSWERS})
+
+# Size of the larger inputs, on which only the budgets are checked. Day 23's
+# longest path search is exponential in the number of junctions of the maze,
+# so it only runs on inputs of size 1.
+SCALED_SIZE = 2
+SCALED_DAYS = [day for day in DAYS if day != 23]
+SIZED_DAYS = [(day, 1) for day in DAYS] + [(day, SCALED_SIZE) for day in SCALED_DAYS]
+
+
+@cache
+def generated(day: int, size: float = 1) -> bytes:
+    return generate(day, size, 0).encode()
+
+
+@cache
+def parsed(day: int, size: float = 1) -> Any:
+    return get_solver(day).parse(generated(day, size))
+
+
+def check_budget(day: int, fn, size: float = 1):
+    seconds, megabytes = BUDGETS[size].get(day, BUDGET[size])
+    start = perf_counter()
+    result = fn()
+    elapsed = perf_counter() - start
+    assert elapsed <= seconds, f"took {elapsed:.2f}s, budget is {seconds}s"
+
+    peak = trace_memory(fn).peak / 2**20
+    assert peak <= megabytes, f"peaked at {peak:.1f}MB, budget is {megabytes}MB"
+    return result
+
+
+@pytest.mark.parametrize(
+    "day, size",
+    SIZED_DAYS,
+    ids=[f"day{day:02d}-size{size}" for day, size in SIZED_DAYS],
+)
+def test_parse(day: int, size: float):
+    data = generated(day, size)
+    check_budget(day, lambda: get_solver(day).parse(data), size)
+
+
+@pytest.mark.parametrize(
+    "day, part, answer",
+    [(day, part, answer) for (day, part), answer in ANSWERS.items()],
+    ids=[f"day{day:02d}-part{part}" for day, part in ANSWERS],
+)
+def test_large(day: int, part: int, answer: int):
+    data = parsed(day)
+    assert check_budget(day, lambda: get_solver(day).part(part)(data)) == answer
+
+
+SCALED = [(day, part) for day, part in ANSWERS if day in SCALED_DAYS]
+
+
+@pytest.mark.parametrize(
+    "day, part", SCALED, ids=[f"day{day:02d}-part{part}" for day, part in SCALED]
+)
+def test_scaled(day: int, part: int):
+    data = parsed(day, SCALED_SIZE)
+    check_budget(day, lambda: get_solver(day).part(part)(data), SCALED_SIZE)
+
+
+# Parts which can run in a pool of processes, sharing their input with them
+PARALLEL = [(12, 2), (16, 2)]
+
+
+@pytest.mark.parametrize(
+    "day, part", PARALLEL, ids=[f"day{day:02d}-part{part}" for day, part in PARALLEL]
+)
+def test_large_parallel(day: int, part: int):
+    assert get_solver(day).part(part)(parsed(day), jobs=2) == ANSWERS[(day, part)]
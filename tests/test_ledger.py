@@ -0,0 +1,159 @@
+from pathlib import Path
+from time import monotonic
+
+import pytest
+
+from advent2023.utils.ledger import (
+    COMPLETED,
+    RIGHT,
+    TOO_HIGH,
+    TOO_LOW,
+    WAIT,
+    WRONG,
+    Entry,
+    Ledger,
+    SubmissionQueue,
+    parse_verdict,
+)
+from advent2023.utils.server import StandInServer
+from advent2023.utils.utils import Advent
+
+
+def test_settle():
+    entry = Entry()
+    assert entry.settle("42") is None
+
+    entry.record("100", TOO_HIGH)
+    entry.record("10", TOO_LOW)
+    entry.record("50", WRONG)
+    assert entry.settle("100") is False
+    assert entry.settle("120") is False
+    assert entry.settle("5") is False
+    assert entry.settle("50") is False
+    assert entry.settle("42") is None
+    assert entry.settle("abc") is None
+
+    entry.record("42", RIGHT)
+    assert entry.settle("42") is True
+    assert entry.settle("43") is False
+
+
+def test_settle_completed():
+    entry = Entry()
+    entry.record("50", WRONG)
+    entry.record("42", COMPLETED)
+    assert entry.completed and entry.correct is None
+    # answers are not submitted again once the part is completed, unless they
+    # are known to be wrong
+    assert entry.settle("42") is True
+    assert entry.settle("43") is True
+    assert entry.settle("50") is False
+
+
+def test_ledger_save(tmp_path: Path):
+    ledger = Ledger(tmp_path / "ledger.json")
+    ledger.entry(2023, 1, 1).record("10", TOO_LOW)
+    ledger.entry(2023, 1, 1).record("142", RIGHT)
+    ledger.entry(2023, 1, 2).record("281", COMPLETED)
+    ledger.save()
+
+    loaded = Ledger(tmp_path / "ledger.json")
+    assert loaded.entries == ledger.entries
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize(
+    "text, verdict",
+    [
+        ("That's the right answer!", (RIGHT, 0.0)),
+        (
+            "That's not the right answer.  Please wait one minute before trying again.",
+            (WRONG, 60.0),
+        ),
+        (
+            "That's not the right answer; your answer is too high.  Please wait 5"
+            " minutes before trying again.",
+            (TOO_HIGH, 300.0),
+        ),
+        (
+            "That's not the right answer; your answer is too low.  Please wait 30"
+            " seconds before trying again.",
+            (TOO_LOW, 30.0),
+        ),
+        (
+            "You gave an answer too recently; you have to wait after submitting an"
+            " answer before trying again.  You have 1m 30s left to wait.",
+            (WAIT, 90),
+        ),
+        ("You have 12s left to wait.", (WAIT, 12)),
+        (
+            "You don't seem to be solving the right level.  Did you already complete"
+            " it?",
+            (COMPLETED, 0.0),
+        ),
+    ],
+)
+def test_parse_verdict(text: str, verdict: tuple[str, float]):
+    assert parse_verdict(text) == verdict
+
+
+@pytest.fixture
+def waits() -> list[float]:
+    return []
+
+
+@pytest.fixture
+def queue(server: StandInServer, tmp_path: Path, waits: list[float]) -> SubmissionQueue:
+    # waiting lets the server's cooldown pass at once, without sleeping
+    def wait(delay: float):
+        waits.append(delay)
+        server.cooldowns.clear()
+
+    return SubmissionQueue(Ledger(tmp_path / "ledger.json"), wait=wait)
+
+
+def test_queue(server: StandInServer, queue: SubmissionQueue, waits: list[float]):
+    advent = Advent(1, 2023, queue)
+    assert queue.submit(advent, 1, 141) is False
+    assert len(server.requests) == 1
+
+    # known wrong answers are settled locally
+    assert queue.submit(advent, 1, 141) is False
+    assert len(server.requests) == 1
+
+    # the next submission waits for the delay asked after a wrong answer
+    assert queue.submit(advent, 1, 142) is True
+    assert len(server.requests) == 2
+    assert len(waits) == 1 and 55 < waits[0] <= 60
+
+    assert queue.submit(advent, 1, 142) is True
+    assert len(server.requests) == 2
+    entry = Ledger(queue.ledger.path).entry(2023, 1, 1)
+    assert entry.correct == "142" and entry.wrong == ["141"]
+
+
+def test_queue_completed(server: StandInServer, queue: SubmissionQueue):
+    # the part was solved before the ledger kept its answers
+    server.solved.add((2023, 1, 1))
+    advent = Advent(1, 2023, queue)
+    assert queue.submit(advent, 1, 142) is True
+    assert len(server.requests) == 1
+
+    # the part is known to be completed, so the answer is not posted again,
+    # even from a new ledger loaded from the same file
+    queue = SubmissionQueue(Ledger(queue.ledger.path))
+    assert queue.submit(advent, 1, 142) is True
+    assert len(server.requests) == 1
+    entry = queue.ledger.entry(2023, 1, 1)
+    assert entry.completed and entry.correct is None
+
+
+def test_queue_retry(server: StandInServer, queue: SubmissionQueue, waits: list[float]):
+    server.solved.add((2023, 1, 1))
+    server.cooldowns[(2023, 1)] = monotonic() + 60
+
+    advent = Advent(1, 2023)
+    queue.put(advent, 2, 281)
+    assert queue.run() == [True]
+    assert len(server.requests) == 2
+    assert len(waits) == 1 and waits[0] > 55
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from advent2023.utils.memo import LFU, LRU, Memo, memoize
+
+
+def counted(maxsize: int | None = None, policy: str = LRU, **kwargs) -> Memo:
+    """
+    Memoize a function recording the arguments it is called with, i.e. the
+    misses of the memo.
+    """
+    calls = []
+
+    @memoize(maxsize, policy, **kwargs)
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    square.calls = calls
+    return square
+
+
+def test_unbounded():
+    square = counted()
+    assert [square(x) for x in (1, 2, 1, 3, 2)] == [1, 4, 1, 9, 4]
+    assert square.calls == [1, 2, 3]
+    info = square.info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (2, 3, 0, 3)
+    assert info.hit_rate == pytest.approx(0.4)
+
+
+def test_lru():
+    square = counted(2, LRU)
+    square(1), square(2), square(1)
+    # 2 is the least recently used
+    square(3)
+    square(1)
+    assert square.calls == [1, 2, 3]
+    square(2)
+    assert square.calls == [1, 2, 3, 2]
+    assert square.info().size == 2
+    assert square.info().evictions == 2
+
+
+def test_lfu():
+    square = counted(2, LFU)
+    square(1), square(1), square(2)
+    # 2 is the least frequently used, although 1 is less recently used
+    square(3)
+    square(1)
+    assert square.calls == [1, 2, 3]
+    square(2)
+    assert square.calls == [1, 2, 3, 2]
+    assert square.info().size == 2
+
+
+def test_lfu_ties():
+    square = counted(2, LFU)
+    square(1), square(2), square(2), square(1)
+    # 1 and 2 were used as often, 2 is evicted as it reached that count first
+    square(3)
+    square(1)
+    assert square.calls == [1, 2, 3]
+
+
+def test_key():
+    square = counted(key=abs)
+    assert square(-2) == 4 and square(2) == 4
+    assert square.calls == [-2]
+
+
+def test_clear():
+    square = counted(2)
+    square(1), square(1)
+    square.clear()
+    info = square.info()
+    assert (info.hits, info.misses, info.size) == (0, 0, 0)
+    square(1)
+    assert square.calls == [1, 1]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        counted(0)
+    with pytest.raises(ValueError):
+        counted(2, "fifo")
+
+
+def test_disk(tmp_path: Path):
+    path = tmp_path / "memo" / "square"
+    square = counted(2, path=path)
+    square(1), square(2), square(3)
+    # 1 was evicted to the disk tier
+    assert square(1) == 1
+    assert square.calls == [1, 2, 3]
+    assert square.info().disk_hits == 1
+    square.save()
+    square.close()
+
+    # results persist from one memo to the next
+    square = counted(2, path=path)
+    assert [square(x) for x in (1, 2, 3)] == [1, 4, 9]
+    assert square.calls == []
+    assert square.info().disk_hits == 3
+    square.close()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from advent2023.utils import parse
+from advent2023.utils.parse import int_matrix, ints
+
+INT64_MAX = np.iinfo(np.int64).max
+INT64_MIN = np.iinfo(np.int64).min
+
+
+def test_ints():
+    values = ints("Card 3: 41 -7 | 2")
+    assert values.dtype == np.int64
+    assert values.tolist() == [3, 41, -7, 2]
+
+
+def test_ints_empty():
+    for text in ("", "no numbers - here\n"):
+        values = ints(text)
+        assert values.dtype == np.int64 and values.shape == (0,)
+
+
+def test_ints_negative():
+    # a minus sign only counts right before digits
+    assert ints("-1 - 2 3-4 --5 x-6").tolist() == [-1, 2, 3, -4, -5, -6]
+    assert ints("-0 007").tolist() == [0, 7]
+
+
+def test_ints_int64():
+    assert ints(f"{INT64_MAX} {INT64_MIN}").tolist() == [INT64_MAX, INT64_MIN]
+    for value in (INT64_MAX + 1, INT64_MIN - 1, 10**30):
+        with pytest.raises(OverflowError, match=str(value)):
+            ints(f"1 {value} 2")
+
+
+def test_int_matrix():
+    values = int_matrix(["1 -2 3", "x4 5y 6", "7,8,-9"])
+    assert values.dtype == np.int64
+    assert values.tolist() == [[1, -2, 3], [4, 5, 6], [7, 8, -9]]
+
+
+def test_int_matrix_empty():
+    assert int_matrix([]).shape == (0, 0)
+    assert int_matrix(iter([])).shape == (0, 0)
+    assert int_matrix(["", "none"]).shape == (2, 0)
+
+
+def test_int_matrix_ragged():
+    values = int_matrix(["1 2", "", "-3", "4 5 6"])
+    assert isinstance(values, list)
+    assert [row.tolist() for row in values] == [[1, 2], [], [-3], [4, 5, 6]]
+    assert all(row.dtype == np.int64 for row in values)
+
+
+def test_int_matrix_batches(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(parse, "BATCH_SIZE", 2)
+    lines = [f"{i} {-i}" for i in range(5)]
+    assert int_matrix(lines).tolist() == [[i, -i] for i in range(5)]
+    ragged = int_matrix(lines + ["5"])
+    assert [row.tolist() for row in ragged[-2:]] == [[4, -4], [5]]
+
+
+def test_int_matrix_int64():
+    assert int_matrix([str(INT64_MAX), str(INT64_MIN)]).ravel().tolist() == [
+        INT64_MAX,
+        INT64_MIN,
+    ]
+    with pytest.raises(OverflowError):
+        int_matrix(["1 2", f"3 {INT64_MAX + 1}"])
@@ -0,0 +1,96 @@
+import cProfile
+import itertools
+import pstats
+
+import pytest
+
+from advent2023.utils.profiling import collapsed_stacks
+
+
+def leaf():
+    pass
+
+
+def recurse(n: int):
+    if n:
+        recurse(n - 1)
+    else:
+        leaf()
+
+
+def branch():
+    leaf()
+    recurse(3)
+
+
+def root():
+    branch()
+    leaf()
+    recurse(2)
+
+
+def names(stack: str) -> list[str]:
+    return [label.split(" (")[0] for label in stack.split(";")]
+
+
+@pytest.fixture
+def stats() -> pstats.Stats:
+    # each call to the timer is a tick of 1ms, so that times are deterministic
+    # and no stack is too short to be kept
+    ticks = itertools.count()
+    profiler = cProfile.Profile(lambda: next(ticks), 0.001)
+    profiler.runcall(root)
+    return pstats.Stats(profiler)
+
+
+def test_collapsed_stacks(stats: pstats.Stats):
+    stacks = collapsed_stacks(stats)
+    assert all(own > 0 for own in stacks.values())
+    assert sum(stacks.values()) == pytest.approx(stats.total_tt)
+
+    paths = {tuple(names(stack)) for stack in stacks}
+    assert {
+        ("root",),
+        ("root", "branch"),
+        ("root", "branch", "leaf"),
+        ("root", "branch", "recurse"),
+        ("root", "leaf"),
+        ("root", "recurse"),
+    } <= paths
+
+
+def test_collapsed_stacks_recursion(stats: pstats.Stats):
+    stacks = collapsed_stacks(stats)
+    # recursive calls fold into the first call, along with their own time
+    for stack in stacks:
+        assert names(stack).count("recurse") <= 1
+    recursed = [stack for stack in stacks if names(stack)[-1] == "recurse"]
+    own = sum(
+        tt for func, (_, _, tt, *_) in stats.stats.items() if func[2] == "recurse"
+    )
+    assert len(recursed) == 2
+    assert sum(stacks[stack] for stack in recursed) == pytest.approx(own)
+
+
+def ping(n: int):
+    if n:
+        pong(n - 1)
+
+
+def pong(n: int):
+    if n:
+        ping(n - 1)
+
+
+def test_collapsed_stacks_mutual_recursion():
+    # the profiled function itself recurses, through another function
+    ticks = itertools.count()
+    profiler = cProfile.Profile(lambda: next(ticks), 0.001)
+    profiler.runcall(ping, 6)
+    stats = pstats.Stats(profiler)
+
+    stacks = collapsed_stacks(stats)
+    assert sum(stacks.values()) == pytest.approx(stats.total_tt)
+    paths = {tuple(names(stack)) for stack in stacks}
+    assert {("ping",), ("ping", "pong")} <= paths
+    assert all(len(set(path)) == len(path) for path in paths)
@@ -0,0 +1,183 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from advent2023 import batch, runner
+from advent2023.solvers import get_solver
+from advent2023.utils import utils
+from advent2023.utils.utils import read_records
+
+SAMPLES_DIR = Path(__file__).parent / "samples"
+
+# Answers to the examples given in each day's puzzle text, by (day, part).
+# Examples are read from SAMPLES_DIR / "NN.txt", or "NN_2.txt" when part 2
+# has an example of its own.
+ANSWERS = {
+    (1, 1): 142,
+    (1, 2): 281,
+    (2, 1): 8,
+    (2, 2): 2286,
+    (3, 1): 4361,
+    (3, 2): 467835,
+    (4, 1): 13,
+    (4, 2): 30,
+    (5, 1): 35,
+    (5, 2): 46,
+    (6, 1): 288,
+    (6, 2): 71503,
+    (7, 1): 6440,
+    (7, 2): 5905,
+    (8, 1): 6,
+    (8, 2): 6,
+    (9, 1): 114,
+    (9, 2): 2,
+    (10, 1): 22,
+    (10, 2): 4,
+    (11, 1): 374,
+    (11, 2): 82000210,
+    (12, 1): 21,
+    (12, 2): 525152,
+    (13, 1): 405,
+    (13, 2): 400,
+    (14, 1): 136,
+    (14, 2): 64,
+    (15, 1): 1320,
+    (15, 2): 145,
+    (16, 1): 46,
+    (16, 2): 51,
+    (17, 1): 102,
+    (17, 2): 94,
+    (18, 1): 62,
+    (18, 2): 952408144115,
+    (19, 1): 19114,
+    (19, 2): 167409079868000,
+    (20, 1): 11687500,
+    (21, 1): 16,
+    (22, 1): 5,
+    (22, 2): 7,
+    (23, 1): 94,
+    (23, 2): 154,
+    (24, 1): 2,
+}
+
+# Arguments of the parts whose examples use other values than the puzzle
+ARGUMENTS: dict[tuple[int, int], dict[str, Any]] = {
+    (21, 1): {"steps": 6},
+    (24, 1): {"minx": 7, "maxx": 27},
+}
+
+
+def sample_file(day: int, part: int) -> Path:
+    path = SAMPLES_DIR / f"{day:02d}_{part}.txt"
+    if not path.is_file():
+        path = SAMPLES_DIR / f"{day:02d}.txt"
+    return path
+
+
+@pytest.mark.parametrize(
+    "day, part, answer",
+    [(day, part, answer) for (day, part), answer in ANSWERS.items()],
+    ids=[f"day{day:02d}-part{part}" for day, part in ANSWERS],
+)
+def test_sample(day: int, part: int, answer: int):
+    solver = get_solver(day)
+    data = solver.parse(sample_file(day, part).read_bytes())
+    assert solver.part(part)(data, **ARGUMENTS.get((day, part), {})) == answer
+
+
+STREAMED = [
+    (day, part, answer)
+    for (day, part), answer in ANSWERS.items()
+    if get_solver(day).streams
+]
+
+
+@pytest.mark.parametrize(
+    "day, part, answer",
+    STREAMED,
+    ids=[f"day{day:02d}-part{part}" for day, part, _ in STREAMED],
+)
+def test_sample_streamed(day: int, part: int, answer: int):
+    solver = get_solver(day)
+    records = read_records(sample_file(day, part), solver.separator, buffer_size=16)
+    data = solver.stream(records)
+    assert solver.part(part)(data, **ARGUMENTS.get((day, part), {})) == answer
+
+
+def test_part_jobs():
+    solver = get_solver(16)
+    assert solver.parallel(2) and not solver.parallel(1)
+    assert solver.part(2, jobs=3).keywords == {"jobs": 3}
+    assert solver.part(2) is solver.part(2, jobs=1)
+    assert solver.part(1, jobs=3) is solver.part(1)
+
+
+@pytest.mark.parametrize("day", [12, 16])
+def test_run_parallel_part_jobs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, day: int
+):
+    # a single part gets all the processes, and spreads its work over them
+    (tmp_path / f"2023_{day:02d}.txt").write_bytes(sample_file(day, 2).read_bytes())
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path)
+    results = runner.run_parallel([day], [2], cache=False, jobs=3)
+    assert [r.answer for r in results] == [ANSWERS[(day, 2)]]
+
+
+def test_day12_shared_search():
+    from advent2023.day12 import Arrangements
+
+    assert Arrangements().unfolded("???.###", (1, 1, 3)) == 1
+    assert Arrangements().unfolded(".??..??...?##.", (1, 1, 3)) == 16384
+
+    # both rows end with "?.??#" and their last two chunks, so the second
+    # row reuses the search results of the first
+    fresh = Arrangements()
+    assert fresh.count("##.?.??#", (2, 1, 2)) == 1
+    shared = Arrangements()
+    assert shared.count("#.??.?.??#", (1, 2, 1, 2)) == 1
+    misses = shared.search.info().misses
+    assert shared.count("##.?.??#", (2, 1, 2)) == 1
+    assert shared.search.info().misses - misses < fresh.search.info().misses
+
+
+def test_batch(tmp_path: Path):
+    sample = sample_file(22, 1).read_bytes()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(sample)
+    (tmp_path / "c.txt").write_bytes(b"1,0,1~1\n")
+    answers = {name: {1: "5", 2: "7"} for name in ("a.txt", "b.txt")}
+
+    rows = batch.run_batch(22, tmp_path, answers=answers)
+    assert [row.input for row in rows] == ["a.txt", "b.txt", "c.txt"]
+    assert [row.ok for row in rows] == [True, True, False]
+    assert rows[2].error is not None
+
+
+# Expected solving costs scheduling the parts in order of day, and in reverse
+SCHEDULES = {
+    "forward": {(day, part): -day - part / 10 for day, part in ANSWERS},
+    "reverse": {(day, part): day + part / 10 for day, part in ANSWERS},
+}
+
+
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize("costs", SCHEDULES.values(), ids=SCHEDULES.keys())
+def test_run_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, part: int, costs: dict
+):
+    days = sorted(day for day, p in ANSWERS if p == part)
+    for day in days:
+        (tmp_path / f"2023_{day:02d}.txt").write_bytes(
+            sample_file(day, part).read_bytes()
+        )
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path)
+    monkeypatch.setattr(runner, "COSTS", costs)
+
+    expected = runner.run(days, [part], cache=False)
+    results = runner.run_parallel(days, [part], cache=False, jobs=2)
+    assert [(r.day, r.part) for r in results] == [(day, part) for day in days]
+    assert [r.answer for r in results] == [r.answer for r in expected]
+    for r in results:
+        if (r.day, r.part) not in ARGUMENTS:
+            assert r.answer == ANSWERS[(r.day, r.part)]
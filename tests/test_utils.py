@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from advent2023.utils import utils
+from advent2023.utils.utils import Advent, split_lines
+
+INPUTS = {
+    "trailing newline": b"ab\n c \n\nd\n",
+    "no trailing newline": b"ab\n c \n\nd",
+    "trailing newlines": b"ab\n c \n\nd\n\n\n",
+    "crlf": b"ab\r\n c \r\n\r\nd\r\n",
+    "crlf no trailing newline": b"ab\r\n c \r\n\r\nd",
+}
+
+
+@pytest.fixture
+def advent(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Advent:
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path)
+    return Advent(1)
+
+
+def lines(advent: Advent) -> list[bytes]:
+    return [bytes(line) for line in advent.iter_lines()]
+
+
+@pytest.mark.parametrize("data", INPUTS.values(), ids=INPUTS.keys())
+def test_iter_lines(advent: Advent, data: bytes):
+    advent.input_file.write_bytes(data)
+    assert bytes(advent.get_input_bytes()) == data
+    assert lines(advent) == [b"ab", b"c", b"", b"d"]
+    assert advent.get_input_lines() == split_lines(str(data, "utf-8"))
+
+
+def test_iter_lines_views(advent: Advent):
+    advent.input_file.write_bytes(b"abc\ndef\n")
+    data = advent.get_input_bytes()
+    assert data.readonly
+    for line in advent.iter_lines():
+        assert isinstance(line, memoryview)
+        assert line.obj is data.obj
+
+    # the file is only read once, and a new input replaces it rather than
+    # changing the mapped file
+    advent.save_input("xyz\n")
+    assert advent.get_input_bytes().obj is data.obj
+    assert lines(advent) == [b"abc", b"def"]
+
+
+def test_iter_lines_empty(advent: Advent):
+    advent.input_file.write_bytes(b"")
+    assert bytes(advent.get_input_bytes()) == b""
+    assert lines(advent) == [b""]
+    assert advent.get_input_lines() == split_lines("")
+
+
+def test_iter_lines_blank(advent: Advent):
+    advent.input_file.write_bytes(b"\n\n")
+    assert lines(advent) == [b""]
+    advent = Advent(2)
+    advent.input_file.write_bytes(b" \r\n\t\n")
+    assert lines(advent) == [b"", b""]
+    assert advent.get_input_lines() == split_lines(" \r\n\t\n")
@@ -0,0 +1,92 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from advent2023 import watch
+from advent2023.solvers import Solver
+from advent2023.utils import utils
+
+MODULE = """
+OFFSET = {offset}
+
+
+def parse(lines):
+    return [int(line) + OFFSET for line in lines]
+
+
+def part1(values):
+    return sum(values) * {factor}
+"""
+
+
+def write(path: Path, text: str, tick: int):
+    # distinct mtimes, however coarse the file system's clock
+    path.write_text(text)
+    os.utime(path, ns=(tick * 10**9, tick * 10**9))
+
+
+@pytest.fixture
+def watched(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    module_file = tmp_path / "watched_day.py"
+    write(module_file, MODULE.format(offset=0, factor=1), 1)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(utils, "INPUTS_DIR", tmp_path / "inputs")
+    utils.Advent(1).save_input("1\n2\n")
+
+    import watched_day
+
+    monkeypatch.setattr(watch, "get_solver", lambda day: Solver(day, watched_day))
+    yield module_file
+    del sys.modules["watched_day"]
+
+
+def test_parser_digest(watched: Path):
+    module = sys.modules["watched_day"]
+    digest = watch.parser_digest(module)
+    write(watched, MODULE.format(offset=0, factor=2), 2)
+    assert watch.parser_digest(importlib.reload(module)) == digest
+    write(watched, MODULE.format(offset=1, factor=2), 3)
+    assert watch.parser_digest(importlib.reload(module)) != digest
+
+
+def test_watch(watched: Path, monkeypatch: pytest.MonkeyPatch):
+    input_file = utils.Advent(1).input_file
+    # changes made before each poll, the last one stops watching
+    changes = [
+        lambda: None,
+        lambda: write(watched, MODULE.format(offset=0, factor=10), 2),
+        lambda: None,
+        lambda: write(input_file, "3\n4\n", 3),
+        lambda: write(watched, MODULE.format(offset=1, factor=10), 4),
+        lambda: None,
+    ]
+    answers, parsed, runs = [], [], []
+
+    def poll(interval: float):
+        runs.append(len(answers))
+        if len(runs) > len(changes):
+            raise KeyboardInterrupt
+        changes[len(runs) - 1]()
+
+    def parse(solver, advent, cache):
+        parsed.append(str(advent.get_input_bytes(), "utf-8"))
+        return solver.parse(advent.get_input_bytes())
+
+    monkeypatch.setattr(watch, "sleep", poll)
+    monkeypatch.setattr(watch, "parse", parse)
+    monkeypatch.setattr(
+        watch,
+        "print_results",
+        lambda results: answers.extend(r.answer for r in results),
+    )
+    watch.watch([1], [1], cache=False)
+
+    # one run first, then one run after each change, and none after a poll
+    # without changes
+    assert runs == [1, 1, 2, 2, 3, 4, 4]
+    assert answers == [3, 30, 70, 90]
+    # the input is only parsed again when it or the parser changes
+    assert parsed == ["1\n2\n", "3\n4\n", "3\n4\n"]